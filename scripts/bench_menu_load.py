@@ -0,0 +1,85 @@
+"""
+菜单配置加载耗时基准
+
+生成指定节点数量的 menus.json,对比:
+- parse: 读取、JSON 解析、验证、排序并写入缓存(缓存未命中)
+- hash: 修改时间变化但内容不变,按内容哈希命中缓存
+- cache: 修改时间和大小一致,直接读取缓存
+每种情况分别在读取期间开启和暂停循环垃圾回收(MenuLoader.PAUSE_GC)时测量。
+
+用法: python scripts/bench_menu_load.py [节点数量 ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.menu_loader import MenuLoader
+
+ICONS = ["file", "money", "user", "chart", "settings"]
+
+
+def generate_menus(count, fanout=10):
+    """生成 count 个节点的菜单树,每个节点最多 fanout 个子节点"""
+    roots = []
+    queue = []
+    for i in range(count):
+        node = {"id": f"menu_{i}", "title": f"菜单 {i}", "icon": ICONS[i % len(ICONS)],
+                "route": f"/menu/{i}", "permissions": [f"perm_{i % 50}"], "sort": count - i}
+        if queue and len(queue[0].setdefault("children", [])) < fanout:
+            queue[0]["children"].append(node)
+            if len(queue[0]["children"]) == fanout:
+                queue.pop(0)
+        else:
+            roots.append(node)
+        queue.append(node)
+    return roots
+
+
+def measure(loader):
+    # 模拟启动时加载,释放上一次结果的耗时不计入
+    loader._menu_config = None
+    start = time.perf_counter()
+    loader.load_config()
+    return (time.perf_counter() - start) * 1000, loader.from_cache
+
+
+def run(loader, path):
+    """依次测量缓存未命中、按哈希命中、直接命中三种情况"""
+    if os.path.exists(loader._cache_path):
+        os.remove(loader._cache_path)
+    parse, hit = measure(loader)
+    assert not hit
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    by_hash, hit = measure(loader)
+    assert hit
+    cached, hit = measure(loader)
+    assert hit
+    return parse, by_hash, cached
+
+
+def main(counts):
+    print(f"{'nodes':>8} {'json MB':>8} {'gc':>6} {'parse ms':>9} {'hash ms':>8} {'cache ms':>9}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menus.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"version": "1.0", "menus": generate_menus(count)}, f, ensure_ascii=False, indent=2)
+
+            loader = MenuLoader()
+            loader._config_path = path
+            loader._cache_path = os.path.join(directory, "menus.cache")
+            size = os.path.getsize(path) / 1024 / 1024
+            for pause in (False, True):
+                loader.PAUSE_GC = pause
+                parse, by_hash, cached = run(loader, path)
+                gc_mode = "paused" if pause else "on"
+                print(f"{count:>8} {size:>8.1f} {gc_mode:>6} {parse:>9.1f} {by_hash:>8.1f} {cached:>9.1f}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
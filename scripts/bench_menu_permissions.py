@@ -0,0 +1,69 @@
+"""
+菜单权限过滤耗时基准
+
+生成指定节点数量的菜单树(每个节点 1 个权限,共 50 种),输出:
+- build: 计算权限位图的耗时(每次加载一次)
+- filter: 不同角色重新过滤菜单树的耗时与可见节点数
+  none: 没有任何权限 / one: 1 个权限 / half: 25 个权限 / all: 全部权限
+- naive: 逐节点做列表成员检查的递归过滤(对照)
+
+用法: python scripts/bench_menu_permissions.py [节点数量 ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bench_menu_load import generate_menus
+from core.menu_loader import count_menus
+from core.permissions import PermissionMasks
+
+ROUNDS = 20
+ROLES = {
+    "none": [],
+    "one": ["perm_0"],
+    "half": [f"perm_{i}" for i in range(25)],
+    "all": [f"perm_{i}" for i in range(50)],
+}
+
+
+def naive_filter(menus, permissions):
+    """逐节点检查权限列表"""
+    result = []
+    for menu in menus:
+        required = menu.get("permissions")
+        if required and not any(p in permissions for p in required):
+            continue
+        menu = dict(menu)
+        if menu.get("children"):
+            menu["children"] = naive_filter(menu["children"], permissions)
+        result.append(menu)
+    return result
+
+
+def best_of(func, rounds=ROUNDS):
+    """多次运行取最短耗时(毫秒)与最后一次的结果"""
+    best, result = None, None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(counts):
+    print(f"{'nodes':>8} {'build ms':>9} {'role':>5} {'filter ms':>10} {'naive ms':>9} {'visible':>8}")
+    for count in counts:
+        menus = generate_menus(count)
+        build, masks = best_of(lambda: PermissionMasks(menus), rounds=3)
+        for role, permissions in ROLES.items():
+            user_mask = masks.mask(permissions)
+            elapsed, visible = best_of(lambda: masks.filter(menus, user_mask))
+            naive, _ = best_of(lambda: naive_filter(menus, permissions), rounds=3)
+            print(f"{count:>8} {build:>9.2f} {role:>5} {elapsed:>10.3f} {naive:>9.2f} {count_menus(visible):>8}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,74 @@
+"""
+菜单配置校验耗时基准
+
+对生成的菜单配置运行 MenuValidator,输出每个节点数量下的耗时和每节点耗时,
+用于确认耗时随节点数线性增长:
+- wide: 每个节点最多 10 个子节点
+- deep: 单链,层级等于节点数(校验不递归,不受递归深度限制)
+- errors: wide 配置中每 100 个节点有一个类型错误、一个重复 id 和一个未知字段
+
+用法: python scripts/bench_menu_validate.py [节点数量 ...]
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bench_menu_load import generate_menus
+from core.menu_schema import MenuValidator
+from core.menu_loader import count_menus
+
+ROUNDS = 3
+
+
+def generate_chain(count):
+    """生成层级为 count 的单链菜单"""
+    root = node = {"id": "menu_0", "title": "菜单 0", "route": "/menu/0"}
+    for i in range(1, count):
+        child = {"id": f"menu_{i}", "title": f"菜单 {i}", "route": f"/menu/{i}"}
+        node["children"] = [child]
+        node = child
+    return [root]
+
+
+def inject_errors(menus):
+    """每 100 个节点注入三处错误"""
+    stack, count = list(menus), 0
+    while stack:
+        menu = stack.pop()
+        count += 1
+        if count % 100 == 0:
+            menu["sort"] = "1"
+            menu["id"] = "duplicated"
+            menu["extra"] = True
+        stack.extend(menu.get("children") or [])
+    return menus
+
+
+def measure(validator, menus):
+    """多次运行取最短耗时(毫秒)"""
+    best, issues = None, None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        issues = validator.validate({"version": "1.0", "menus": menus})
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(issues)
+
+
+def main(counts):
+    validator = MenuValidator()
+    print(f"{'case':>7} {'nodes':>8} {'ms':>9} {'us/node':>8} {'errors':>7}")
+    for count in counts:
+        for case, menus in (("wide", generate_menus(count)),
+                            ("deep", generate_chain(count)),
+                            ("errors", inject_errors(generate_menus(count)))):
+            elapsed, errors = measure(validator, menus)
+            nodes = count_menus(menus)
+            print(f"{case:>7} {nodes:>8} {elapsed:>9.1f} {elapsed * 1000 / nodes:>8.2f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    sys.setrecursionlimit(1000)
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 200000])
@@ -0,0 +1,107 @@
+"""
+主题切换耗时基准
+
+对比两种方式在不同菜单项数量下切换主题的耗时,每个菜单项带 3 个收起的子菜单:
+- app: ThemeManager 切换窗口主题属性,只立即更新可见控件,收起的子菜单显示时再更新
+- widget: 每个菜单项各自拼接并设置样式表(旧实现)
+
+用法: python scripts/bench_theme_switch.py [菜单项数量 ...]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout
+from core.theme import ThemeManager, Theme
+from components.layout.menu_item import MenuItem
+
+THEMES = [Theme.LIGHT, Theme.DARK, Theme.ORANGE]
+ROUNDS = 6
+
+
+def build_window(count):
+    """创建包含 count 个菜单项的窗口"""
+    window = QWidget()
+    window.setObjectName("sidebar")
+    layout = QVBoxLayout(window)
+    items = []
+    for i in range(count):
+        item = MenuItem(f"菜单 {i}", "")
+        for j in range(3):
+            items.append(item.add_sub_item(f"子菜单 {i}-{j}", f"/menu/{i}/{j}"))
+        layout.addWidget(item)
+        items.append(item)
+    window.show()
+    return window, items
+
+
+def dispose(window):
+    """立即销毁窗口,避免残留控件参与后续样式计算"""
+    window.close()
+    window.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def apply_widget_styles(item, style):
+    """旧实现中每个菜单项在 themeChanged 时执行的样式设置"""
+    item.setStyleSheet(f"QWidget {{ background-color: {style['sidebar']}; }}")
+    item.text_label.setStyleSheet(
+        f"QLabel {{ color: {style['text']}; font-size: 14px; font-weight: 500; }}")
+    item.arrow_label.setStyleSheet(f"QLabel {{ color: {style['text']}; font-size: 12px; }}")
+    item.btn_container.setStyleSheet(f"""
+        QWidget {{ background-color: {style['sidebar']}; border-radius: 4px; margin: 2px 8px; }}
+        QWidget:hover {{ background-color: {style['primary']}; }}
+    """)
+    item.sub_menu.setStyleSheet(f"""
+        QWidget {{ background-color: {style['sidebar']}; }}
+        QWidget > QWidget {{ background-color: {style['sidebar']}; margin-left: 0; }}
+    """)
+
+
+def bench_app(app, manager, count):
+    """ThemeManager 切换耗时(秒/次)"""
+    window, _ = build_window(count)
+    manager.apply(app)
+    app.processEvents()
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        manager.set_theme(THEMES[i % len(THEMES)])
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    dispose(window)
+    return elapsed
+
+
+def bench_widget(app, manager, count):
+    """逐控件设置样式表切换耗时(秒/次)"""
+    app.setStyleSheet("")
+    window, items = build_window(count)
+    app.processEvents()
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        style = manager.get_theme_style(THEMES[i % len(THEMES)])
+        for item in items:
+            apply_widget_styles(item, style)
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    dispose(window)
+    return elapsed
+
+
+def main(counts):
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    manager = ThemeManager()
+    print(f"{'菜单项':>8} {'app(ms)':>10} {'widget(ms)':>12}")
+    for count in counts:
+        widget = bench_widget(app, manager, count)
+        app_level = bench_app(app, manager, count)
+        print(f"{count:>8} {app_level * 1000:>10.1f} {widget * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50, 200, 800])
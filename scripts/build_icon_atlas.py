@@ -0,0 +1,60 @@
+"""
+打包菜单图标图集
+
+把图标目录中的 *.png 缩放到同一尺寸后按网格排列到一张 atlas.png,
+并写入 atlas.json(图标名称 -> [x, y, 宽, 高])。IconCache 发现图集后
+从中裁剪图标,启动时只需读取一个图片文件。
+
+用法: python scripts/build_icon_atlas.py [图标目录] [--size 32]
+"""
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QImage, QPainter
+from core.icons import ICON_DIR, ATLAS_IMAGE, ATLAS_INDEX
+
+
+def build_atlas(directory: Path, size: int) -> int:
+    """生成图集,返回打包的图标数量"""
+    paths = sorted(path for path in directory.glob("*.png") if path.name != ATLAS_IMAGE)
+    if not paths:
+        return 0
+    columns = math.ceil(math.sqrt(len(paths)))
+    rows = math.ceil(len(paths) / columns)
+    atlas = QImage(columns * size, rows * size, QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.transparent)
+    index = {}
+    painter = QPainter(atlas)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    for i, path in enumerate(paths):
+        image = QImage(str(path))
+        if image.isNull():
+            continue
+        x, y = (i % columns) * size, (i // columns) * size
+        painter.drawImage(x, y, image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        index[path.stem] = [x, y, size, size]
+    painter.end()
+    atlas.save(str(directory / ATLAS_IMAGE))
+    with open(directory / ATLAS_INDEX, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    return len(index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="打包菜单图标图集")
+    parser.add_argument("directory", nargs="?", default=str(ICON_DIR))
+    parser.add_argument("--size", type=int, default=32, help="每个图标的像素尺寸(按最高像素比准备)")
+    args = parser.parse_args()
+    app = QGuiApplication([])
+    count = build_atlas(Path(args.directory), args.size)
+    print(f"{count} icons -> {Path(args.directory) / ATLAS_IMAGE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,6 @@
 """
 from .table import Table
 from .form import Form
+from .page_loader import PageProvider, ListPageProvider, PageLoader
 
-__all__ = ['Table', 'Form'] 
\ No newline at end of file
+__all__ = ['Table', 'Form', 'PageProvider', 'ListPageProvider', 'PageLoader'] 
\ No newline at end of file
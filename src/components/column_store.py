@@ -0,0 +1,249 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _make_column(values: list):
+    """根据值类型选择列的存储方式
+
+    纯整数列使用 array('q'),纯浮点列使用 array('d'),其余保留为列表。
+    """
+    if values and all(type(v) is int for v in values):
+        try:
+            return array('q', values)
+        except OverflowError:
+            return values
+    if values and all(type(v) is float for v in values):
+        return array('d', values)
+    return values
+
+
+def _sort_key(value):
+    """排序键,None 排在最后"""
+    return (value is None, value if value is not None else 0)
+
+
+class ColumnStore:
+    """列式表格存储
+
+    每列单独存放在数组中,排序时按列惰性构建升序索引(行号排列)
+    和名次数组,之后的升序、降序和多列排序都复用这些索引,
+    而不必对整张表的行字典重新排序。
+    """
+
+    def __init__(self, columns: Optional[Dict[str, Sequence]] = None):
+        self._columns = {}
+        self._length = 0
+        self._orders = {}
+        self._ranks = {}
+        self._permutations = {}
+        self._inverses = {}
+        if columns:
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError("列长度不一致")
+            self._length = lengths.pop()
+            for key, values in columns.items():
+                self._columns[key] = _make_column(list(values))
+
+    @classmethod
+    def fromRows(cls, rows: Iterable[dict], keys: Optional[List[str]] = None) -> 'ColumnStore':
+        """从行字典列表构建
+
+        Args:
+            rows: 行数据
+            keys: 要保存的列,为空时取所有行中出现过的键
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if keys is None:
+            keys = list(dict.fromkeys(key for row in rows for key in row))
+        return cls({key: [row.get(key) for row in rows] for key in keys})
+
+    def __len__(self) -> int:
+        return self._length
+
+    def keys(self) -> List[str]:
+        """所有列名"""
+        return list(self._columns)
+
+    def column(self, key: str) -> Sequence:
+        """获取整列数据"""
+        return self._columns[key]
+
+    def value(self, row: int, key: str):
+        """获取单元格数据"""
+        column = self._columns.get(key)
+        if column is None:
+            return None
+        return column[row]
+
+    def row(self, row: int) -> dict:
+        """以字典形式获取一行"""
+        return {key: column[row] for key, column in self._columns.items()}
+
+    def setRow(self, row: int, values: dict) -> List[str]:
+        """更新一行,只丢弃值发生变化的列的排序索引
+
+        Returns:
+            值发生变化的列名
+        """
+        changed = []
+        for key, column in self._columns.items():
+            value = values.get(key)
+            if column[row] != value:
+                self._set_value(key, row, value)
+                changed.append(key)
+        for key in values:
+            if key not in self._columns:
+                self._add_column(key)
+                self._columns[key][row] = values[key]
+                changed.append(key)
+        if changed:
+            self.invalidate(changed)
+        return changed
+
+    def insertRows(self, row: int, rows: List[dict]) -> None:
+        """在指定位置插入多行"""
+        for key in dict.fromkeys(key for values in rows for key in values):
+            if key not in self._columns:
+                self._add_column(key)
+        for key, column in self._columns.items():
+            values = [values.get(key) for values in rows]
+            try:
+                column[row:row] = array(column.typecode, values) if isinstance(column, array) else values
+            except (TypeError, OverflowError):
+                column = self._columns[key] = list(column)
+                column[row:row] = values
+        self._length += len(rows)
+        self.invalidate()
+
+    def removeRows(self, row: int, count: int) -> None:
+        """从指定位置删除多行"""
+        for column in self._columns.values():
+            del column[row:row + count]
+        self._length -= count
+        self.invalidate()
+
+    def _set_value(self, key: str, row: int, value) -> None:
+        """写入单元格,数组列无法容纳时退化为列表"""
+        column = self._columns[key]
+        try:
+            column[row] = value
+        except (TypeError, OverflowError):
+            column = self._columns[key] = list(column)
+            column[row] = value
+
+    def _add_column(self, key: str) -> None:
+        """新增一列空值"""
+        self._columns[key] = [None] * self._length
+
+    def sortOrder(self, key: str) -> array:
+        """按列升序排列的行号,首次使用时构建"""
+        order = self._orders.get(key)
+        if order is None:
+            column = self._columns.get(key)
+            if column is None:
+                order = array('q', range(self._length))
+            elif isinstance(column, array) or not any(v is None for v in column):
+                try:
+                    order = sorted(range(self._length), key=column.__getitem__)
+                except TypeError:
+                    # 混合类型的列按字符串比较
+                    order = sorted(range(self._length), key=lambda i: str(column[i]))
+                order = array('q', order)
+            else:
+                try:
+                    order = sorted(range(self._length), key=lambda i: _sort_key(column[i]))
+                except TypeError:
+                    # 混合类型的列按字符串比较
+                    order = sorted(range(self._length), key=lambda i: _sort_key(
+                        None if column[i] is None else str(column[i])))
+                order = array('q', order)
+            self._orders[key] = order
+        return order
+
+    def ranks(self, key: str) -> array:
+        """每行在该列中的名次,值相同的行名次相同"""
+        ranks = self._ranks.get(key)
+        if ranks is None:
+            order = self.sortOrder(key)
+            column = self._columns.get(key)
+            ranks = array('q', bytes(8 * self._length))
+            rank = 0
+            previous = object()
+            for row in order:
+                value = column[row] if column is not None else None
+                if value != previous:
+                    rank += 1
+                    previous = value
+                ranks[row] = rank
+            self._ranks[key] = ranks
+        return ranks
+
+    def permutation(self, spec: Sequence[Tuple[str, bool]]) -> Sequence[int]:
+        """获取排序后的行号排列
+
+        Args:
+            spec: [(列名, 是否升序), ...],按优先级排列
+
+        单列排序直接复用升序索引(降序为其逆序);
+        多列排序把各列名次合成为一个整数键后排序,并缓存结果。
+        """
+        spec = tuple((key, bool(ascending)) for key, ascending in spec)
+        if not spec:
+            return range(self._length)
+        if len(spec) == 1:
+            key, ascending = spec[0]
+            order = self.sortOrder(key)
+            return order if ascending else order[::-1]
+
+        permutation = self._permutations.get(spec)
+        if permutation is None:
+            composite = [0] * self._length
+            for key, ascending in spec:
+                ranks = self.ranks(key)
+                base = max(ranks, default=0) + 1
+                if ascending:
+                    composite = [c * base + r for c, r in zip(composite, ranks)]
+                else:
+                    composite = [c * base + (base - r) for c, r in zip(composite, ranks)]
+            permutation = array('q', sorted(range(self._length), key=composite.__getitem__))
+            self._permutations[spec] = permutation
+        return permutation
+
+    def inversePermutation(self, spec: Sequence[Tuple[str, bool]]) -> Sequence[int]:
+        """permutation(spec) 的逆排列(行号 -> 排序后的位置),首次使用时构建并缓存"""
+        spec = tuple((key, bool(ascending)) for key, ascending in spec)
+        if not spec:
+            return range(self._length)
+        inverse = self._inverses.get(spec)
+        if inverse is None:
+            inverse = array('q', bytes(8 * self._length))
+            for position, row in enumerate(self.permutation(spec)):
+                inverse[row] = position
+            self._inverses[spec] = inverse
+        return inverse
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """丢弃排序索引
+
+        Args:
+            keys: 发生变化的列,为空时丢弃全部索引
+        """
+        if keys is None:
+            self._orders.clear()
+            self._ranks.clear()
+            self._permutations.clear()
+            self._inverses.clear()
+            return
+        keys = set(keys)
+        for key in keys:
+            self._orders.pop(key, None)
+            self._ranks.pop(key, None)
+        self._permutations = {
+            spec: permutation for spec, permutation in self._permutations.items()
+            if not keys.intersection(key for key, _ in spec)
+        }
+        self._inverses = {
+            spec: inverse for spec, inverse in self._inverses.items()
+            if not keys.intersection(key for key, _ in spec)
+        }
@@ -0,0 +1,100 @@
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, Signal, QEvent
+from core.menu_search import MenuSearchIndex
+
+ROUTE_ROLE = Qt.UserRole + 1  # 路由
+TITLE_ROLE = Qt.UserRole + 2  # 标题
+
+
+class CommandPalette(QFrame):
+    """命令面板
+
+    覆盖在主窗口顶部的菜单搜索框,输入标题、拼音首字母、id 或路由查找页面。
+    每次输入都在 MenuSearchIndex 中搜索,只显示前 RESULT_LIMIT 条结果。
+    上/下键选择,回车跳转,Esc 关闭。
+    """
+    routeSelected = Signal(str, str)  # 选中信号(route, title)
+
+    RESULT_LIMIT = 20
+    WIDTH = 480
+
+    def __init__(self, menus=None, parent=None):
+        super().__init__(parent)
+        self.setObjectName("command_palette")
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.index = MenuSearchIndex(menus)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(4)
+
+        self.input = QLineEdit()
+        self.input.setObjectName("palette_input")
+        self.input.setPlaceholderText("搜索菜单(标题 / 拼音首字母 / 路由)")
+        self.input.installEventFilter(self)
+        self.input.textChanged.connect(self._on_text_changed)
+        layout.addWidget(self.input)
+
+        self.results = QListWidget()
+        self.results.setObjectName("palette_results")
+        self.results.setUniformItemSizes(True)
+        self.results.itemActivated.connect(self._on_item_activated)
+        self.results.itemClicked.connect(self._on_item_activated)
+        layout.addWidget(self.results)
+
+        self.hide()
+
+    def setMenus(self, menus):
+        """菜单配置变化时增量更新搜索索引"""
+        self.index.update(menus)
+        if self.isVisible():
+            self._on_text_changed(self.input.text())
+
+    def popup(self):
+        """显示在父窗口顶部居中位置并聚焦输入框"""
+        parent = self.parentWidget()
+        if parent is not None:
+            width = min(self.WIDTH, parent.width() - 40)
+            self.setGeometry((parent.width() - width) // 2, 60, width, min(420, parent.height() - 80))
+        self.input.clear()
+        self.results.clear()
+        self.show()
+        self.raise_()
+        self.input.setFocus()
+
+    def eventFilter(self, obj, event):
+        if obj is self.input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Up, Qt.Key_Down):
+                self._move_selection(-1 if key == Qt.Key_Up else 1)
+                return True
+            if key in (Qt.Key_Return, Qt.Key_Enter):
+                item = self.results.currentItem()
+                if item is not None:
+                    self._on_item_activated(item)
+                return True
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(obj, event)
+
+    def _move_selection(self, step):
+        count = self.results.count()
+        if count:
+            self.results.setCurrentRow((self.results.currentRow() + step) % count)
+
+    def _on_text_changed(self, text):
+        """按输入搜索并刷新结果列表"""
+        self.results.clear()
+        for result in self.index.search(text, self.RESULT_LIMIT):
+            item = QListWidgetItem(f"{result.title}    {' / '.join(result.path[:-1])}")
+            item.setData(ROUTE_ROLE, result.route)
+            item.setData(TITLE_ROLE, result.title)
+            item.setToolTip(result.route)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def _on_item_activated(self, item):
+        self.hide()
+        self.routeSelected.emit(item.data(ROUTE_ROLE), item.data(TITLE_ROLE))
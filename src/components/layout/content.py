@@ -1,15 +1,29 @@
+from collections import OrderedDict
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QStackedWidget
 from PySide6.QtCore import Qt
-from core.theme import ThemeManager, Theme
+from core.theme import ThemeManager
 
 class Content(QStackedWidget):
-    """内容区"""
-    def __init__(self, theme_manager):
+    """内容区
+
+    通过路由创建页面并放入堆叠窗口,最近使用的页面保持存活,
+    超出 max_pages 时移除最久未使用的页面并销毁。
+    路由未注册的页面显示"开发中"提示。
+    """
+    def __init__(self, theme_manager, router=None, max_pages=8):
         super().__init__()
         self.theme_manager = theme_manager
-        self.theme_manager.themeChanged.connect(self._on_theme_changed)
         self.setObjectName("content")
         
+        # 页面池
+        self.router = router
+        self.max_pages = max_pages
+        self._pages = OrderedDict()  # path -> 页面
+        self._hits = 0
+        self._misses = 0
+        if self.router is not None:
+            self.router.viewEvicted.connect(self._on_view_evicted)
+        
         # 创建开发中页面
         self.developing = QWidget()
         self.developing.setObjectName("developing")
@@ -36,52 +50,59 @@ class Content(QStackedWidget):
         layout.addWidget(tip_container)
         self.addWidget(self.developing)
         
-        # 应用初始主题
-        self._apply_theme(self.theme_manager.get_theme())
-        
     def show_route(self, route, title):
         """显示路由对应的内容"""
-        self.title_label.setText(title)
-        self.message.setText("正在开发中，小主你先歇一会儿...")
-        self.setCurrentWidget(self.developing)
+        view = self.router.push(route) if self.router is not None and route else None
+        if view is None:
+            self.title_label.setText(title)
+            self.message.setText("正在开发中，小主你先歇一会儿...")
+            self.setCurrentWidget(self.developing)
+            return
+            
+        path = self.router.current_path
+        if self._pages.get(path) is view:
+            self._hits += 1
+            self._pages.move_to_end(path)
+        else:
+            self._misses += 1
+            if path in self._pages:
+                self._detach(path)
+            self._pages[path] = view
+            self.addWidget(view)
+        self.setCurrentWidget(view)
+        self._trim()
         
-    def _on_theme_changed(self, theme: Theme):
-        """主题变更处理"""
-        self._apply_theme(theme)
+    def pool_stats(self) -> dict:
+        """页面池统计"""
+        total = self._hits + self._misses
+        return {
+            "size": len(self._pages),
+            "max_pages": self.max_pages,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / total if total else 0.0,
+        }
         
-    def _apply_theme(self, theme: Theme):
-        """应用主题"""
-        style = self.theme_manager.get_theme_style(theme)
-        self.setStyleSheet(f"""
-            #content {{
-                background-color: {style['background']};
-                padding: 20px;
-            }}
-            
-            #developing {{
-                background-color: {style['background']};
-            }}
-            
-            #developing_message {{
-                background-color: {style['background']};
-                border: 2px solid {style['primary']};
-                border-radius: 8px;
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-                min-width: 400px;
-                max-width: 600px;
-            }}
-            
-            #title {{
-                color: {style['text']};
-                font-size: 24px;
-                font-weight: bold;
-                margin-bottom: 16px;
-            }}
-            
-            #message {{
-                color: {style['text']};
-                font-size: 16px;
-                opacity: 0.8;
-            }}
-        """)
-        
\ No newline at end of file
+    def _trim(self):
+        """移除超出容量的最久未使用页面(当前页面除外)"""
+        in_use = (self.currentWidget(), self.router.current)
+        for path in list(self._pages):
+            if len(self._pages) <= self.max_pages:
+                break
+            if self._pages[path] in in_use:
+                continue
+            # 交给路由淘汰,路由发出 viewEvicted 后在回调中移除
+            if not self.router.evict(path):
+                self._detach(path)
+                
+    def _detach(self, path):
+        """从堆叠窗口移除页面并延迟销毁"""
+        view = self._pages.pop(path)
+        self.removeWidget(view)
+        view.deleteLater()
+        
+    def _on_view_evicted(self, path, view):
+        """路由淘汰页面后同步移除(路由负责销毁)"""
+        if self._pages.get(path) is view:
+            del self._pages[path]
+            self.removeWidget(view)
@@ -4,12 +4,13 @@ from core.theme import ThemeManager, Theme
 
 class Header(QWidget):
     """顶部导航"""
+    SEPARATOR = " / "  # 面包屑各级之间的分隔符
+
     def __init__(self, theme_manager):
         super().__init__()
         self.theme_manager = theme_manager
-        self.theme_manager.themeChanged.connect(self._on_theme_changed)
         self.setObjectName("header")
-        self._apply_theme(self.theme_manager.get_theme())
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         layout = QHBoxLayout(self)
         layout.setContentsMargins(20, 0, 20, 0)
@@ -32,41 +33,12 @@ class Header(QWidget):
         self.breadcrumb.setCursor(Qt.PointingHandCursor)
         self.user_info.setCursor(Qt.PointingHandCursor)
         
-    def update_breadcrumb(self, title):
-        """更新面包屑"""
-        self.breadcrumb.setText(title)
-        
-    def _on_theme_changed(self, theme: Theme):
-        """主题变更处理"""
-        self._apply_theme(theme)
+    def update_breadcrumb(self, path):
+        """更新面包屑
         
-    def _apply_theme(self, theme: Theme):
-        """应用主题"""
-        style = self.theme_manager.get_theme_style(theme)
-        self.setStyleSheet(f"""
-            #header {{
-                background-color: {style['header']};
-                border-bottom: 1px solid {style['border']};
-                min-height: 48px;
-            }}
-            QLabel {{
-                color: {style['text']};
-                font-size: 14px;
-                font-weight: 500;
-            }}
-            #breadcrumb {{
-                padding: 0 8px;
-                border-radius: 4px;
-            }}
-            #breadcrumb:hover {{
-                background-color: rgba(255, 255, 255, 0.1);
-            }}
-            #user_info {{
-                padding: 6px 12px;
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 4px;
-            }}
-            #user_info:hover {{
-                background: rgba(255, 255, 255, 0.2);
-            }}
-        """)
\ No newline at end of file
+        Args:
+            path: 从一级菜单到当前页面的标题列表,也可以是单个标题
+        """
+        if isinstance(path, str):
+            path = [path]
+        self.breadcrumb.setText(self.SEPARATOR.join(path))
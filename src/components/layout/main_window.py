@@ -1,14 +1,20 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
                               QStackedWidget, QToolButton, QMenu)
 from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QResizeEvent
+from PySide6.QtGui import QResizeEvent, QKeySequence, QShortcut
 from .sidebar import Sidebar
+from .command_palette import CommandPalette
 from .header import Header
 from .content import Content
 from core.theme import ThemeManager, Theme
+from core.router import Router
+from core.menu_loader import MenuLoader
+from views import ROUTES
 
 class MainWindow(QMainWindow):
     """主窗口"""
+    MAX_PAGES = 8  # 同时保持存活的页面数量
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("PySide6 企业级中后台")
@@ -16,7 +22,11 @@ class MainWindow(QMainWindow):
         
         # 初始化主题管理器
         self.theme_manager = ThemeManager()
-        self.theme_manager.themeChanged.connect(self._on_theme_changed)
+        
+        # 初始化路由
+        self.router = Router(max_views=self.MAX_PAGES)
+        for path, view in ROUTES.items():
+            self.router.register(path, view)
         
         # 创建中心部件
         central_widget = QWidget()
@@ -30,6 +40,7 @@ class MainWindow(QMainWindow):
         # 创建侧边栏
         self.sidebar = Sidebar(self.theme_manager)
         self.sidebar.menuClicked.connect(self._on_menu_clicked)
+        self.sidebar.menuHovered.connect(self.router.prefetch)
         self.main_layout.addWidget(self.sidebar)
         
         # 创建右侧内容区
@@ -43,7 +54,7 @@ class MainWindow(QMainWindow):
         right_layout.addWidget(self.header)
         
         # 创建内容区
-        self.content = Content(self.theme_manager)
+        self.content = Content(self.theme_manager, self.router, self.MAX_PAGES)
         right_layout.addWidget(self.content)
         
         self.main_layout.addWidget(right_container)
@@ -55,8 +66,19 @@ class MainWindow(QMainWindow):
         # 添加主题切换按钮
         self._setup_theme_button()
         
-        # 应用初始主题
-        self._apply_theme(self.theme_manager.get_theme())
+        # 命令面板(Ctrl+K 搜索菜单)
+        self.command_palette = CommandPalette(self.sidebar.menus, self)
+        self.command_palette.routeSelected.connect(self._on_menu_clicked)
+        QShortcut(QKeySequence("Ctrl+K"), self, self.command_palette.popup)
+        
+        # 菜单配置在后台加载,完成后更新命令面板;监听配置文件,修改后只更新变化的菜单项
+        self.menu_loader = MenuLoader()
+        self.menu_loader.menu_loaded.connect(self.command_palette.setMenus)
+        self.menu_loader.menu_patched.connect(self._on_menus_patched)
+        self.menu_loader.watch()
+        
+        # 应用初始主题(应用级样式表)
+        self.theme_manager.apply()
         
     def _setup_theme_button(self):
         """设置主题切换按钮"""
@@ -64,33 +86,11 @@ class MainWindow(QMainWindow):
         theme_btn.setPopupMode(QToolButton.InstantPopup)
         theme_btn.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
         theme_btn.setText("主题")
-        theme_btn.setStyleSheet("""
-            QToolButton {
-                color: #FFFFFF;
-                border: none;
-                padding: 4px 8px;
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 4px;
-            }
-            QToolButton:hover {
-                background: rgba(255, 255, 255, 0.2);
-            }
-            QMenu {
-                background-color: #FFFFFF;
-                border: 1px solid #E8E8E8;
-                border-radius: 4px;
-                padding: 4px 0;
-            }
-            QMenu::item {
-                padding: 8px 24px;
-            }
-            QMenu::item:selected {
-                background-color: #F5F5F5;
-            }
-        """)
+        theme_btn.setObjectName("theme_button")
         
         # 创建主题菜单
         theme_menu = QMenu(theme_btn)
+        theme_menu.setObjectName("theme_menu")
         themes = {
             "橙色主题": Theme.ORANGE,
             "亮色主题": Theme.LIGHT,
@@ -103,24 +103,6 @@ class MainWindow(QMainWindow):
         theme_btn.setMenu(theme_menu)
         self.header.layout().insertWidget(self.header.layout().count()-1, theme_btn)
         
-    def _on_theme_changed(self, theme: Theme):
-        """主题变更处理"""
-        self._apply_theme(theme)
-        
-    def _apply_theme(self, theme: Theme):
-        """应用主题"""
-        style = self.theme_manager.get_theme_style(theme)
-        
-        # 更新窗口样式
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {style['background']};
-            }}
-            QWidget {{
-                font-family: "Microsoft YaHei", "Segoe UI", "Helvetica Neue";
-            }}
-        """)
-        
     def resizeEvent(self, event: QResizeEvent):
         """窗口大小变更处理"""
         super().resizeEvent(event)
@@ -139,7 +121,13 @@ class MainWindow(QMainWindow):
             self.sidebar.setVisible(True)
             self.sidebar.expand()
         
+    def _on_menus_patched(self, changes, menus):
+        """菜单配置文件变化"""
+        self.sidebar.apply_changes(changes, menus)
+        self.command_palette.setMenus(menus)
+        
     def _on_menu_clicked(self, route, title):
-        """菜单点击处理"""
-        self.header.update_breadcrumb(title)
+        """菜单点击或命令面板选中:面包屑显示完整菜单路径,侧边栏高亮并展开到对应菜单"""
+        self.header.update_breadcrumb(self.sidebar.breadcrumb(route) or title)
+        self.sidebar.set_active_route(route)
         self.content.show_route(route, title)
\ No newline at end of file
@@ -1,23 +1,40 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QHBoxLayout
-from PySide6.QtCore import Signal, Qt, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QIcon, QColor
-from pathlib import Path
-from core.theme import ThemeManager, Theme
+from PySide6.QtCore import Signal, Qt
+from PySide6.QtGui import QColor
+from core.theme import ThemeManager, Theme, update_style_property
+from core.icons import IconCache
+from core.animation import AnimationManager
+from core.menu_loader import sort_menus
 
 class MenuItem(QWidget):
-    """菜单项组件"""
+    """菜单项组件
+
+    通过 from_config 根据菜单配置创建时,子菜单项在首次展开时才创建。
+    图标从 IconCache 获取,在菜单项首次显示时才解码。
+    子菜单展开/收起动画由共享的 AnimationManager 调度。
+    """
+    ICON_SIZE = 16
+
     clicked = Signal(str)  # 菜单点击信号
+    hovered = Signal(str)  # 鼠标悬停信号,用于路由预取
     
     def __init__(self, text, route, icon=None, parent=None):
         super().__init__(parent)
         self.route = route
+        self.menu_id = None
+        self.parent_item = None  # 上级菜单项,一级菜单为 None
         self.is_expanded = False
         self.sub_items = []
+        self._sub_items_by_id = {}  # 菜单 id -> 已创建的子菜单项
+        self._pending_children = None  # 尚未创建的子菜单配置
+        self._collapsed = False
+        self._icon = None
+        self._icon_loaded = False
         
         # 获取父组件的主题管理器
         self.theme_manager = self.get_theme_manager()
-        if self.theme_manager:
-            self.theme_manager.themeChanged.connect(self._on_theme_changed)
+        self.setObjectName("menu_item")
+        self.setAttribute(Qt.WA_StyledBackground, True)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -25,23 +42,25 @@ class MenuItem(QWidget):
         
         # 主按钮容器
         self.btn_container = QWidget()
+        self.btn_container.setObjectName("menu_button")
+        self.btn_container.setAttribute(Qt.WA_Hover, True)
         btn_layout = QHBoxLayout(self.btn_container)
         btn_layout.setContentsMargins(16, 0, 16, 0)
         btn_layout.setSpacing(8)
         
         # 图标
         self.icon_label = QLabel()
-        if icon:
-            icon_path = str(Path(__file__).parent.parent.parent / "resources" / "icons" / icon)
-            self.icon_label.setPixmap(QIcon(icon_path).pixmap(16, 16))
+        self._set_icon(icon)
         btn_layout.addWidget(self.icon_label)
         
         # 文本
         self.text_label = QLabel(text)
+        self.text_label.setObjectName("menu_text")
         btn_layout.addWidget(self.text_label)
         
         # 箭头图标
         self.arrow_label = QLabel("▸")
+        self.arrow_label.setObjectName("menu_arrow")
         self.arrow_label.setVisible(False)
         btn_layout.addWidget(self.arrow_label)
         
@@ -57,6 +76,7 @@ class MenuItem(QWidget):
         
         # 子菜单容器
         self.sub_menu = QWidget()
+        self.sub_menu.setObjectName("sub_menu")
         self.sub_menu.setVisible(False)
         self.sub_menu.setMaximumHeight(0)
         self.sub_layout = QVBoxLayout(self.sub_menu)
@@ -64,19 +84,44 @@ class MenuItem(QWidget):
         self.sub_layout.setSpacing(0)
         layout.addWidget(self.sub_menu)
         
-        # 动画
-        self.animation = QPropertyAnimation(self.sub_menu, b"maximumHeight")
-        self.animation.setDuration(200)
-        self.animation.setEasingCurve(QEasingCurve.InOutCubic)
-        
-        # 箭头动画
-        self.arrow_animation = QPropertyAnimation(self.arrow_label, b"rotation")
-        self.arrow_animation.setDuration(200)
-        self.arrow_animation.setEasingCurve(QEasingCurve.InOutCubic)
+    @classmethod
+    def from_config(cls, config, parent=None):
+        """根据菜单配置创建菜单项,子菜单延迟到首次展开时创建"""
+        item = cls(config['title'], config.get('route', ''), config.get('icon'), parent)
+        item.menu_id = config['id']
+        if config.get('children'):
+            item.set_children(config['children'])
+        return item
+        
+    def update_config(self, config):
+        """按新配置更新标题、路由和图标,子菜单尚未创建时同时替换子菜单配置"""
+        self.text_label.setText(config['title'])
+        self.route = config.get('route', '')
+        self._set_icon(config.get('icon'))
+        if self._pending_children:
+            self._pending_children = config.get('children') or None
+        self.arrow_label.setVisible(self.has_children() and not self._collapsed)
+        
+    def _set_icon(self, icon):
+        """设置图标名称(或文件名),尚未显示时延迟到 showEvent 解码"""
+        if icon == self._icon and (self._icon_loaded or not icon):
+            return
+        self._icon = icon
+        self._icon_loaded = False
+        if not icon:
+            self.icon_label.clear()
+        elif self.isVisible():
+            self._load_icon()
+            
+    def _load_icon(self):
+        """从 IconCache 获取当前屏幕像素比下的图标"""
+        self._icon_loaded = True
+        self.icon_label.setPixmap(IconCache().pixmap(self._icon, self.ICON_SIZE, self.devicePixelRatioF()))
         
-        # 应用初始主题
-        if self.theme_manager:
-            self._apply_theme(self.theme_manager.get_theme())
+    def showEvent(self, event):
+        if self._icon and not self._icon_loaded:
+            self._load_icon()
+        super().showEvent(event)
         
     def get_theme_manager(self):
         """获取主题管理器"""
@@ -87,9 +132,53 @@ class MenuItem(QWidget):
             parent = parent.parent()
         return None
         
+    def set_children(self, children):
+        """设置子菜单配置,子菜单项在首次展开时创建"""
+        self._pending_children = children
+        self.arrow_label.setVisible(not self._collapsed)
+        
+    def has_children(self) -> bool:
+        """是否有子菜单(包括尚未创建的)"""
+        return bool(self.sub_items or self._pending_children)
+        
+    def children_built(self) -> bool:
+        """子菜单项是否已创建(没有子菜单时视为已创建)"""
+        return not self._pending_children
+        
     def add_sub_item(self, text, route, icon=None):
         """添加子菜单"""
-        if not self.arrow_label.isVisible():
+        return self._add_sub_menu_item(MenuItem(text, route, icon, self))
+        
+    def _build_children(self):
+        """按 sort 顺序创建尚未创建的子菜单项"""
+        children, self._pending_children = self._pending_children, None
+        for config in sort_menus(children):
+            self._add_sub_menu_item(MenuItem.from_config(config, self))
+            
+    def insert_sub_item(self, row, sub_item):
+        """在指定位置插入已创建的子菜单项"""
+        return self._add_sub_menu_item(sub_item, row)
+        
+    def take_sub_item(self, sub_item):
+        """移出子菜单项(不删除),断开信号并删除其外层容器"""
+        self.sub_items.remove(sub_item)
+        if self._sub_items_by_id.get(sub_item.menu_id) is sub_item:
+            del self._sub_items_by_id[sub_item.menu_id]
+        sub_item.clicked.disconnect(self.clicked)
+        sub_item.hovered.disconnect(self.hovered)
+        container = sub_item.parentWidget()
+        sub_item.setParent(None)
+        sub_item.parent_item = None
+        self.sub_layout.removeWidget(container)
+        container.deleteLater()
+        if not self.sub_items:
+            self.arrow_label.setVisible(False)
+        self._update_sub_menu_height()
+        return sub_item
+        
+    def _add_sub_menu_item(self, sub_item, row=None):
+        """把子菜单项放入子菜单容器,row 为 None 时放在最后"""
+        if not self._collapsed:
             self.arrow_label.setVisible(True)
         
         # 创建子菜单容器
@@ -98,195 +187,101 @@ class MenuItem(QWidget):
         sub_item_layout.setContentsMargins(20, 0, 0, 0)  # 左侧添加20px的缩进
         sub_item_layout.setSpacing(0)
         
-        # 创建子菜单项
-        sub_item = MenuItem(text, route, icon, self)
+        # 连接子菜单项
         sub_item.clicked.connect(self.clicked)
+        sub_item.hovered.connect(self.hovered)
         sub_item_layout.addWidget(sub_item)
+        sub_item.parent_item = self
         
-        self.sub_items.append(sub_item)
-        self.sub_layout.addWidget(sub_item_container)
+        if row is None:
+            row = len(self.sub_items)
+        self.sub_items.insert(row, sub_item)
+        if sub_item.menu_id is not None:
+            self._sub_items_by_id[sub_item.menu_id] = sub_item
+        self.sub_layout.insertWidget(row, sub_item_container)
+        if self._collapsed:
+            sub_item.collapse()
         
-        # 更新子菜单最大高度
-        total_height = sum(item.sizeHint().height() for item in self.sub_items)
-        self.animation.setEndValue(total_height)
+        self._update_sub_menu_height()
         
         return sub_item
         
+    def _update_sub_menu_height(self):
+        """子菜单已展开时,增删子菜单项后调整子菜单高度"""
+        if self.is_expanded and not AnimationManager().isAnimating(self.sub_menu, b"maximumHeight"):
+            self.sub_menu.setMaximumHeight(self.sub_layout.sizeHint().height())
+        
     def _on_pressed(self, event):
         """按下效果"""
-        if self.theme_manager:
-            style = self.theme_manager.get_style()
-            self.btn_container.setStyleSheet(f"""
-                QWidget {{
-                    background-color: {style['primary']};
-                    border-radius: 4px;
-                    margin: 2px 8px;
-                }}
-            """)
+        update_style_property(self.btn_container, "pressed", True)
         
     def _on_released(self, event):
         """释放效果"""
-        if self.theme_manager:
-            style = self.theme_manager.get_style()
-            self.btn_container.setStyleSheet(f"""
-                QWidget {{
-                    background-color: {style['sidebar']};
-                    border-radius: 4px;
-                    margin: 2px 8px;
-                }}
-                QWidget:hover {{
-                    background-color: {style['primary']};
-                }}
-            """)
+        update_style_property(self.btn_container, "pressed", False)
         self._on_clicked()
         
     def _on_enter(self, event):
-        """鼠标进入效果"""
-        if self.theme_manager:
-            style = self.theme_manager.get_style()
-            self.btn_container.setStyleSheet(f"""
-                QWidget {{
-                    background-color: {style['primary']};
-                    border-radius: 4px;
-                    margin: 2px 8px;
-                }}
-            """)
+        """鼠标进入(悬停样式由 :hover 选择器处理)"""
+        if self.route:
+            self.hovered.emit(self.route)
         
     def _on_leave(self, event):
         """鼠标离开效果"""
-        if self.theme_manager:
-            style = self.theme_manager.get_style()
-            self.btn_container.setStyleSheet(f"""
-                QWidget {{
-                    background-color: {style['sidebar']};
-                    border-radius: 4px;
-                    margin: 2px 8px;
-                }}
-                QWidget:hover {{
-                    background-color: {style['primary']};
-                }}
-            """)
+        update_style_property(self.btn_container, "pressed", False)
         
     def _on_clicked(self):
         """点击处理"""
-        if self.sub_items:
-            self.is_expanded = not self.is_expanded
-            
-            # 子菜单展开/收起动画
-            if self.is_expanded:
-                self.sub_menu.setVisible(True)
-                self.animation.setStartValue(0)
-                self.animation.setEndValue(self.sub_layout.sizeHint().height())
-                self.arrow_animation.setStartValue(0)
-                self.arrow_animation.setEndValue(90)
-                
-                # 设置展开状态的样式
-                if self.theme_manager:
-                    style = self.theme_manager.get_style()
-                    self.btn_container.setStyleSheet(f"""
-                        QWidget {{
-                            background-color: {style['primary']};
-                            border-radius: 4px;
-                            margin: 2px 8px;
-                        }}
-                    """)
-            else:
-                self.animation.setStartValue(self.sub_menu.height())
-                self.animation.setEndValue(0)
-                self.arrow_animation.setStartValue(90)
-                self.arrow_animation.setEndValue(0)
-                
-                # 恢复默认样式
-                if self.theme_manager:
-                    style = self.theme_manager.get_style()
-                    self.btn_container.setStyleSheet(f"""
-                        QWidget {{
-                            background-color: {style['sidebar']};
-                            border-radius: 4px;
-                            margin: 2px 8px;
-                        }}
-                        QWidget:hover {{
-                            background-color: {style['primary']};
-                        }}
-                    """)
-            
-            self.animation.start()
-            self.arrow_animation.start()
-            
-            if not self.is_expanded:
-                self.animation.finished.connect(
-                    lambda: self.sub_menu.setVisible(False))
+        if self.has_children():
+            self.set_expanded(not self.is_expanded)
         
         # 无论是否有子菜单，都发送点击信号
         if self.route:
             self.clicked.emit(self.route)
+            
+    def set_expanded(self, expanded):
+        """展开/收起子菜单(带动画),首次展开时创建子菜单项"""
+        if expanded == self.is_expanded or not self.has_children():
+            return
+        if self._pending_children:
+            self._build_children()
+        self.is_expanded = expanded
+        update_style_property(self.btn_container, "expanded", self.is_expanded)
+        self.arrow_label.setText("▾" if expanded else "▸")
+        
+        # 子菜单高度动画,从当前高度开始,快速连续点击时取代未完成的动画
+        if expanded:
+            self.sub_menu.setVisible(True)
+            AnimationManager().animate(self.sub_menu, b"maximumHeight", self.sub_layout.sizeHint().height(),
+                                       on_finished=self._update_sub_menu_height)
+        else:
+            AnimationManager().animate(self.sub_menu, b"maximumHeight", 0,
+                                       on_finished=self._on_sub_menu_collapsed)
+            
+    def _on_sub_menu_collapsed(self):
+        """收起动画结束后隐藏子菜单"""
+        if not self.is_expanded:
+            self.sub_menu.setVisible(False)
+                
+    def set_active(self, active):
+        """设置是否为当前页面对应的菜单项(active 动态属性)"""
+        update_style_property(self.btn_container, "active", active)
+        
+    def sub_item(self, menu_id):
+        """按 id 获取子菜单项,子菜单尚未创建时先创建"""
+        if self._pending_children:
+            self._build_children()
+        return self._sub_items_by_id.get(menu_id)
         
     def collapse(self):
         """收起菜单项"""
+        self._collapsed = True
         self.text_label.setVisible(False)
         self.arrow_label.setVisible(False)
         self.btn_container.setFixedWidth(48)
         
     def expand(self):
         """展开菜单项"""
+        self._collapsed = False
         self.text_label.setVisible(True)
-        self.arrow_label.setVisible(len(self.sub_items) > 0)
+        self.arrow_label.setVisible(self.has_children())
         self.btn_container.setFixedWidth(200)
-        
-    def _on_theme_changed(self, theme: Theme):
-        """主题变更处理"""
-        self._apply_theme(theme)
-        
-    def _apply_theme(self, theme: Theme):
-        """应用主题"""
-        if not self.theme_manager:
-            return
-            
-        style = self.theme_manager.get_theme_style(theme)
-        
-        # 设置整个菜单项的背景色
-        self.setStyleSheet(f"""
-            QWidget {{
-                background-color: {style['sidebar']};
-            }}
-        """)
-        
-        # 设置文本颜色
-        self.text_label.setStyleSheet(f"""
-            QLabel {{
-                color: {style['text']};
-                font-size: 14px;
-                font-weight: 500;
-            }}
-        """)
-        
-        # 设置箭头颜色
-        self.arrow_label.setStyleSheet(f"""
-            QLabel {{
-                color: {style['text']};
-                font-size: 12px;
-            }}
-        """)
-        
-        # 设置按钮容器的悬停效果
-        self.btn_container.setStyleSheet(f"""
-            QWidget {{
-                background-color: {style['sidebar']};
-                border-radius: 4px;
-                margin: 2px 8px;
-            }}
-            QWidget:hover {{
-                background-color: {style['primary']};
-            }}
-        """)
-        
-        # 设置子菜单容器的样式
-        self.sub_menu.setStyleSheet(f"""
-            QWidget {{
-                background-color: {style['sidebar']};
-            }}
-            QWidget > QWidget {{  /* 子菜单项容器 */
-                background-color: {style['sidebar']};
-                margin-left: 0;
-            }}
-        """)
\ No newline at end of file
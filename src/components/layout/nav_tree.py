@@ -0,0 +1,369 @@
+from PySide6.QtWidgets import QTreeView, QStyledItemDelegate, QStyle, QFrame, QAbstractItemView
+from PySide6.QtCore import Qt, Signal, QAbstractItemModel, QModelIndex, QSize, QRect
+from PySide6.QtGui import QColor, QFont
+from core.menu_loader import sort_menus, index_menus
+from core.icons import IconCache
+from core.animation import AnimationManager
+from core.diff import NODE_INSERTED, NODE_MOVED, NODE_UPDATED, NODE_REMOVED
+
+ROUTE_ROLE = Qt.UserRole + 1   # 路由
+ID_ROLE = Qt.UserRole + 2      # 菜单 id
+ICON_ROLE = Qt.UserRole + 3    # 图标名称
+
+ITEM_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+class _MenuNode:
+    """菜单树节点,子节点在首次访问时创建
+
+    同一棵树的节点共用 nodes 字典(id -> 节点),子节点创建时登记到其中。
+    """
+    __slots__ = ('config', 'parent', 'row', 'nodes', '_children')
+
+    def __init__(self, config, parent=None, row=0, nodes=None):
+        self.config = config
+        self.parent = parent
+        self.row = row
+        self.nodes = parent.nodes if nodes is None else nodes
+        self._children = None
+
+    def has_children(self) -> bool:
+        return bool(self.config.get('children'))
+
+    def built(self) -> bool:
+        """子节点是否已创建"""
+        return self._children is not None
+        
+    def children(self) -> list:
+        if self._children is None:
+            self._children = [_MenuNode(config, self, row)
+                              for row, config in enumerate(sort_menus(self.config.get('children') or []))]
+            nodes = self.nodes
+            for child in self._children:
+                nodes[child.config['id']] = child
+        return self._children
+
+
+class MenuTreeModel(QAbstractItemModel):
+    """菜单树模型
+
+    直接引用菜单配置字典,节点对象只为展开过的层级创建,
+    未展开的子树只占用配置本身的内存。已创建的节点按 id 登记在 _nodes 中。
+    """
+
+    def __init__(self, menus=None, parent=None):
+        super().__init__(parent)
+        self._nodes = {}
+        self._root = _MenuNode({'children': menus or []}, nodes=self._nodes)
+
+    def setMenus(self, menus):
+        """替换菜单配置"""
+        self.beginResetModel()
+        self._nodes = {}
+        self._root = _MenuNode({'children': menus or []}, nodes=self._nodes)
+        self.endResetModel()
+
+    def applyChanges(self, changes, menus):
+        """应用节点级变更(见 diff_tree),只通知受影响的行
+        
+        子节点尚未创建的父节点跳过,之后按新配置创建。
+        """
+        nodes = self._nodes
+        for change in changes:
+            node = nodes.get(change.id)
+            if change.kind == NODE_UPDATED:
+                if node is not None:
+                    node.config = change.node
+                    index = self.createIndex(node.row, 0, node)
+                    self.dataChanged.emit(index, index)
+                continue
+            if change.kind == NODE_REMOVED:
+                if node is not None:
+                    self._remove_node(node)
+                continue
+            
+            parent = self._root if change.parent is None else nodes.get(change.parent)
+            if parent is None or not parent.built():
+                if node is not None:
+                    self._remove_node(node)
+                continue
+            if change.kind == NODE_INSERTED:
+                # 插入的节点总是新建:同 id 的旧节点可能属于已删除的子树
+                node = _MenuNode(change.node, parent)
+                self._insert_node(node, parent, change.row)
+            elif change.kind == NODE_MOVED and node is not None:
+                self._move_node(node, parent, change.row)
+                
+        # 已创建的节点改为引用新配置,子节点按新配置创建
+        configs = index_menus(menus)
+        self._root.config = {'children': menus}
+        for menu_id, node in nodes.items():
+            config = configs.get(menu_id)
+            if config is not None:
+                node.config = config
+                
+    def _forget_subtree(self, node):
+        """从 _nodes 中去掉已移出模型的节点及其已创建的子孙节点"""
+        nodes = self._nodes
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if nodes.get(node.config['id']) is node:
+                del nodes[node.config['id']]
+            if node.built():
+                stack.extend(node._children)
+                
+    def _index_of(self, node) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+        
+    @staticmethod
+    def _renumber(parent, start):
+        for row in range(start, len(parent._children)):
+            parent._children[row].row = row
+            
+    def _insert_node(self, node, parent, row):
+        self.beginInsertRows(self._index_of(parent), row, row)
+        node.parent = parent
+        parent._children.insert(row, node)
+        self._nodes[node.config['id']] = node
+        self._renumber(parent, row)
+        self.endInsertRows()
+        
+    def _remove_node(self, node):
+        parent = node.parent
+        self.beginRemoveRows(self._index_of(parent), node.row, node.row)
+        del parent._children[node.row]
+        self._forget_subtree(node)
+        self._renumber(parent, node.row)
+        self.endRemoveRows()
+        
+    def _move_node(self, node, parent, row):
+        """移动节点,row 为移出后在目标父节点中的位置"""
+        source = node.parent
+        # Qt 的目标位置按移出前计算
+        destination = row + 1 if source is parent and row >= node.row else row
+        if not self.beginMoveRows(self._index_of(source), node.row, node.row,
+                                  self._index_of(parent), destination):
+            return
+        del source._children[node.row]
+        self._renumber(source, node.row)
+        node.parent = parent
+        parent._children.insert(row, node)
+        self._renumber(parent, row)
+        self.endMoveRows()
+        
+    def indexForPath(self, ids) -> QModelIndex:
+        """按从一级菜单开始的 id 路径查找索引,沿途创建子节点;找不到时返回无效索引"""
+        node = self._root
+        for menu_id in ids:
+            node.children()
+            child = self._nodes.get(menu_id)
+            if child is None or child.parent is not node:
+                return QModelIndex()
+            node = child
+        return self._index_of(node)
+        
+    def node(self, index: QModelIndex) -> _MenuNode:
+        """获取索引对应的节点,无效索引对应根节点"""
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0:
+            return QModelIndex()
+        children = self.node(parent).children()
+        if row >= len(children):
+            return QModelIndex()
+        return self.createIndex(row, 0, children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children())
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        # 只检查配置,不创建子节点
+        return self.node(parent).has_children()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        config = index.internalPointer().config
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return config['title']
+        if role == ROUTE_ROLE:
+            return config.get('route', '')
+        if role == ID_ROLE:
+            return config['id']
+        if role == ICON_ROLE:
+            return config.get('icon')
+        if role == Qt.DecorationRole:
+            icon = config.get('icon')
+            return IconCache().icon(icon) if icon else None
+        return None
+
+    def flags(self, index):
+        # 视图布局时会对每一行调用,直接返回预先组合的值
+        return ITEM_FLAGS
+
+
+class MenuDelegate(QStyledItemDelegate):
+    """绘制菜单项的委托
+
+    样式与 MenuItem 保持一致,颜色在绘制时从 ThemeManager 读取,
+    主题切换后视图重绘即可生效。图标栏模式下只绘制图标。
+    图标位图从 IconCache 按视图的设备像素比获取,与 MenuItem 共用。
+    """
+    ROW_HEIGHT = 40
+    ICON_SIZE = 16
+
+    def __init__(self, theme_manager=None, parent=None):
+        super().__init__(parent)
+        self.theme_manager = theme_manager
+        self.rail = False
+        self._font = QFont()
+        self._font.setPixelSize(14)
+        self._font.setWeight(QFont.Medium)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        style = self.theme_manager.get_style() if self.theme_manager else {
+            "primary": "#1890FF", "sidebar": "#FFFFFF", "text": "#333333"}
+        state = option.state
+        active = state & (QStyle.State_MouseOver | QStyle.State_Selected | QStyle.State_Open)
+        rect = option.rect.adjusted(8, 2, -8, -2)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(style['primary'] if active else style['sidebar']))
+        painter.drawRoundedRect(rect, 4, 4)
+
+        size = self.ICON_SIZE
+        if self.rail:
+            icon_rect = QRect(rect.center().x() - size // 2, rect.center().y() - size // 2, size, size)
+        else:
+            icon_rect = QRect(rect.left() + 16, rect.center().y() - size // 2, size, size)
+        name = index.data(ICON_ROLE)
+        pixmap = IconCache().pixmap(name, size, painter.device().devicePixelRatioF()) if name else None
+        painter.setPen(QColor(style['text']))
+        painter.setFont(self._font)
+        if pixmap is not None and not pixmap.isNull():
+            painter.drawPixmap(icon_rect, pixmap)
+        elif self.rail:
+            # 没有图标时用标题首字代替
+            painter.drawText(rect, Qt.AlignCenter, index.data(Qt.DisplayRole)[:1])
+
+        if not self.rail:
+            text_rect = QRect(icon_rect.right() + 8, rect.top(), rect.right() - icon_rect.right() - 40, rect.height())
+            text = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text_rect.width())
+            painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+            if state & QStyle.State_Children:
+                arrow = "▾" if state & QStyle.State_Open else "▸"
+                painter.drawText(rect.adjusted(0, 0, -16, 0), Qt.AlignVCenter | Qt.AlignRight, arrow)
+        painter.restore()
+
+
+class NavigationTree(QTreeView):
+    """虚拟化的导航树
+
+    基于 MenuTreeModel + MenuDelegate,只有可见行参与绘制,
+    适用于成千上万个节点的菜单。支持收起为 64px 图标栏,
+    展开/收起子菜单使用 QTreeView 自带的动画,AnimationManager 开启 reduced motion 时关闭。
+    """
+    menuClicked = Signal(str)  # 菜单点击信号(route)
+    menuHovered = Signal(str)  # 菜单悬停信号(route),用于路由预取
+
+    INDENTATION = 20
+
+    def __init__(self, theme_manager=None, parent=None):
+        super().__init__(parent)
+        self.setObjectName("nav_tree")
+        self.menu_model = MenuTreeModel(parent=self)
+        self.menu_delegate = MenuDelegate(theme_manager, self)
+        self.setModel(self.menu_model)
+        self.setItemDelegate(self.menu_delegate)
+
+        self.setHeaderHidden(True)
+        self.setUniformRowHeights(True)
+        self.setRootIsDecorated(False)
+        self.setIndentation(self.INDENTATION)
+        animations = AnimationManager()
+        self.setAnimated(not animations.reducedMotion())
+        animations.reducedMotionChanged.connect(self._on_reduced_motion_changed)
+        self.setMouseTracking(True)
+        self.setExpandsOnDoubleClick(False)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setCursor(Qt.PointingHandCursor)
+
+        self.clicked.connect(self._on_index_clicked)
+        self.entered.connect(self._on_index_entered)
+
+    def setMenus(self, menus):
+        """设置菜单配置"""
+        self.menu_model.setMenus(menus)
+
+    def revealPath(self, ids) -> bool:
+        """选中 id 路径对应的菜单并滚动到可见位置,图标栏模式下不展开父菜单
+        
+        Returns:
+            是否找到该菜单
+        """
+        index = self.menu_model.indexForPath(ids)
+        if not index.isValid():
+            self.clearSelection()
+            return False
+        if not self.menu_delegate.rail:
+            parent = index.parent()
+            while parent.isValid():
+                self.expand(parent)
+                parent = parent.parent()
+        self.setCurrentIndex(index)
+        self.scrollTo(index)
+        return True
+        
+    def isRail(self) -> bool:
+        """是否为图标栏模式"""
+        return self.menu_delegate.rail
+
+    def setRail(self, rail: bool):
+        """切换图标栏模式,图标栏模式下收起全部子菜单"""
+        if rail == self.menu_delegate.rail:
+            return
+        self.menu_delegate.rail = rail
+        if rail:
+            self.collapseAll()
+        self.setIndentation(0 if rail else self.INDENTATION)
+        self.viewport().update()
+
+    def _on_reduced_motion_changed(self, enabled):
+        self.setAnimated(not enabled)
+
+    def _on_index_clicked(self, index):
+        """点击展开/收起子菜单,有路由时发出点击信号"""
+        if self.menu_model.hasChildren(index) and not self.menu_delegate.rail:
+            self.setExpanded(index, not self.isExpanded(index))
+        route = index.data(ROUTE_ROLE)
+        if route:
+            self.menuClicked.emit(route)
+
+    def _on_index_entered(self, index):
+        """悬停时发出路由"""
+        route = index.data(ROUTE_ROLE)
+        if route:
+            self.menuHovered.emit(route)
@@ -1,19 +1,40 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, Qt
 from .menu_item import MenuItem
-from core.theme import ThemeManager, Theme
+from .nav_tree import NavigationTree
+from core.theme import ThemeManager, Theme, update_style_property
+from core.menu_loader import MenuLoader, MenuIndex, sort_menus, count_menus
+from core.diff import NODE_INSERTED, NODE_MOVED, NODE_UPDATED, NODE_REMOVED
 
 class Sidebar(QWidget):
-    """侧边栏"""
+    """侧边栏
+
+    菜单根据 MenuLoader.menu_config(或传入的配置)创建,配置尚未加载时
+    在后台加载,完成后再创建菜单区域。
+    同级菜单按 sort 排序,子菜单项在父菜单首次展开时才创建。
+    菜单标题、面包屑和当前菜单项都通过 MenuIndex 按路由查找,
+    配置来自 MenuLoader 时直接使用其加载时建立的索引。
+    
+    两种显示模式:
+    - widgets: 每个菜单项是一个 MenuItem 控件
+    - tree: NavigationTree 模型/视图,只绘制可见行,适用于超大菜单
+    auto 模式在菜单节点数超过 TREE_MODE_THRESHOLD 时使用 tree。
+    """
     menuClicked = Signal(str, str)  # 菜单点击信号(route, title)
+    menuHovered = Signal(str)       # 菜单悬停信号(route),用于路由预取
     
-    def __init__(self, theme_manager):
+    MODE_AUTO = "auto"
+    MODE_WIDGETS = "widgets"
+    MODE_TREE = "tree"
+    TREE_MODE_THRESHOLD = 300
+    
+    def __init__(self, theme_manager, menus=None, mode=MODE_AUTO):
         super().__init__()
         self.theme_manager = theme_manager
-        self.theme_manager.themeChanged.connect(self._on_theme_changed)
         self.is_collapsed = False
         self.setObjectName("sidebar")
-        self._apply_theme(self.theme_manager.get_theme())
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setProperty("collapsed", False)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -24,10 +45,39 @@ class Sidebar(QWidget):
         logo.setObjectName("logo")
         layout.addWidget(logo)
         
+        self.mode = mode
+        self.tree = None
+        self.menu_layout = None
+        self.menus = []
+        self.menu_items = []
+        self._menu_items_by_id = {}  # 菜单 id -> 一级菜单项
+        self.index = MenuIndex()
+        self._active_item = None
+        self._active_route = None
+        
+        # 未传入配置时从 MenuLoader 获取,尚未加载则在后台加载,完成后再创建菜单
+        if menus is None:
+            menus = self._load_menus()
+        if menus is not None:
+            self.set_menus(menus)
+            
+    def _create_menu_view(self, menus):
+        """首次设置菜单时确定显示模式并创建菜单区域"""
+        if self.mode == self.MODE_AUTO:
+            self.mode = self.MODE_TREE if count_menus(menus) > self.TREE_MODE_THRESHOLD else self.MODE_WIDGETS
+        
+        if self.mode == self.MODE_TREE:
+            self.tree = NavigationTree(self.theme_manager)
+            self.tree.menuClicked.connect(self._on_menu_clicked)
+            self.tree.menuHovered.connect(self.menuHovered)
+            if self.is_collapsed:
+                self.tree.setRail(True)
+            self.layout().addWidget(self.tree)
+            return
+        
         # 创建滚动区域
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; }")
         
         # 菜单容器
         menu_container = QWidget()
@@ -36,50 +86,209 @@ class Sidebar(QWidget):
         menu_layout.setContentsMargins(0, 0, 0, 0)
         menu_layout.setSpacing(0)
         
-        # 添加菜单项
-        dashboard = MenuItem("仪表盘", "/dashboard", "icons/dashboard.png")
-        dashboard.clicked.connect(self._on_menu_clicked)
-        menu_layout.addWidget(dashboard)
-        
-        # 系统管理
-        system = MenuItem("系统管理", "", "icons/system.png")
-        system.add_sub_item("用户管理", "/system/user")
-        system.add_sub_item("角色管理", "/system/role")
-        system.add_sub_item("菜单管理", "/system/menu")
-        system.clicked.connect(self._on_menu_clicked)
-        menu_layout.addWidget(system)
-        
-        # 内容管理
-        content = MenuItem("内容管理", "", "icons/content.png")
-        content.add_sub_item("文章管理", "/content/article")
-        content.add_sub_item("分类管理", "/content/category")
-        content.add_sub_item("标签管理", "/content/tag")
-        content.clicked.connect(self._on_menu_clicked)
-        menu_layout.addWidget(content)
+        self.menu_layout = menu_layout
         
         menu_layout.addStretch()
         scroll.setWidget(menu_container)
-        layout.addWidget(scroll)
+        self.layout().addWidget(scroll)
+        
+    def set_menus(self, menus):
+        """根据菜单配置重建菜单
+        
+        Args:
+            menus: 菜单配置列表,格式同 MenuLoader.menu_config
+        """
+        if self.tree is None and self.menu_layout is None:
+            self._create_menu_view(menus)
+        self.menus = menus
+        self.index = self._index_menus(menus)
+        if self.tree is not None:
+            self.tree.setMenus(menus)
+        else:
+            self._active_item = None
+            self._build_items(menus)
+        if self._active_route:
+            self.set_active_route(self._active_route)
+        
+    def apply_changes(self, changes, menus):
+        """应用菜单配置的节点级变更(MenuLoader.menu_patched),只修改受影响的菜单项
+        
+        子菜单尚未创建的菜单项只替换其子菜单配置,展开时按新配置创建。
+        
+        Args:
+            changes: diff_tree 返回的 TreeChange 列表
+            menus: 新的菜单配置
+        """
+        if self.tree is None and self.menu_layout is None:
+            self.set_menus(menus)
+            return
+        self.menus = menus
+        self.index = self._index_menus(menus)
+        if self.tree is not None:
+            self.tree.menu_model.applyChanges(changes, menus)
+        else:
+            items = {item.menu_id: item for item in self.findChildren(MenuItem)}
+            for change in changes:
+                self._apply_change(change, items)
+            # 尚未创建子菜单的菜单项引用的是旧配置
+            configs = self.index.nodes
+            for menu_id, item in items.items():
+                if not item.children_built() and menu_id in configs:
+                    item.update_config(configs[menu_id])
+            if self._active_item is not None and self._active_item.menu_id not in items:
+                self._active_item = None
+        if self._active_route:
+            self.set_active_route(self._active_route)
+        
+    def _apply_change(self, change, items):
+        """应用一条变更,父菜单项的子菜单尚未创建时跳过"""
+        item = items.get(change.id)
+        if change.kind == NODE_UPDATED:
+            if item is not None:
+                item.update_config(change.node)
+            return
+        if change.kind == NODE_REMOVED:
+            if item is not None:
+                self._detach_item(item)
+                self._delete_item(item, items)
+            return
+        
+        # 插入或移动
+        parent = None
+        if change.parent is not None:
+            parent = items.get(change.parent)
+            if parent is None or not parent.children_built():
+                # 目标父菜单的子菜单尚未创建,展开时会按新配置创建
+                if item is not None:
+                    self._detach_item(item)
+                    self._delete_item(item, items)
+                return
+        if change.kind == NODE_INSERTED:
+            item = MenuItem.from_config(change.node)
+            items[change.id] = item
+        elif change.kind == NODE_MOVED and item is not None:
+            self._detach_item(item)
+        else:
+            return
+        self._attach_item(item, parent, change.row)
+        
+    def _attach_item(self, item, parent, row):
+        """把菜单项放到父菜单项(None 为一级菜单)的指定位置"""
+        if parent is not None:
+            parent.insert_sub_item(row, item)
+            return
+        item.clicked.connect(self._on_menu_clicked)
+        item.hovered.connect(self.menuHovered)
+        if self.is_collapsed:
+            item.collapse()
+        self.menu_layout.insertWidget(row, item)
+        self.menu_items.insert(row, item)
+        self._menu_items_by_id[item.menu_id] = item
+        
+    def _detach_item(self, item):
+        """从当前位置移出菜单项(不删除)"""
+        if item.parent_item is not None:
+            item.parent_item.take_sub_item(item)
+            return
+        self.menu_items.remove(item)
+        if self._menu_items_by_id.get(item.menu_id) is item:
+            del self._menu_items_by_id[item.menu_id]
+        self.menu_layout.removeWidget(item)
+        item.clicked.disconnect(self._on_menu_clicked)
+        item.hovered.disconnect(self.menuHovered)
+        item.setParent(None)
+        
+    def _delete_item(self, item, items):
+        """删除菜单项及其已创建的子菜单项"""
+        for child in [item, *item.findChildren(MenuItem)]:
+            items.pop(child.menu_id, None)
+        item.deleteLater()
+        
+    @staticmethod
+    def _index_menus(menus):
+        """菜单索引,配置来自 MenuLoader 时复用其索引"""
+        loader = MenuLoader()
+        if menus is loader.menu_config:
+            return loader.tree_index
+        return MenuIndex(menus)
+        
+    def breadcrumb(self, route):
+        """路由对应菜单从一级菜单开始的标题列表,路由不在菜单中时为空列表"""
+        return self.index.breadcrumb(route)
+        
+    def set_active_route(self, route):
+        """高亮路由对应的菜单项,并展开其父菜单使之可见(侧边栏收起时不展开)
+        
+        按路由查找菜单 id 后沿父指针得到路径,只访问路径上的菜单项。
+        """
+        self._active_route = route
+        path = [menu['id'] for menu in self.index.route_path(route)]
+        if self.tree is not None:
+            self.tree.revealPath(path)
+            return
+        item = None
+        if path:
+            item = self._menu_items_by_id.get(path[0])
+            for menu_id in path[1:]:
+                if item is None:
+                    break
+                if not self.is_collapsed:
+                    item.set_expanded(True)
+                item = item.sub_item(menu_id)
+        if item is self._active_item:
+            return
+        if self._active_item is not None:
+            self._active_item.set_active(False)
+        self._active_item = item
+        if item is not None:
+            item.set_active(True)
+            
+    def _build_items(self, menus):
+        """重建一级菜单项控件"""
+        for item in self.menu_items:
+            self.menu_layout.removeWidget(item)
+            item.deleteLater()
+        self.menu_items = []
+        self._menu_items_by_id = {}
+        
+        for index, config in enumerate(sort_menus(menus)):
+            item = MenuItem.from_config(config)
+            item.clicked.connect(self._on_menu_clicked)
+            item.hovered.connect(self.menuHovered)
+            if self.is_collapsed:
+                item.collapse()
+            self.menu_layout.insertWidget(index, item)
+            self.menu_items.append(item)
+            self._menu_items_by_id[item.menu_id] = item
+            
+    def _load_menus(self):
+        """从 MenuLoader 获取菜单配置,尚未加载时开始后台加载并返回 None"""
+        loader = MenuLoader()
+        if loader.menu_config is not None:
+            return loader.menu_config
+        # 加载失败时错误通过 MenuLoader.load_error 信号发出,侧边栏保持为空
+        loader.menu_loaded.connect(self._on_menus_loaded)
+        loader.load_async()
+        return None
+        
+    def _on_menus_loaded(self, menus):
+        """后台加载完成,创建菜单"""
+        MenuLoader().menu_loaded.disconnect(self._on_menus_loaded)
+        self.set_menus(menus)
         
     def _on_menu_clicked(self, route):
         """菜单点击处理"""
-        # 根据路由获取题
-        titles = {
-            "/dashboard": "仪表盘",
-            "/system/user": "用户管理",
-            "/system/role": "角色管理",
-            "/system/menu": "菜单管理",
-            "/content/article": "文章管理",
-            "/content/category": "分类管理",
-            "/content/tag": "标签管理"
-        }
-        self.menuClicked.emit(route, titles.get(route, ""))
+        menu = self.index.find_route(route)
+        self.menuClicked.emit(route, menu['title'] if menu is not None else "")
         
     def collapse(self):
         """收起侧边栏"""
         if not self.is_collapsed:
             self.is_collapsed = True
             self.setMaximumWidth(64)
+            update_style_property(self, "collapsed", True)
+            if self.tree is not None:
+                self.tree.setRail(True)
             for item in self.findChildren(MenuItem):
                 item.collapse()
                 
@@ -88,67 +297,8 @@ class Sidebar(QWidget):
         if self.is_collapsed:
             self.is_collapsed = False
             self.setMaximumWidth(220)
+            update_style_property(self, "collapsed", False)
+            if self.tree is not None:
+                self.tree.setRail(False)
             for item in self.findChildren(MenuItem):
                 item.expand()
-                
-    def _on_theme_changed(self, theme: Theme):
-        """主题变更处理"""
-        self._apply_theme(theme)
-        
-    def _apply_theme(self, theme: Theme):
-        """应用主题"""
-        style = self.theme_manager.get_theme_style(theme)
-        self.setStyleSheet(f"""
-            /* 侧边栏基础��式 */
-            #sidebar {{
-                background-color: {style['sidebar']};
-                min-width: {64 if self.is_collapsed else 220}px;
-                max-width: {64 if self.is_collapsed else 220}px;
-                border-right: 1px solid {style['border']};
-            }}
-            
-            /* 滚动区域样式 */
-            QScrollArea {{
-                border: none;
-                background-color: {style['sidebar']};
-            }}
-            QScrollArea > QWidget > QWidget {{
-                background-color: {style['sidebar']};
-            }}
-            QScrollBar:vertical {{
-                width: 8px;
-                background: transparent;
-                margin: 0;
-            }}
-            QScrollBar::handle:vertical {{
-                background: rgba(255, 255, 255, 0.3);
-                min-height: 30px;
-                border-radius: 4px;
-            }}
-            QScrollBar::handle:vertical:hover {{
-                background: rgba(255, 255, 255, 0.5);
-            }}
-            QScrollBar::add-line:vertical,
-            QScrollBar::sub-line:vertical {{
-                height: 0;
-            }}
-            QScrollBar::add-page:vertical,
-            QScrollBar::sub-page:vertical {{
-                background: transparent;
-            }}
-            
-            /* Logo样式 */
-            QLabel#logo {{
-                color: {style['text']};
-                font-size: 20px;
-                font-weight: bold;
-                padding: 16px 20px;
-                background-color: {style['sidebar']};
-                border-bottom: 1px solid {style['border']};
-            }}
-            
-            /* 菜单容器样式 */
-            QWidget#menu_container {{
-                background-color: {style['sidebar']};
-            }}
-        """)
\ No newline at end of file
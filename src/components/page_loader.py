@@ -0,0 +1,200 @@
+from collections import OrderedDict
+from typing import List, Optional
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class PageProvider:
+    """分页数据源接口
+
+    子类实现 fetchPage 返回指定页的数据。
+    fetchPage 在工作线程中调用,不能直接操作界面。
+    """
+
+    def fetchPage(self, page: int, size: int) -> List[dict]:
+        """获取指定页的数据(页码从1开始)"""
+        raise NotImplementedError
+
+    def totalCount(self) -> int:
+        """数据总条数,未知时返回 -1"""
+        return -1
+
+
+class ListPageProvider(PageProvider):
+    """基于内存列表的数据源"""
+
+    def __init__(self, rows: List[dict]):
+        self.rows = rows
+
+    def fetchPage(self, page: int, size: int) -> List[dict]:
+        start = (page - 1) * size
+        return self.rows[start:start + size]
+
+    def totalCount(self) -> int:
+        return len(self.rows)
+
+
+class PageCache:
+    """最近使用页的 LRU 缓存"""
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self._pages = OrderedDict()
+
+    def get(self, key) -> Optional[List[dict]]:
+        """获取缓存页,命中时移到最近使用位置"""
+        rows = self._pages.get(key)
+        if rows is not None:
+            self._pages.move_to_end(key)
+        return rows
+
+    def put(self, key, rows: List[dict]) -> None:
+        """写入缓存页,超出容量时淘汰最久未使用的页"""
+        self._pages[key] = rows
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.capacity:
+            self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._pages.clear()
+
+    def __contains__(self, key) -> bool:
+        return key in self._pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
+class _PageTaskSignals(QObject):
+    """工作线程回传结果用的信号"""
+    finished = Signal(int, int, int, list)  # generation, page, size, rows
+    failed = Signal(int, int, int, str)     # generation, page, size, error
+
+
+class _PageTask(QRunnable):
+    """在线程池中加载单页数据"""
+
+    def __init__(self, provider: PageProvider, generation: int, page: int, size: int):
+        super().__init__()
+        self.provider = provider
+        self.generation = generation
+        self.page = page
+        self.size = size
+        self.signals = _PageTaskSignals()
+
+    def run(self):
+        try:
+            rows = self.provider.fetchPage(self.page, self.size)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, self.page, self.size, str(e))
+        else:
+            self.signals.finished.emit(self.generation, self.page, self.size, list(rows))
+
+
+class PageLoader(QObject):
+    """分页加载器
+
+    在线程池中异步加载页数据,结果写入 LRU 缓存后在 GUI 线程发出信号。
+    同一页同时只会有一个加载任务。
+    """
+
+    pageLoaded = Signal(int, int, list)  # page, size, rows
+    pageFailed = Signal(int, int, str)   # page, size, error
+
+    def __init__(self, provider: Optional[PageProvider] = None, cache_size: int = 16, parent=None):
+        super().__init__(parent)
+        self.cache = PageCache(cache_size)
+        self._provider = provider
+        self._generation = 0
+        self._pending = set()
+        self._tasks = {}
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+
+    def provider(self) -> Optional[PageProvider]:
+        """获取当前数据源"""
+        return self._provider
+
+    def setProvider(self, provider: Optional[PageProvider]) -> None:
+        """切换数据源,丢弃缓存及未完成任务的结果"""
+        self._provider = provider
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """清空缓存,之前发出的加载任务结果将被忽略"""
+        self._generation += 1
+        self._pending.clear()
+        self.cache.clear()
+
+    def pageCount(self, size: int) -> int:
+        """总页数,数据源总数未知时返回 -1"""
+        total = self._provider.totalCount() if self._provider else 0
+        if total < 0:
+            return -1
+        return max(1, (total + size - 1) // size)
+
+    def cached(self, page: int, size: int) -> Optional[List[dict]]:
+        """获取已缓存的页"""
+        return self.cache.get((page, size))
+
+    def isPending(self, page: int, size: int) -> bool:
+        """页是否正在加载"""
+        return (page, size) in self._pending
+
+    def request(self, page: int, size: int) -> Optional[List[dict]]:
+        """请求一页数据
+
+        命中缓存时直接返回数据,否则发起异步加载并返回 None,
+        加载完成后发出 pageLoaded 信号。
+        """
+        rows = self.cached(page, size)
+        if rows is not None:
+            return rows
+        self._submit(page, size)
+        return None
+
+    def prefetch(self, page: int, size: int) -> None:
+        """预取指定页,超出页码范围或已缓存时忽略"""
+        if page < 1:
+            return
+        count = self.pageCount(size)
+        if count >= 0 and page > count:
+            return
+        if (page, size) in self.cache:
+            return
+        self._submit(page, size)
+
+    def _submit(self, page: int, size: int) -> None:
+        """提交加载任务"""
+        if self._provider is None or (page, size) in self._pending:
+            return
+        self._pending.add((page, size))
+        task = _PageTask(self._provider, self._generation, page, size)
+        task.signals.finished.connect(self._on_task_finished)
+        task.signals.failed.connect(self._on_task_failed)
+        # 保持信号对象存活直到结果回到 GUI 线程
+        self._tasks[(self._generation, page, size)] = task
+        self._pool.start(task)
+
+    @Slot(int, int, int, list)
+    def _on_task_finished(self, generation: int, page: int, size: int, rows: list):
+        """加载完成处理"""
+        self._tasks.pop((generation, page, size), None)
+        if generation != self._generation:
+            return
+        self._pending.discard((page, size))
+        self.cache.put((page, size), rows)
+        self.pageLoaded.emit(page, size, rows)
+
+    @Slot(int, int, int, str)
+    def _on_task_failed(self, generation: int, page: int, size: int, error: str):
+        """加载失败处理"""
+        self._tasks.pop((generation, page, size), None)
+        if generation != self._generation:
+            return
+        self._pending.discard((page, size))
+        self.pageFailed.emit(page, size, error)
+
+    def waitForDone(self, msecs: int = -1) -> bool:
+        """等待所有加载任务结束"""
+        return self._pool.waitForDone(msecs)
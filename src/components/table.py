@@ -1,28 +1,380 @@
+from typing import Callable, Optional
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtWidgets import QVBoxLayout, QTableView, QHeaderView, QAbstractItemView
 from core.components import BaseComponent
+from .page_loader import PageLoader, PageProvider
+from .column_store import ColumnStore
 
-class Table(BaseComponent):
-    """高性能表格组件"""
-    def __init__(self, parent=None):
+
+class TableModel(QAbstractTableModel):
+    """表格数据模型
+
+    数据以列式存储(ColumnStore)保存,不为行创建任何控件;
+    单元格内容在视图绘制时按需读取。
+    行数通过 canFetchMore/fetchMore 分批暴露给视图,
+    视图滚动到底部时才继续加载下一批。
+    排序只替换视图行到存储行的映射,不移动数据。
+    """
+
+    DEFAULT_BATCH_SIZE = 256
+
+    def __init__(self, parent=None, batch_size: int = DEFAULT_BATCH_SIZE):
         super().__init__(parent)
-        self.data = []
-        self.columns = []
+        self._store = ColumnStore()
+        self._order = None
+        self._sort_spec = ()
+        self._columns = []
+        self._loaded = 0
+        self.batch_size = batch_size
+
+    def columns(self) -> list:
+        """获取列定义"""
+        return self._columns
+
+    def setColumns(self, columns: list) -> None:
+        """设置列定义"""
+        self.beginResetModel()
+        self._columns = list(columns)
+        self.endResetModel()
+
+    def store(self) -> ColumnStore:
+        """获取列式存储"""
+        return self._store
+
+    def setRows(self, rows: list) -> None:
+        """设置行数据(行字典列表),转换为列式存储"""
+        self.setStore(ColumnStore.fromRows(rows))
+
+    def setStore(self, store: ColumnStore) -> None:
+        """设置列式存储,只预先暴露第一批,保留当前排序"""
+        self.beginResetModel()
+        self._store = store
+        self._update_order()
+        self._loaded = min(self.batch_size, len(store))
+        self.endResetModel()
+
+    def sourceRow(self, row: int) -> int:
+        """视图行号转换为存储行号"""
+        return self._order[row] if self._order is not None else row
+
+    def rowData(self, row: int) -> dict:
+        """获取指定视图行的数据"""
+        return self._store.row(self.sourceRow(row))
+
+    def totalCount(self) -> int:
+        """数据总行数(包括尚未加载到视图的行)"""
+        return len(self._store)
+
+    def sortSpec(self) -> tuple:
+        """当前排序条件"""
+        return self._sort_spec
+
+    def sortBy(self, spec) -> None:
+        """按多列排序
+
+        Args:
+            spec: [(列名, 是否升序), ...],为空时恢复原始顺序
+        """
+        self._sort_spec = tuple(spec)
+        self._resort()
+
+    def updateSourceRows(self, first: int, rows: list) -> None:
+        """原位更新从存储行 first 开始的若干行,只重绘对应的视图行"""
+        changed = set()
+        for offset, values in enumerate(rows):
+            changed.update(self._store.setRow(first + offset, values))
+        if any(key in changed for key, _ in self._sort_spec):
+            self._resort()
+            return
+
+        last_column = max(len(self._columns) - 1, 0)
+        # 存储行号 -> 视图行号的逆排列在首次需要时构建,由 ColumnStore 按排序条件缓存
+        view_rows = self._store.inversePermutation(self._sort_spec) if self._order is not None else None
+        for source_row in range(first, first + len(rows)):
+            row = view_rows[source_row] if view_rows is not None else source_row
+            if row < self._loaded:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def insertSourceRows(self, first: int, rows: list) -> None:
+        """在存储行 first 处插入行"""
+        if not rows:
+            return
+        if self._order is not None:
+            # 排序状态下新行位置不定,重建映射,已暴露的行数不变
+            count = len(rows)
+            self._resort(lambda: self._store.insertRows(first, rows),
+                         lambda source_row: source_row + count if source_row >= first else source_row)
+        elif first > self._loaded:
+            # 尚未暴露给视图的位置,等待 fetchMore
+            self._store.insertRows(first, rows)
+        else:
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            self._store.insertRows(first, rows)
+            self._loaded += len(rows)
+            self.endInsertRows()
+
+    def removeSourceRows(self, first: int, count: int) -> None:
+        """删除从存储行 first 开始的 count 行"""
+        if count <= 0:
+            return
+        if self._order is not None:
+            # 删除的记录分散在各处,作为一次布局变化处理,删除记录上的持久索引失效
+            end = first + count
+            self._resort(lambda: self._store.removeRows(first, count),
+                         lambda source_row: source_row if source_row < first else
+                         None if source_row < end else source_row - count)
+        elif first >= self._loaded:
+            self._store.removeRows(first, count)
+        else:
+            last = min(first + count, self._loaded) - 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._store.removeRows(first, count)
+            self._loaded -= last - first + 1
+            self.endRemoveRows()
+
+    def _resort(self, update_store: Callable[[], None] = None,
+                map_source_row: Callable[[int], Optional[int]] = None) -> None:
+        """按当前排序条件重建行映射,持久索引(选中项、当前项等)跟随记录移动
+
+        Args:
+            update_store: 在 layoutAboutToBeChanged 之后修改存储(插入/删除行)
+            map_source_row: 修改存储后旧存储行号 -> 新存储行号,记录已删除时返回 None
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        # 按旧映射记下持久索引对应的存储行
+        sources = [self.sourceRow(index.row()) for index in persistent]
+        if update_store is not None:
+            update_store()
+            if map_source_row is not None:
+                sources = [map_source_row(source_row) for source_row in sources]
+        self._update_order()
+        self._loaded = min(self._loaded, len(self._store))
+        if persistent:
+            self._move_persistent(persistent, sources)
+        self.layoutChanged.emit()
+
+    def _move_persistent(self, persistent: list, sources: list) -> None:
+        """把持久索引移到其存储行的新视图行,已删除或尚未暴露给视图的行对应的索引置为无效"""
+        view_rows = self._store.inversePermutation(self._sort_spec) if self._order is not None else None
+        moved = []
+        for index, source_row in zip(persistent, sources):
+            if source_row is None:
+                moved.append(QModelIndex())
+                continue
+            row = view_rows[source_row] if view_rows is not None else source_row
+            moved.append(self.index(row, index.column()) if row < self._loaded else QModelIndex())
+        self.changePersistentIndexList(persistent, moved)
+
+    def _update_order(self) -> None:
+        """按当前排序条件计算视图行到存储行的映射"""
+        self._order = self._store.permutation(self._sort_spec) if self._sort_spec else None
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        """表头点击排序"""
+        if not 0 <= column < len(self._columns):
+            return
+        self.sortBy([(self._columns[column]["key"], order == Qt.AscendingOrder)])
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        value = self._store.value(self.sourceRow(index.row()), self._columns[index.column()]["key"])
+        return None if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            if 0 <= section < len(self._columns):
+                return self._columns[section]["title"]
+            return None
+        return section + 1
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._store)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self._store) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+
+class Table(BaseComponent):
+    """高性能表格组件
+
+    基于 QAbstractTableModel + QTableView 实现,视图只绘制可见区域的行,
+    内存占用与视口大小相关,而与数据量无关。
+
+    设置数据源(PageProvider)后进入远程分页模式:
+    页数据在后台线程加载并缓存,当前页展示时预取前后两页。
+    """
+
+    ROW_HEIGHT = 32
+
+    loadingChanged = Signal(bool)    # 当前页加载状态变更
+    loadFailed = Signal(str)         # 当前页加载失败
+
+    def setupComponent(self):
+        """组件初始化"""
+        self._data = []
         self.pagination = {
             "page": 1,
             "size": 20
         }
-        
+
+        self.loader = PageLoader(parent=self)
+        self.loader.pageLoaded.connect(self._on_page_loaded)
+        self.loader.pageFailed.connect(self._on_page_failed)
+        self._loading = False
+
+        self.model = TableModel(self)
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.view.setWordWrap(False)
+        # 先清除排序指示,避免开启排序时立即按第一列排序
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.view.setSortingEnabled(True)
+
+        # 固定行高,避免视图逐行测量尺寸
+        vertical_header = self.view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.Fixed)
+        vertical_header.setDefaultSectionSize(self.ROW_HEIGHT)
+        vertical_header.setVisible(False)
+        self.view.horizontalHeader().setStretchLastSection(True)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view)
+
+    @property
+    def columns(self) -> list:
+        """列定义: [{"title": ..., "key": ...}]"""
+        return self.model.columns()
+
+    @columns.setter
+    def columns(self, columns: list):
+        self.model.setColumns(columns)
+
+    @property
+    def data(self) -> list:
+        """表格数据"""
+        return self._data
+
+    @data.setter
+    def data(self, data: list):
+        self._data = data
+
     def setData(self, data):
         """设置表格数据"""
         self.data = data
         self.refresh()
-        
+
+    def setColumnData(self, columns: dict):
+        """直接设置列式数据: {列名: 值数组},省去行字典到列的转换"""
+        self._data = []
+        self.model.setStore(ColumnStore(columns))
+
+    def sortBy(self, spec):
+        """按多列排序: [(列名, 是否升序), ...]"""
+        self.model.sortBy(spec)
+
+    def updateRows(self, first, rows):
+        """增量更新: 替换从 first 开始的若干行"""
+        self.model.updateSourceRows(first, rows)
+
+    def insertRows(self, first, rows):
+        """增量更新: 在 first 处插入行"""
+        self.model.insertSourceRows(first, rows)
+
+    def removeRows(self, first, count):
+        """增量更新: 删除从 first 开始的 count 行"""
+        self.model.removeSourceRows(first, count)
+
+    def setDataSource(self, provider: PageProvider, cache_size: int = 16):
+        """设置分页数据源
+
+        Args:
+            provider: 分页数据源,传入 None 时回到本地数据模式
+            cache_size: 缓存的最大页数
+        """
+        self.loader.cache.capacity = cache_size
+        self.loader.setProvider(provider)
+        self.refresh()
+
+    def dataSource(self):
+        """获取分页数据源"""
+        return self.loader.provider()
+
+    def isLoading(self) -> bool:
+        """当前页是否正在加载"""
+        return self._loading
+
     def setPagination(self, page, size):
         """设置分页"""
-        self.pagination["page"] = page 
+        self.pagination["page"] = page
         self.pagination["size"] = size
         self.refresh()
-        
+
     def refresh(self):
-        """刷新表格"""
-        # TODO: 实现表格刷新逻辑
-        pass
\ No newline at end of file
+        """刷新表格
+
+        本地数据整体交给虚拟化视图展示,由 fetchMore 按需暴露行;
+        设置了数据源时只展示当前页,未缓存的页异步加载。
+        """
+        if self.loader.provider() is None:
+            self.model.setRows(self._data)
+            return
+
+        page, size = self.pagination["page"], self.pagination["size"]
+        rows = self.loader.request(page, size)
+        if rows is None:
+            self._set_loading(True)
+            return
+        self._show_page(rows)
+
+    def _show_page(self, rows):
+        """展示当前页并预取相邻页"""
+        self._data = rows
+        self.model.setRows(rows)
+        self._set_loading(False)
+
+        page, size = self.pagination["page"], self.pagination["size"]
+        self.loader.prefetch(page + 1, size)
+        self.loader.prefetch(page - 1, size)
+
+    def _set_loading(self, loading: bool):
+        """更新加载状态"""
+        if loading != self._loading:
+            self._loading = loading
+            self.loadingChanged.emit(loading)
+
+    def _on_page_loaded(self, page, size, rows):
+        """页加载完成处理,只有当前页才刷新视图"""
+        if (page, size) == (self.pagination["page"], self.pagination["size"]):
+            self._show_page(rows)
+
+    def _on_page_failed(self, page, size, error):
+        """页加载失败处理"""
+        if (page, size) == (self.pagination["page"], self.pagination["size"]):
+            self._set_loading(False)
+            self.loadFailed.emit(error)
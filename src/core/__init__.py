@@ -5,6 +5,7 @@ from .base import ViewModel
 from .components import BaseComponent
 from .theme import ThemeManager
 from .router import Router
-from .store import Store
+from .store import Store, ActionContext, ActionCancelled
 
-__all__ = ['ViewModel', 'BaseComponent', 'ThemeManager', 'Router', 'Store'] 
\ No newline at end of file
+__all__ = ['ViewModel', 'BaseComponent', 'ThemeManager', 'Router', 'Store',
+           'ActionContext', 'ActionCancelled'] 
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+共享动画调度
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from PySide6.QtCore import (QObject, Signal, QTimer, QPropertyAnimation, QParallelAnimationGroup,
+                            QEasingCurve)
+import shiboken6
+
+
+class AnimationManager(QObject):
+    """共享的属性动画调度器
+
+    同一次事件循环中提交的动画请求合并到一个 QParallelAnimationGroup 中同时开始,
+    QPropertyAnimation 和动画组用完后放回池中复用。
+    完成回调保存在调度器中,动画组结束时各调用一次,不会在信号上累积连接。
+
+    对同一对象同一属性的新请求会取代尚未完成的旧请求:旧动画立即停止,
+    其完成回调不再调用,新动画默认从属性当前值开始。
+
+    reduced motion 模式下不播放动画,请求立即设置为结束值并调用回调。
+
+    使用单例模式,只能在 GUI 线程中使用。
+    """
+    reducedMotionChanged = Signal(bool)
+
+    DURATION = 200
+    EASING = QEasingCurve.InOutCubic
+    POOL_SIZE = 32  # 最多保留的空闲动画数量
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AnimationManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            super().__init__()
+            self._initialized = True
+            self._reduced_motion = False
+            self._flush_scheduled = False
+            # (对象, 属性名) -> (起始值, 结束值, 完成回调, 时长)
+            self._pending: Dict[Tuple[QObject, bytes], tuple] = {}
+            self._running: Dict[Tuple[QObject, bytes], QPropertyAnimation] = {}
+            self._keys: Dict[QPropertyAnimation, Tuple[QObject, bytes]] = {}
+            self._callbacks: Dict[QPropertyAnimation, Callable] = {}
+            self._groups: List[QParallelAnimationGroup] = []  # 正在播放的动画组
+            self._free: List[QPropertyAnimation] = []
+            self._free_groups: List[QParallelAnimationGroup] = []
+
+    def reducedMotion(self) -> bool:
+        """是否关闭动画"""
+        return self._reduced_motion
+
+    def setReducedMotion(self, enabled: bool) -> None:
+        """开启后不再播放动画,正在播放和等待开始的动画立即完成"""
+        if enabled == self._reduced_motion:
+            return
+        self._reduced_motion = enabled
+        self.reducedMotionChanged.emit(enabled)
+        if not enabled:
+            return
+        pending, self._pending = self._pending, {}
+        for (target, name), (_, end, on_finished, _) in pending.items():
+            self._apply(target, name, end, on_finished)
+        for group in list(self._groups):
+            # 跳到结尾会正常发出 finished,回调照常调用
+            group.setCurrentTime(group.totalDuration())
+
+    def animate(self, target: QObject, property_name: bytes, end, start=None,
+                on_finished: Optional[Callable] = None, duration: int = None) -> None:
+        """请求属性动画,在下一次事件循环中与同一轮的其他请求一起开始
+
+        Args:
+            target: 目标对象
+            property_name: 属性名,如 b"maximumHeight"
+            end: 结束值
+            start: 起始值,默认为开始时属性的当前值
+            on_finished: 动画正常结束时调用(被新请求取代时不调用)
+            duration: 时长(毫秒),默认 DURATION
+        """
+        key = (target, bytes(property_name))
+        if self._reduced_motion:
+            self._pending.pop(key, None)
+            self._cancel(key)
+            self._apply(target, key[1], end, on_finished)
+            return
+        self._pending[key] = (start, end, on_finished, duration or self.DURATION)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def isAnimating(self, target: QObject, property_name: bytes) -> bool:
+        """该属性是否有等待开始或正在播放的动画"""
+        key = (target, bytes(property_name))
+        return key in self._pending or key in self._running
+
+    def runningCount(self) -> int:
+        """正在播放的动画数量"""
+        return len(self._running)
+
+    def pooledCount(self) -> int:
+        """池中空闲的动画数量"""
+        return len(self._free)
+
+    def flush(self) -> None:
+        """立即开始等待中的动画请求(合并为一个并行动画组)"""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        group = self._free_groups.pop() if self._free_groups else self._new_group()
+        for key, (start, end, on_finished, duration) in pending.items():
+            self._cancel(key)
+            target, name = key
+            if not shiboken6.isValid(target):
+                continue
+            animation = self._free.pop() if self._free else QPropertyAnimation()
+            animation.setTargetObject(target)
+            animation.setPropertyName(name)
+            animation.setStartValue(target.property(name.decode()) if start is None else start)
+            animation.setEndValue(end)
+            animation.setDuration(duration)
+            animation.setEasingCurve(self.EASING)
+            group.addAnimation(animation)
+            self._running[key] = animation
+            self._keys[animation] = key
+            if on_finished is not None:
+                self._callbacks[animation] = on_finished
+        if group.animationCount():
+            self._groups.append(group)
+            group.start()
+        else:
+            self._free_groups.append(group)
+
+    def _new_group(self) -> QParallelAnimationGroup:
+        group = QParallelAnimationGroup(self)
+        # 每个动画组只在创建时连接一次
+        group.finished.connect(lambda: self._on_group_finished(group))
+        return group
+
+    @staticmethod
+    def _apply(target, name: bytes, end, on_finished) -> None:
+        """不播放动画,直接设置结束值"""
+        if not shiboken6.isValid(target):
+            return
+        target.setProperty(name.decode(), end)
+        if on_finished is not None:
+            on_finished()
+
+    def _cancel(self, key) -> None:
+        """停止该属性正在播放的动画,不调用其完成回调"""
+        animation = self._running.get(key)
+        if animation is None:
+            return
+        group = animation.group()
+        group.takeAnimation(group.indexOfAnimation(animation))
+        animation.stop()
+        self._callbacks.pop(animation, None)
+        self._release(animation)
+        if not group.animationCount():
+            group.stop()
+            self._recycle_group(group)
+
+    def _release(self, animation: QPropertyAnimation) -> None:
+        """动画放回池中"""
+        key = self._keys.pop(animation)
+        if self._running.get(key) is animation:
+            del self._running[key]
+        # 不调用 setTargetObject(None)(PySide6 中会导致 None 的引用计数错误),
+        # 目标以 QPointer 保存,不影响其释放,复用时再设置新的目标
+        if len(self._free) < self.POOL_SIZE:
+            self._free.append(animation)
+
+    def _recycle_group(self, group: QParallelAnimationGroup) -> None:
+        if group in self._groups:
+            self._groups.remove(group)
+            self._free_groups.append(group)
+
+    def _on_group_finished(self, group: QParallelAnimationGroup) -> None:
+        """动画组结束:取出全部动画放回池中,再调用完成回调"""
+        callbacks = []
+        while group.animationCount():
+            animation = group.takeAnimation(0)
+            # 目标已删除(如菜单项被移除)时不调用回调
+            alive = animation.targetObject() is not None
+            callback = self._callbacks.pop(animation, None)
+            self._release(animation)
+            if callback is not None and alive:
+                callbacks.append(callback)
+        self._recycle_group(group)
+        for callback in callbacks:
+            callback()
@@ -1,17 +1,127 @@
-from PySide6.QtCore import QObject, Signal, Property
+from contextlib import contextmanager
+from PySide6.QtCore import QObject, Signal, Property, QTimer
+from .diff import diff_data, KEY_CHANGED, ROWS_UPDATED, ROWS_INSERTED, ROWS_REMOVED
 
 class ViewModel(QObject):
-    """基础ViewModel类,实现数据绑定"""
+    """基础ViewModel类,实现数据绑定
+
+    setData 时对比新旧状态,除 dataChanged 外还发出细粒度信号:
+    非列表值变化发出 keyChanged,列表值发出行级的插入/删除/更新信号,
+    绑定的组件可以只应用增量。
+
+    同一次事件循环内的多次 setData 会合并为一次通知;
+    beginUpdate/endUpdate 或 batchUpdate() 之间的修改在结束时统一通知。
+    """
     dataChanged = Signal()  # 数据变更信号
-    
-    def __init__(self):
+    keyChanged = Signal(str)               # 键变更(新增/删除/替换)
+    rowsInserted = Signal(str, int, int)   # 列表插入行(键, 起始行, 结束行)
+    rowsRemoved = Signal(str, int, int)    # 列表删除行(键, 起始行, 结束行)
+    rowsUpdated = Signal(str, int, int)    # 列表更新行(键, 起始行, 结束行)
+
+    def __init__(self, coalesce: bool = True):
+        """
+        Args:
+            coalesce: 是否把同一次事件循环内的修改合并为一次通知,
+                为 False 时每次 setData 立即通知
+        """
         super().__init__()
         self._data = {}
-        
+        self._notified = self._data  # 上次通知时的状态
+        self._dirty = False
+        self._batch_depth = 0
+        self._flush_scheduled = False
+        self._coalesce = coalesce
+
     @Property(dict, notify=dataChanged)
     def data(self):
         return self._data
-        
+
     def setData(self, value):
         self._data = value
-        self.dataChanged.emit() 
\ No newline at end of file
+        self._dirty = True
+        if self._batch_depth:
+            return
+        if self._coalesce:
+            self._schedule_flush()
+        else:
+            self.flush()
+
+    def setValue(self, key, value):
+        """修改单个键,其余键保持引用不变"""
+        data = dict(self._data)
+        data[key] = value
+        self.setData(data)
+
+    def beginUpdate(self):
+        """开始批量修改,可嵌套"""
+        self._batch_depth += 1
+
+    def endUpdate(self):
+        """结束批量修改,最外层结束时立即通知一次"""
+        if self._batch_depth == 0:
+            raise RuntimeError("endUpdate 调用次数多于 beginUpdate")
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
+
+    @contextmanager
+    def batchUpdate(self):
+        """批量修改上下文
+
+        with vm.batchUpdate():
+            vm.setValue('users', users)
+            vm.setValue('total', len(users))
+        """
+        self.beginUpdate()
+        try:
+            yield self
+        finally:
+            self.endUpdate()
+
+    def isUpdating(self) -> bool:
+        """是否处于批量修改中"""
+        return self._batch_depth > 0
+
+    def flush(self):
+        """立即发出尚未通知的变更
+
+        与上次通知时的状态对比,多次修改只产生一组信号。
+        """
+        if not self._dirty:
+            return
+        old, value = self._notified, self._data
+        self._notified = value
+        self._dirty = False
+        if old is value:
+            # 原地修改过的字典无法对比,按全部键变更处理
+            changes = [(KEY_CHANGED, key) for key in value]
+        else:
+            changes = diff_data(old, value)
+        if changes:
+            self._emit_changes(changes)
+            self.dataChanged.emit()
+
+    def _schedule_flush(self):
+        """在下一次事件循环中通知"""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._on_flush_timeout)
+
+    def _on_flush_timeout(self):
+        """合并通知定时器回调"""
+        self._flush_scheduled = False
+        if not self._batch_depth:
+            self.flush()
+
+    def _emit_changes(self, changes):
+        """按变更类型发出细粒度信号"""
+        for change in changes:
+            kind = change[0]
+            if kind == KEY_CHANGED:
+                self.keyChanged.emit(change[1])
+            elif kind == ROWS_UPDATED:
+                self.rowsUpdated.emit(*change[1:])
+            elif kind == ROWS_INSERTED:
+                self.rowsInserted.emit(*change[1:])
+            elif kind == ROWS_REMOVED:
+                self.rowsRemoved.emit(*change[1:])
@@ -12,4 +12,20 @@ class BaseComponent(QWidget):
         
     def updateStyle(self, theme):
         """更新组件样式"""
-        pass 
\ No newline at end of file
+        pass
+        
+    def setParams(self, params):
+        """接收路由参数"""
+        pass
+        
+    def activated(self):
+        """页面被路由激活(包括从缓存中恢复)"""
+        pass
+        
+    def deactivated(self):
+        """页面被路由切走,可能被缓存复用"""
+        pass
+        
+    def estimateMemory(self) -> int:
+        """估算页面占用的内存(字节),0 表示使用路由的默认值"""
+        return 0
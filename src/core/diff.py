@@ -0,0 +1,237 @@
+"""
+状态结构化对比
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# 变更类型
+KEY_CHANGED = "key"
+ROWS_UPDATED = "updated"
+ROWS_INSERTED = "inserted"
+ROWS_REMOVED = "removed"
+
+# 树节点变更类型
+NODE_INSERTED = "inserted"
+NODE_MOVED = "moved"
+NODE_UPDATED = "updated"
+NODE_REMOVED = "removed"
+
+
+def _same(a, b) -> bool:
+    """判断两个值是否相同,先比较引用再比较值"""
+    return a is b or a == b
+
+
+def diff_list(old: list, new: list) -> List[Tuple[str, int, int]]:
+    """对比两个列表,返回行级变更
+
+    跳过相同的前缀和后缀,中间部分的公共长度视为原位更新,
+    多出的部分为插入(新列表下标)或删除(旧列表下标)。
+    更新不改变行号,因此按返回顺序依次应用即可。
+
+    Returns:
+        [(变更类型, 起始行, 结束行), ...]
+    """
+    if old is new:
+        return []
+    old_len, new_len = len(old), len(new)
+    limit = min(old_len, new_len)
+
+    start = 0
+    while start < limit and _same(old[start], new[start]):
+        start += 1
+
+    end = 0
+    while end < limit - start and _same(old[old_len - 1 - end], new[new_len - 1 - end]):
+        end += 1
+
+    old_mid = old_len - end - start
+    new_mid = new_len - end - start
+    common = min(old_mid, new_mid)
+
+    changes = []
+    if common:
+        changes.append((ROWS_UPDATED, start, start + common - 1))
+    if new_mid > common:
+        changes.append((ROWS_INSERTED, start + common, start + new_mid - 1))
+    elif old_mid > common:
+        changes.append((ROWS_REMOVED, start + common, start + old_mid - 1))
+    return changes
+
+
+def diff_data(old: dict, new: dict) -> List[tuple]:
+    """对比两份状态字典
+
+    列表类型的值给出行级变更,其余值只报告键变更。
+    新增、删除或类型改变的键同样报告为键变更。
+
+    Returns:
+        [(KEY_CHANGED, 键) 或 (行变更类型, 键, 起始行, 结束行), ...]
+    """
+    if old is new:
+        return []
+    changes = []
+    for key, value in new.items():
+        if key not in old:
+            changes.append((KEY_CHANGED, key))
+            continue
+        previous = old[key]
+        if previous is value:
+            continue
+        if isinstance(previous, list) and isinstance(value, list):
+            changes.extend((kind, key, first, last) for kind, first, last in diff_list(previous, value))
+        elif previous != value:
+            changes.append((KEY_CHANGED, key))
+    for key in old:
+        if key not in new:
+            changes.append((KEY_CHANGED, key))
+    return changes
+
+
+class TreeChange(NamedTuple):
+    """树节点变更"""
+    kind: str                # NODE_INSERTED / NODE_MOVED / NODE_UPDATED / NODE_REMOVED
+    id: str
+    parent: Optional[str]    # 所在父节点 id(删除时为原父节点),None 表示顶层
+    row: int                 # 在父节点子节点中的位置,删除时为 -1
+    node: Optional[dict]     # 新的节点数据,删除时为 None
+
+
+def _index_tree(roots: list, key: str, children: str, order) -> tuple:
+    """遍历树,返回 (id -> 节点, id -> 父 id, 父 id -> 有序子 id 列表)"""
+    nodes, parents, kids = {}, {}, {}
+    stack = [(None, roots)]
+    while stack:
+        parent, items = stack.pop()
+        ids = kids[parent] = []
+        for item in (order(items) if order else items):
+            node_id = item[key]
+            nodes[node_id] = item
+            parents[node_id] = parent
+            ids.append(node_id)
+            if item.get(children):
+                stack.append((node_id, item[children]))
+    return nodes, parents, kids
+
+
+def _stable_children(current: List[str], position: Dict[str, int]) -> set:
+    """current 中按目标位置递增的最长子序列,这些子节点不需要移动"""
+    tails, tail_ids, previous = [], [], {}
+    for node_id in current:
+        target = position.get(node_id)
+        if target is None:
+            continue
+        at = bisect_left(tails, target)
+        previous[node_id] = tail_ids[at - 1] if at else None
+        if at == len(tails):
+            tails.append(target)
+            tail_ids.append(node_id)
+        else:
+            tails[at] = target
+            tail_ids[at] = node_id
+    stable = set()
+    node_id = tail_ids[-1] if tail_ids else None
+    while node_id is not None:
+        stable.add(node_id)
+        node_id = previous[node_id]
+    return stable
+
+
+def _same_fields(before: dict, after: dict, children: str) -> bool:
+    """比较节点除子节点以外的字段"""
+    if len(before) - (children in before) != len(after) - (children in after):
+        return False
+    for name, value in before.items():
+        if name != children and (name not in after or after[name] != value):
+            return False
+    return True
+
+
+def _patch_children(parent, target, items, kept, location, current, nodes, changes):
+    """把 parent 当前的子节点 items 调整为 target,记录插入和移动"""
+    position = {node_id: row for row, node_id in enumerate(target)
+                if node_id in kept and location[node_id] == parent}
+    stable = _stable_children(items, position)
+    row = -1  # 上一个目标子节点在 items 中的位置
+    for node_id in target:
+        if node_id in stable:
+            row = items.index(node_id, row + 1)
+            continue
+        if node_id in kept:
+            source = current[location[node_id]]
+            at = source.index(node_id)
+            del source[at]
+            if source is items and at < row:
+                row -= 1
+            location[node_id] = parent
+            kind = NODE_MOVED
+        else:
+            kind = NODE_INSERTED
+        row += 1
+        items.insert(row, node_id)
+        changes.append(TreeChange(kind, node_id, parent, row, nodes[node_id]))
+
+
+def diff_tree(old: list, new: list, key: str = "id", children: str = "children",
+              order: Callable[[list], list] = None) -> List[TreeChange]:
+    """按 id 对比两棵树,返回节点级变更
+
+    父节点被删除(或作为新节点插入)时,其子树随之删除(或插入),
+    不再单独报告。同一父节点下按目标位置的最长递增子序列保持不动,
+    其余子节点报告为移动,因此调整顺序时变更数最少。
+
+    按返回顺序依次应用即可得到新树:先删除,再自顶向下插入和移动,
+    row 为应用到该条变更时的位置;最后是节点自身字段(不含子节点)的更新,
+    row 为新树中的位置。
+
+    Args:
+        key: 节点 id 字段
+        children: 子节点列表字段
+        order: 同级节点的显示顺序(如按 sort 排序),默认为列表顺序
+    """
+    old_nodes, old_parents, old_kids = _index_tree(old, key, children, order)
+    new_nodes, new_parents, new_kids = _index_tree(new, key, children, order)
+
+    # 新旧树中都存在、且新旧父节点都保留的节点原地保留,其余随父节点删除或插入
+    kept = old_nodes.keys() & new_nodes.keys()
+
+    def orphaned(node_id):
+        old_parent, new_parent = old_parents[node_id], new_parents[node_id]
+        return ((old_parent is not None and old_parent not in kept)
+                or (new_parent is not None and new_parent not in kept))
+
+    pending = [node_id for node_id in kept if orphaned(node_id)]
+    while pending:
+        node_id = pending.pop()
+        if node_id in kept and orphaned(node_id):
+            kept.discard(node_id)
+            pending.extend(old_kids.get(node_id, ()))
+            pending.extend(new_kids.get(node_id, ()))
+
+    changes = []
+    for node_id, parent in old_parents.items():
+        if node_id not in kept and (parent is None or parent in kept):
+            changes.append(TreeChange(NODE_REMOVED, node_id, parent, -1, None))
+
+    # 删除之后各父节点当前的子节点,用于计算插入和移动时的位置
+    current = {parent: [node_id for node_id in ids if node_id in kept]
+               for parent, ids in old_kids.items() if parent is None or parent in kept}
+    location = {node_id: old_parents[node_id] for node_id in kept}
+
+    queue = [None]
+    while queue:
+        parent = queue.pop()
+        target = new_kids[parent]
+        items = current.setdefault(parent, [])
+        if items != target:
+            _patch_children(parent, target, items, kept, location, current, new_nodes, changes)
+        # 只有新树中有子节点的节点需要继续处理
+        queue.extend(node_id for node_id in target if node_id in new_kids and node_id in kept)
+
+    for parent, ids in new_kids.items():
+        for row, node_id in enumerate(ids):
+            if node_id in kept:
+                before, after = old_nodes[node_id], new_nodes[node_id]
+                if before is not after and not _same_fields(before, after, children):
+                    changes.append(TreeChange(NODE_UPDATED, node_id, parent, row, after))
+    return changes
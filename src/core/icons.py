@@ -0,0 +1,131 @@
+"""
+图标缓存
+"""
+import json
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QIcon, QPixmap
+
+ICON_DIR = Path(__file__).resolve().parent.parent / "resources" / "icons"
+# 可选的图标图集:所有图标打包在一张图片中,索引文件记录每个图标的位置 [x, y, 宽, 高]
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+
+
+class IconCache:
+    """进程级图标缓存
+
+    解码后的图标按 (名称, 尺寸, 设备像素比) 缓存,同名图标在整个进程中只解码一次,
+    菜单项再多也只保留每种图标一份位图。图标目录中有图集(atlas.json + atlas.png)时
+    优先从图集裁剪,只需读取一个文件;图集中没有的图标再读取单独的文件。
+    不存在的图标同样缓存(空位图),不会重复访问文件系统。
+
+    使用单例模式,只能在 GUI 线程中使用(QPixmap 不是线程安全的)。
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IconCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, '_initialized'):
+            self._initialized = True
+            self.hits = 0
+            self.misses = 0
+            self._pixmaps: Dict[Tuple[str, int, float], QPixmap] = {}
+            self._icons: Dict[str, QIcon] = {}
+            self._directory = ICON_DIR
+            self._atlas_index: Optional[Dict[str, list]] = None  # 首次使用时读取
+            self._atlas: Optional[QPixmap] = None
+
+    def set_directory(self, directory) -> None:
+        """设置图标目录并清空缓存"""
+        self._directory = Path(directory)
+        self.clear()
+
+    def clear(self) -> None:
+        """清空缓存和计数"""
+        self._pixmaps.clear()
+        self._icons.clear()
+        self._atlas_index = None
+        self._atlas = None
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中次数和缓存的位图数量"""
+        return {'hits': self.hits, 'misses': self.misses, 'pixmaps': len(self._pixmaps)}
+
+    def pixmap(self, name: str, size: int = 16, dpr: float = 1.0) -> QPixmap:
+        """获取图标位图,图标不存在时返回空位图
+
+        Args:
+            name: 图标名称(如 "file",对应 file.png)或带扩展名的文件名
+            size: 逻辑尺寸(像素)
+            dpr: 设备像素比,位图按 size * dpr 解码并记录该比例
+        """
+        key = (name, size, dpr)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        pixmap = self._decode(name, round(size * dpr))
+        if not pixmap.isNull():
+            pixmap.setDevicePixelRatio(dpr)
+        self._pixmaps[key] = pixmap
+        return pixmap
+
+    def icon(self, name: str) -> QIcon:
+        """获取图标(QIcon 按需生成各尺寸),图标不存在时返回空图标"""
+        icon = self._icons.get(name)
+        if icon is not None:
+            self.hits += 1
+            return icon
+        self.misses += 1
+        rect = self._atlas_rect(name)
+        if rect is not None:
+            icon = QIcon(self._load_atlas().copy(rect))
+        else:
+            path = self._path(name)
+            icon = QIcon(str(path)) if path.exists() else QIcon()
+        self._icons[name] = icon
+        return icon
+
+    def _path(self, name: str) -> Path:
+        return self._directory / (name if Path(name).suffix else f"{name}.png")
+
+    def _decode(self, name: str, pixels: int) -> QPixmap:
+        """从图集或文件解码并缩放到 pixels 大小"""
+        rect = self._atlas_rect(name)
+        if rect is not None:
+            pixmap = self._load_atlas().copy(rect)
+        else:
+            path = self._path(name)
+            pixmap = QPixmap(str(path)) if path.exists() else QPixmap()
+        if pixmap.isNull() or (pixmap.width() == pixels and pixmap.height() == pixels):
+            return pixmap
+        return pixmap.scaled(pixels, pixels, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def _atlas_rect(self, name: str) -> Optional[QRect]:
+        """图标在图集中的位置,没有图集或图集中没有该图标时返回 None"""
+        if self._atlas_index is None:
+            self._atlas_index = {}
+            index_path = self._directory / ATLAS_INDEX
+            if index_path.exists():
+                try:
+                    with open(index_path, encoding='utf-8') as f:
+                        self._atlas_index = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        rect = self._atlas_index.get(Path(name).stem)
+        return QRect(*rect) if rect else None
+
+    def _load_atlas(self) -> QPixmap:
+        if self._atlas is None:
+            self._atlas = QPixmap(str(self._directory / ATLAS_IMAGE))
+        return self._atlas
@@ -1,22 +1,218 @@
+import gc
+import hashlib
 import json
+import marshal
 import os
+import threading
+from contextlib import contextmanager
 from typing import Dict, List, Optional
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import (QObject, Signal, QFileSystemWatcher, QTimer, QRunnable, QThreadPool,
+                            QStandardPaths)
+from .menu_schema import MenuValidator, ValidationIssue, format_issues
+from .permissions import PermissionMasks
+from .diff import diff_tree, NODE_INSERTED, NODE_MOVED, NODE_UPDATED, NODE_REMOVED
 
 class MenuLoadError(Exception):
-    """菜单加载错误异常类"""
-    pass
+    """菜单加载错误异常类
+    
+    配置校验失败时 errors 为全部 ValidationIssue
+    """
+    
+    def __init__(self, message: str, errors: List[ValidationIssue] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+# 循环垃圾回收的开关是进程级的:工作线程暂停时 GUI 线程同样不做循环回收。
+# 后台加载与监听触发的重新加载可能重叠,用计数记录正在读取的次数,
+# 只在第一个读取开始时关闭、最后一个结束时恢复
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_paused = False  # 是否由这里关闭了 GC
+
+@contextmanager
+def _pause_gc():
+    """读取期间暂停循环垃圾回收,可在多个线程中同时使用
+    
+    开始时 GC 已被其他代码关闭的不做处理,结束时 GC 已被其他代码重新打开的也不再改动。
+    """
+    global _gc_pauses, _gc_paused
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_paused = gc.isenabled()
+            if _gc_paused:
+                gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_paused:
+                _gc_paused = False
+                if not gc.isenabled():
+                    gc.enable()
+
+def sort_menus(menus: List[Dict]) -> List[Dict]:
+    """按 sort 字段排序同级菜单,未设置 sort 的排在最后,顺序稳定"""
+    return sorted(menus, key=lambda menu: menu.get('sort', float('inf')))
+
+def count_menus(menus: List[Dict]) -> int:
+    """统计菜单节点总数(包括各级子菜单)"""
+    count = 0
+    stack = list(menus)
+    while stack:
+        menu = stack.pop()
+        count += 1
+        stack.extend(menu.get('children') or [])
+    return count
+
+def index_menus(menus: List[Dict]) -> Dict[str, Dict]:
+    """按 id 索引全部菜单节点(包括各级子菜单)"""
+    index = {}
+    stack = list(menus)
+    while stack:
+        menu = stack.pop()
+        index[menu['id']] = menu
+        stack.extend(menu.get('children') or [])
+    return index
+
+
+class MenuIndex:
+    """菜单索引
+    
+    单次遍历建立 id -> 节点、路由 -> id 和 id -> 父 id 三张表,
+    按路由或 id 查找节点为常数时间,祖先路径只需沿父指针向上 O(层级) 遍历。
+    """
+    __slots__ = ('nodes', 'routes', 'parents')
+    
+    def __init__(self, menus: List[Dict] = None):
+        self.nodes: Dict[str, Dict] = {}            # id -> 菜单节点
+        self.routes: Dict[str, str] = {}            # 路由 -> id
+        self.parents: Dict[str, Optional[str]] = {}  # id -> 父 id,一级菜单为 None
+        if menus:
+            self.build(menus)
+            
+    def build(self, menus: List[Dict]) -> None:
+        """重新建立索引(不递归)"""
+        nodes, routes, parents = {}, {}, {}
+        stack = [(menu, None) for menu in menus]
+        while stack:
+            menu, parent_id = stack.pop()
+            menu_id = menu['id']
+            nodes[menu_id] = menu
+            parents[menu_id] = parent_id
+            route = menu.get('route')
+            if route:
+                routes[route] = menu_id
+            children = menu.get('children')
+            if children:
+                stack.extend((child, menu_id) for child in children)
+        self.nodes, self.routes, self.parents = nodes, routes, parents
+        
+    def tables(self) -> tuple:
+        """(nodes, routes, parents),可用 marshal 序列化"""
+        return self.nodes, self.routes, self.parents
+        
+    @classmethod
+    def from_tables(cls, tables: tuple) -> 'MenuIndex':
+        """从 tables() 的结果恢复,不重新遍历"""
+        index = cls()
+        index.nodes, index.routes, index.parents = tables
+        return index
+        
+    def find_route(self, route: str) -> Optional[Dict]:
+        """按路由查找菜单节点"""
+        menu_id = self.routes.get(route)
+        return None if menu_id is None else self.nodes[menu_id]
+        
+    def path(self, menu_id: str) -> List[Dict]:
+        """从一级菜单到该菜单的节点列表,id 不存在时为空列表"""
+        path = []
+        parents, nodes = self.parents, self.nodes
+        while menu_id is not None and menu_id in nodes:
+            path.append(nodes[menu_id])
+            menu_id = parents[menu_id]
+        path.reverse()
+        return path
+        
+    def route_path(self, route: str) -> List[Dict]:
+        """从一级菜单到路由对应菜单的节点列表,路由不存在时为空列表"""
+        menu_id = self.routes.get(route)
+        return [] if menu_id is None else self.path(menu_id)
+        
+    def breadcrumb(self, route: str) -> List[str]:
+        """路由对应菜单的祖先标题(含自身)"""
+        return [menu['title'] for menu in self.route_path(route)]
+
+
+def compile_menus(menus: List[Dict]) -> List[Dict]:
+    """按 sort 排序各级同级菜单(原地修改),返回排序后的一级菜单"""
+    menus = sort_menus(menus)
+    stack = list(menus)
+    while stack:
+        menu = stack.pop()
+        children = menu.get('children')
+        if children:
+            menu['children'] = sort_menus(children)
+            stack.extend(menu['children'])
+    return menus
+
+class _LoadTaskSignals(QObject):
+    """工作线程回传结果用的信号"""
+    finished = Signal(int, object)  # generation, (menus, MenuIndex, masks, from_cache)
+    failed = Signal(int, str)       # generation, error
+
+class _LoadTask(QRunnable):
+    """在线程池中读取配置文件"""
+    
+    def __init__(self, loader, generation: int):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.signals = _LoadTaskSignals()
+        
+    def run(self):
+        try:
+            result = self.loader._read_config()
+        except MenuLoadError as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, result)
 
 class MenuLoader(QObject):
     """菜单配置加载器
     
     使用单例模式确保全局只有一个实例
     继承QObject以支持信号机制
+    
+    load_async() 在工作线程中读取配置,完成后在 GUI 线程发出 menu_loaded。
+    
+    验证并排序后的菜单树、菜单索引(MenuIndex)和权限位图以 marshal 格式缓存到磁盘,
+    缓存记录源文件的修改时间、大小和内容哈希:修改时间和大小一致时直接使用缓存,
+    不读取源文件;不一致但哈希相同(如文件被 touch 或复制)时同样使用缓存。
+    命中缓存时跳过 JSON 解析和验证。
+    
+    调用 watch() 后监听配置文件,文件变化时(合并 RELOAD_DELAY 毫秒内的多次写入)
+    重新解析,按菜单 id 与当前配置对比,发出节点级变更信号,
+    界面只需修改受影响的菜单项,不必整体重建。
+    
+    filter_menus() 按用户权限返回过滤后的菜单树,权限位图(PermissionMasks)
+    在加载时计算一次,切换用户或角色时只需按位运算重新过滤。
     """
     
     # 定义信号
-    menu_loaded = Signal(list)  # 菜单加载完成信号
-    load_error = Signal(str)    # 加载错误信号
+    # 菜单数据以 object 类型传递,避免大配置在每次发出信号时转换为 QVariant 副本
+    menu_loaded = Signal(object)  # 菜单加载完成信号(菜单列表)
+    load_error = Signal(str)      # 加载错误信号
+    menu_inserted = Signal(str, str, int, object)  # 插入信号(id, 父 id, 位置, 配置),顶层父 id 为空字符串
+    menu_moved = Signal(str, str, int)             # 移动信号(id, 新父 id, 位置)
+    menu_updated = Signal(str, object)             # 更新信号(id, 配置),不含子菜单变化
+    menu_removed = Signal(str)                     # 删除信号(id),子菜单随之删除
+    menu_patched = Signal(object, object)          # 一次重新加载的全部变更(TreeChange 列表, 新配置)
+    
+    RELOAD_DELAY = 200  # 文件变化后等待的毫秒数
+    CACHE_FORMAT = 4    # 缓存格式版本,缓存内容结构或校验规则变化时递增
+    PAUSE_GC = True     # 读取配置期间暂停循环垃圾回收(进程级,对所有线程生效)
     
     _instance = None
     
@@ -31,108 +227,306 @@ class MenuLoader(QObject):
             self._initialized = True
             self._menu_config = None
             self._config_path = os.path.join('src', 'resources', 'config', 'menus.json')
+            self._menu_index = MenuIndex()
+            self._permission_masks = PermissionMasks()
+            self._validator = MenuValidator()
+            self._cache_path = self._default_cache_path()
+            self._from_cache = False
+            self._watcher = None
+            self._reload_timer = None
+            self._generation = 0
+            self._tasks = {}
+            self._pool = QThreadPool(self)
+            self._pool.setMaxThreadCount(1)
     
     @property
     def menu_config(self) -> Optional[List[Dict]]:
         """获取当前加载的菜单配置"""
         return self._menu_config
         
+    @property
+    def menu_index(self) -> Dict[str, Dict]:
+        """菜单 id -> 菜单节点"""
+        return self._menu_index.nodes
+        
+    @property
+    def tree_index(self) -> MenuIndex:
+        """当前配置的菜单索引(id、路由和父节点),每次加载时建立"""
+        return self._menu_index
+        
+    def find_route(self, route: str) -> Optional[Dict]:
+        """按路由查找菜单节点"""
+        return self._menu_index.find_route(route)
+        
+    def breadcrumb(self, route: str) -> List[str]:
+        """路由对应菜单从一级菜单开始的标题列表,路由不在菜单中时为空列表"""
+        return self._menu_index.breadcrumb(route)
+        
+    @property
+    def permission_masks(self) -> PermissionMasks:
+        """当前配置的权限位图"""
+        return self._permission_masks
+        
+    @property
+    def from_cache(self) -> bool:
+        """最近一次加载是否命中磁盘缓存"""
+        return self._from_cache
+        
     def load_config(self) -> None:
         """加载菜单配置
         
         从配置文件加载菜单配置,进行验证后发出相应信号
         如果加载失败,发出错误信号
         """
+        # 同步加载使之前的后台加载结果失效
+        self._generation += 1
+        try:
+            result = self._read_config()
+        except MenuLoadError as e:
+            self.load_error.emit(str(e))
+            raise
+        self._set_config(result)
+        
+    def filter_menus(self, permissions) -> List[Dict]:
+        """返回拥有 permissions 的用户可见的菜单树
+        
+        未配置 permissions 的菜单对所有用户可见,配置了的需要拥有其中任一权限,
+        父菜单不可见时子菜单一并隐藏,没有路由且子菜单全部不可见的分组菜单也会隐藏。
+        返回的节点可能与 menu_config 共享,应视为只读。
+        
+        Args:
+            permissions: 用户拥有的权限列表
+        """
+        if self._menu_config is None:
+            return []
+        masks = self._permission_masks
+        return masks.filter(self._menu_config, masks.mask(permissions))
+        
+    def load_async(self) -> None:
+        """在工作线程中加载菜单配置,完成后在 GUI 线程发出 menu_loaded
+        
+        失败时发出 load_error。重复调用时只采用最后一次的结果。
+        """
+        self._generation += 1
+        task = _LoadTask(self, self._generation)
+        task.signals.finished.connect(self._on_task_finished)
+        task.signals.failed.connect(self._on_task_failed)
+        # 保留任务引用,避免信号对象在结果送达前被回收
+        self._tasks[self._generation] = task
+        self._pool.start(task)
+        
+    def wait(self, msecs: int = -1) -> bool:
+        """等待后台加载任务完成(结果仍通过事件循环送达)"""
+        return self._pool.waitForDone(msecs)
+        
+    def _on_task_finished(self, generation, result):
+        self._tasks.pop(generation, None)
+        if generation == self._generation:
+            self._set_config(result)
+            
+    def _on_task_failed(self, generation, error):
+        self._tasks.pop(generation, None)
+        if generation == self._generation:
+            self.load_error.emit(error)
+            
+    def _set_config(self, result) -> None:
+        """更新配置并发出信号"""
+        self._menu_config, self._menu_index, self._permission_masks, self._from_cache = result
+        self.menu_loaded.emit(self._menu_config)
+        
+    def reload(self) -> list:
+        """重新加载配置文件,按菜单 id 与当前配置对比并发出变更信号
+        
+        加载失败时保留当前配置,只发出 load_error 信号。
+        
+        Returns:
+            TreeChange 列表,加载失败时为空列表
+        """
+        if self._menu_config is None:
+            try:
+                self.load_config()
+            except MenuLoadError:
+                pass
+            return []
+        try:
+            menus, index, masks, self._from_cache = self._read_config()
+        except MenuLoadError as e:
+            self.load_error.emit(str(e))
+            return []
+        
+        changes = diff_tree(self._menu_config, menus, order=sort_menus)
+        self._menu_config, self._menu_index, self._permission_masks = menus, index, masks
+        if not changes:
+            return changes
+        for change in changes:
+            parent = change.parent or ''
+            if change.kind == NODE_INSERTED:
+                self.menu_inserted.emit(change.id, parent, change.row, change.node)
+            elif change.kind == NODE_MOVED:
+                self.menu_moved.emit(change.id, parent, change.row)
+            elif change.kind == NODE_UPDATED:
+                self.menu_updated.emit(change.id, change.node)
+            elif change.kind == NODE_REMOVED:
+                self.menu_removed.emit(change.id)
+        self.menu_patched.emit(changes, menus)
+        return changes
+        
+    def watch(self, enabled: bool = True) -> None:
+        """开启或关闭配置文件监听"""
+        if not enabled:
+            if self._watcher is not None:
+                self._watcher.deleteLater()
+                self._watcher = None
+                self._reload_timer.stop()
+            return
+        if self._watcher is not None:
+            return
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.RELOAD_DELAY)
+        self._reload_timer.timeout.connect(self.reload)
+        
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        # 编辑器保存时常先写临时文件再替换,文件会从监听列表中移除,同时监听所在目录
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        directory = os.path.dirname(os.path.abspath(self._config_path))
+        if os.path.isdir(directory):
+            self._watcher.addPath(directory)
+        if os.path.exists(self._config_path):
+            self._watcher.addPath(self._config_path)
+            
+    def is_watching(self) -> bool:
+        """是否正在监听配置文件"""
+        return self._watcher is not None
+        
+    def _on_file_changed(self, path):
+        """文件或目录变化,重新开始计时,合并连续的写入"""
+        if os.path.exists(self._config_path) and self._config_path not in self._watcher.files():
+            self._watcher.addPath(self._config_path)
+        self._reload_timer.start()
+        
+    def _read_config(self) -> tuple:
+        """读取配置文件,优先使用磁盘缓存
+        
+        可在工作线程中调用,只访问文件,不修改加载器状态,也不发出信号。
+        
+        Raises:
+            MenuLoadError: 文件不存在、JSON 格式错误或配置验证失败
+        
+        Returns:
+            (排序后的菜单列表, 菜单索引, 权限位图, 是否命中缓存)
+        """
+        # 解析和反序列化会一次创建大量容器对象,期间暂停循环垃圾回收,
+        # 避免分代回收反复扫描刚创建、不会成为垃圾的菜单节点(开关是进程级的,见 _pause_gc)
+        if not self.PAUSE_GC:
+            return self._read_config_file()
+        with _pause_gc():
+            return self._read_config_file()
+                
+    def _read_config_file(self) -> tuple:
+        """读取配置文件(见 _read_config)"""
         try:
             if not os.path.exists(self._config_path):
                 raise MenuLoadError(f"配置文件不存在: {self._config_path}")
                 
-            with open(self._config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            stat = os.stat(self._config_path)
+            cache = self._read_cache()
+            if cache is not None and (cache['mtime'], cache['size']) == (stat.st_mtime_ns, stat.st_size):
+                return self._from_cache_entry(cache)
+                
+            with open(self._config_path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if cache is not None and cache['hash'] == digest:
+                # 内容未变,只更新缓存记录的修改时间和大小
+                menus, index, masks, _ = self._from_cache_entry(cache)
+                self._write_cache(stat, digest, menus, index, masks)
+                return menus, index, masks, True
                 
+            config = json.loads(data)
+            
             # 验证配置格式
             self._validate_config(config)
-            
-            # 更新配置并发出信号
-            self._menu_config = config['menus']
-            self.menu_loaded.emit(self._menu_config)
+            menus = compile_menus(config['menus'])
+            index = MenuIndex(menus)
+            masks = PermissionMasks(menus)
+            self._write_cache(stat, digest, menus, index, masks)
+            return menus, index, masks, False
             
         except json.JSONDecodeError as e:
-            error_msg = f"JSON格式错误: {str(e)}"
-            self.load_error.emit(error_msg)
-            raise MenuLoadError(error_msg)
+            raise MenuLoadError(f"JSON格式错误: {str(e)}")
             
         except Exception as e:
-            error_msg = f"加载配置失败: {str(e)}"
-            self.load_error.emit(error_msg)
-            raise MenuLoadError(error_msg)
-    
+            raise MenuLoadError(f"加载配置失败: {str(e)}", getattr(e, 'errors', None))
+            
+    @staticmethod
+    def _default_cache_path() -> Optional[str]:
+        """默认缓存文件位于系统缓存目录,无法确定时不使用缓存"""
+        directory = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+        if not directory:
+            return None
+        return os.path.join(directory, 'menus.cache')
+        
+    def _read_cache(self) -> Optional[Dict]:
+        """读取缓存,不存在、损坏或格式不符时返回 None"""
+        if not self._cache_path:
+            return None
+        try:
+            with open(self._cache_path, 'rb') as f:
+                cache = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(cache, dict) or cache.get('format') != self.CACHE_FORMAT:
+            return None
+        if cache.get('source') != os.path.abspath(self._config_path):
+            return None
+        return cache
+        
+    @staticmethod
+    def _from_cache_entry(cache: Dict) -> tuple:
+        return (cache['menus'], MenuIndex.from_tables(cache['index']),
+                PermissionMasks.from_tables(cache['permissions']), True)
+        
+    def _write_cache(self, stat, digest: str, menus: List[Dict], index: MenuIndex,
+                     masks: PermissionMasks) -> None:
+        """写入缓存,先写临时文件再替换;写入失败不影响加载"""
+        if not self._cache_path:
+            return
+        cache = {
+            'format': self.CACHE_FORMAT,
+            'source': os.path.abspath(self._config_path),
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': digest,
+            'menus': menus,
+            'index': index.tables(),
+            'permissions': masks.tables(),
+        }
+        temp_path = f"{self._cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._cache_path) or '.', exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(marshal.dumps(cache))
+            os.replace(temp_path, self._cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        
     def _validate_config(self, config: Dict) -> None:
         """验证配置格式是否正确
         
-        Args:
-            config: 要验证的配置字典
-            
-        Raises:
-            MenuLoadError: 当配置���式不正确时抛出
-        """
-        # 验证顶层结构
-        if not isinstance(config, dict):
-            raise MenuLoadError("配置必须是一个对象")
-            
-        if 'version' not in config:
-            raise MenuLoadError("缺少version字段")
-            
-        if 'menus' not in config:
-            raise MenuLoadError("缺少menus字段")
-            
-        if not isinstance(config['menus'], list):
-            raise MenuLoadError("menus必须是一个数组")
-            
-        # 递归验证每个菜单项
-        for menu in config['menus']:
-            self._validate_menu_item(menu)
-    
-    def _validate_menu_item(self, item: Dict, parent_id: str = '') -> None:
-        """递归验证菜单项
+        单次遍历整棵菜单树,收集全部错误(含 JSON 路径),
+        包括缺少必填字段、类型错误、未知字段以及重复的 id 和路由。
         
         Args:
-            item: 要验证的菜单项
-            parent_id: 父菜单ID,用于错误提示
+            config: 要验证的配置字典
             
         Raises:
-            MenuLoadError: 当菜单项格式不正确时抛出
+            MenuLoadError: 当配置格式不正确时抛出,errors 为全部错误
         """
-        # 验证必填字段
-        if 'id' not in item:
-            raise MenuLoadError(f"菜单项缺少id字段: {parent_id}")
-            
-        if 'title' not in item:
-            raise MenuLoadError(f"菜单项缺少title字段: {item['id']}")
-            
-        # 验证字段类型
-        if not isinstance(item['id'], str):
-            raise MenuLoadError(f"id必须是字符串: {item['id']}")
-            
-        if not isinstance(item['title'], str):
-            raise MenuLoadError(f"title必须是字符串: {item['id']}")
-            
-        if 'icon' in item and not isinstance(item['icon'], str):
-            raise MenuLoadError(f"icon必须是字符串: {item['id']}")
-            
-        if 'route' in item and not isinstance(item['route'], str):
-            raise MenuLoadError(f"route必须是字符串: {item['id']}")
-            
-        if 'permissions' in item and not isinstance(item['permissions'], list):
-            raise MenuLoadError(f"permissions必须是数组: {item['id']}")
-            
-        if 'sort' in item and not isinstance(item['sort'], (int, float)):
-            raise MenuLoadError(f"sort必须是数字: {item['id']}")
-            
-        # 递归验证子菜单
-        if 'children' in item:
-            if not isinstance(item['children'], list):
-                raise MenuLoadError(f"children必须是数组: {item['id']}")
-                
-            for child in item['children']:
-                self._validate_menu_item(child, item['id']) 
\ No newline at end of file
+        issues = self._validator.validate(config)
+        if issues:
+            raise MenuLoadError(format_issues(issues), issues)
@@ -0,0 +1,142 @@
+"""
+菜单配置校验
+"""
+from typing import Dict, List, NamedTuple, Tuple
+
+# 菜单项字段 -> (允许的类型, 类型说明)
+MENU_FIELDS = {
+    'id': ((str,), '字符串'),
+    'title': ((str,), '字符串'),
+    'icon': ((str,), '字符串'),
+    'route': ((str,), '字符串'),
+    'permissions': ((list,), '数组'),
+    'sort': ((int, float), '数字'),
+    'children': ((list,), '数组'),
+}
+REQUIRED_FIELDS = ('id', 'title')
+# 超出数量的错误只计数,不逐条列出
+MAX_REPORTED = 10
+
+
+class ValidationIssue(NamedTuple):
+    """校验错误"""
+    path: str     # JSON 路径,如 $.menus[0].children[1].id
+    message: str
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+
+def format_path(path, field: str = None) -> str:
+    """把 (父路径, 下标) 链表形式的菜单路径格式化为 JSON 路径"""
+    indexes = []
+    while path is not None:
+        path, index = path
+        indexes.append(index)
+    parts = ['$.menus']
+    for depth, index in enumerate(reversed(indexes)):
+        parts.append(f"[{index}]" if depth == 0 else f".children[{index}]")
+    if field:
+        parts.append(f".{field}")
+    return ''.join(parts)
+
+
+class MenuValidator:
+    """菜单配置校验器
+
+    字段表在创建时编译为允许字段集合、必填字段集合和按字段的精确类型集合,
+    用显式栈单次遍历整棵树(不递归,层级再深也不会超出递归深度),
+    收集全部错误及其 JSON 路径,并用哈希表检测重复的 id 和路由。
+
+    每个节点先做集合比较和类型查表的快速检查,
+    只有出错的节点才生成路径字符串和错误信息,耗时与节点数成线性关系。
+    """
+
+    def __init__(self, fields: Dict[str, Tuple[tuple, str]] = None, required=REQUIRED_FIELDS):
+        fields = MENU_FIELDS if fields is None else fields
+        self._allowed = frozenset(fields)
+        self._required = frozenset(required)
+        self._required_order = tuple(required)
+        # bool 是 int 的子类,按精确类型比较,true/false 不会被当作数字
+        self._types = {name: frozenset(types) for name, (types, _) in fields.items()}
+        self._type_names = {name: type_name for name, (_, type_name) in fields.items()}
+
+    def validate(self, config) -> List[ValidationIssue]:
+        """校验完整配置,返回全部错误,没有错误时返回空列表"""
+        if not isinstance(config, dict):
+            return [ValidationIssue('$', "配置必须是一个对象")]
+        issues = []
+        if 'version' not in config:
+            issues.append(ValidationIssue('$', "缺少version字段"))
+        if 'menus' not in config:
+            issues.append(ValidationIssue('$', "缺少menus字段"))
+        elif not isinstance(config['menus'], list):
+            issues.append(ValidationIssue('$.menus', "menus必须是一个数组"))
+        else:
+            issues.extend(self.validate_menus(config['menus']))
+        return issues
+
+    def validate_menus(self, menus: list) -> List[ValidationIssue]:
+        """校验菜单列表"""
+        issues = []
+        allowed, required, types = self._allowed, self._required, self._types
+        ids, routes = {}, {}
+        stack = [(menu, (None, index)) for index, menu in reversed(list(enumerate(menus)))]
+        pop, push = stack.pop, stack.extend
+        while stack:
+            item, path = pop()
+            if type(item) is not dict:
+                issues.append(ValidationIssue(format_path(path), "菜单项必须是对象"))
+                continue
+            keys = item.keys()
+            if not keys <= allowed or not required <= keys:
+                self._report_fields(item, path, issues)
+            for name, value in item.items():
+                accepted = types.get(name)
+                if accepted is not None and type(value) not in accepted:
+                    issues.append(ValidationIssue(format_path(path, name),
+                                                  f"{name}必须是{self._type_names[name]}: {item.get('id')}"))
+
+            menu_id = item.get('id')
+            if type(menu_id) is str:
+                first = ids.setdefault(menu_id, path)
+                if first is not path:
+                    issues.append(ValidationIssue(format_path(path, 'id'),
+                                                  f"id重复: {menu_id}(首次出现于 {format_path(first)})"))
+            route = item.get('route')
+            if route and type(route) is str:
+                first = routes.setdefault(route, path)
+                if first is not path:
+                    issues.append(ValidationIssue(format_path(path, 'route'),
+                                                  f"route重复: {route}(首次出现于 {format_path(first)})"))
+            permissions = item.get('permissions')
+            if permissions and type(permissions) is list:
+                for index, permission in enumerate(permissions):
+                    if type(permission) is not str:
+                        issues.append(ValidationIssue(f"{format_path(path, 'permissions')}[{index}]",
+                                                      f"权限必须是字符串: {menu_id}"))
+
+            children = item.get('children')
+            if children and type(children) is list:
+                push([(child, (path, index)) for index, child in reversed(list(enumerate(children)))])
+        return issues
+
+    def _report_fields(self, item: dict, path, issues: list) -> None:
+        """报告缺少的必填字段和未知字段"""
+        menu_id = item.get('id')
+        for name in self._required_order:
+            if name not in item:
+                label = menu_id if name != 'id' else format_path(path)
+                issues.append(ValidationIssue(format_path(path), f"菜单项缺少{name}字段: {label}"))
+        for name in item:
+            if name not in self._allowed:
+                issues.append(ValidationIssue(format_path(path, name), f"未知字段: {name}"))
+
+
+def format_issues(issues: List[ValidationIssue], limit: int = MAX_REPORTED) -> str:
+    """把错误列表格式化为一段说明,超出 limit 的只给出数量"""
+    lines = [f"配置校验失败,共 {len(issues)} 处错误:"]
+    lines.extend(str(issue) for issue in issues[:limit])
+    if len(issues) > limit:
+        lines.append(f"... 其余 {len(issues) - limit} 处")
+    return '\n'.join(lines)
@@ -0,0 +1,314 @@
+"""
+菜单搜索索引
+"""
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from utils.pinyin import initials
+
+# 关键字字段,按排序优先级排列
+FIELD_TITLE = 0
+FIELD_INITIALS = 1
+FIELD_ID = 2
+FIELD_ROUTE = 3
+FIELDS = (FIELD_TITLE, FIELD_INITIALS, FIELD_ID, FIELD_ROUTE)
+
+# 匹配类型,越小越靠前
+MATCH_PREFIX = 0     # 前缀(包括完全匹配)
+MATCH_SUBSTRING = 1  # 子串
+MATCH_FUZZY = 2      # 子序列
+
+_PREFIX_END = '\U0010ffff'
+# 子串/模糊匹配每个字段最多收集的条目数,超出时只在已收集的条目中排序
+# (查询过短,继续输入即可缩小范围)
+MAX_CANDIDATES = 2048
+MAX_FUZZY_CANDIDATES = 512  # 模糊匹配的正则较慢,相关性也最低,收集得更少
+
+
+class SearchResult(NamedTuple):
+    """搜索结果"""
+    id: str
+    title: str
+    route: str
+    path: Tuple[str, ...]  # 从一级菜单到该菜单的标题
+    score: tuple           # (匹配类型, 字段, 位置/跳过字符数, 关键字长度),越小越相关
+
+
+class _Entry:
+    """索引条目"""
+    __slots__ = ('ordinal', 'id', 'title', 'route', 'path', 'keys')
+
+    def __init__(self, menu_id, title, route, path):
+        self.ordinal = -1
+        self.id = menu_id
+        self.title = title
+        self.route = route
+        self.path = path
+        self.keys = (_normalize(title), initials(title), _normalize(menu_id), _normalize(route))
+
+
+def _normalize(text: str) -> str:
+    """转为小写并去掉空白,关键字中不会出现换行"""
+    return ''.join(text.lower().split())
+
+
+def _score(keys, query: str) -> Optional[tuple]:
+    """计算条目关键字与查询的最佳匹配,不匹配时返回 None"""
+    best = None
+    for field, key in zip(FIELDS, keys):
+        position = key.find(query)
+        if position == 0:
+            score = (MATCH_PREFIX, field, 0, len(key) - len(query))
+        elif position > 0:
+            score = (MATCH_SUBSTRING, field, position, len(key))
+        else:
+            gaps = _fuzzy_gaps(key, query) if key else None
+            if gaps is None:
+                continue
+            score = (MATCH_FUZZY, field, gaps, len(key))
+        if best is None or score < best:
+            best = score
+    return best
+
+
+def _fuzzy_gaps(key: str, query: str) -> Optional[int]:
+    """query 是 key 的子序列时返回未匹配的字符数,否则返回 None"""
+    position = key.find(query[0])
+    if position < 0:
+        return None
+    for char in query[1:]:
+        position = key.find(char, position + 1)
+        if position < 0:
+            return None
+    # 从关键字开头到最后一个匹配字符之间未匹配的字符数
+    return position + 1 - len(query)
+
+
+class MenuSearchIndex:
+    """菜单搜索索引
+
+    为每个有路由的菜单建立标题、拼音首字母、id 和路由四个关键字,按三层查找:
+    1. 前缀: 每个字段一份有序关键字表,二分查找
+    2. 子串: 每个字段的关键字以换行拼接成一个字符串,用 str.find 扫描
+    3. 模糊: 在同一字符串上用正则按子序列匹配
+
+    子串和模糊匹配的扫描在 C 层完成,Python 只处理命中的条目,
+    也不需要为 n-gram 维护倒排表。
+
+    结果按 (匹配类型, 字段, 位置, 长度) 排序,前面的层已凑够 limit 条时
+    不再查找后面的层。三层都完整查找过时记录全部匹配,
+    下一次输入以上一次查询开头时只在这些条目中筛选。
+
+    菜单配置变化时调用 update,只重新索引标题、路由有变化的条目;
+    删除留下的空序号过多时整体重建。
+    """
+
+    def __init__(self, menus: List[Dict] = None):
+        self._clear()
+        if menus:
+            self.update(menus)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _clear(self):
+        self._entries: List[Optional[_Entry]] = []  # 序号 -> 条目,已删除为 None
+        self._keys: List[List[str]] = [[] for _ in FIELDS]  # 字段 -> 序号 -> 关键字
+        self._sorted: List[List[Tuple[str, int]]] = [[] for _ in FIELDS]  # 字段 -> 有序 (关键字, 序号)
+        self._blobs = None  # 字段 -> (拼接后的关键字, 各序号的起始偏移)
+        self._by_id: Dict[str, _Entry] = {}
+        self._dead = 0
+        self._last = None  # (查询, 全部匹配的序号),只在完整查找后记录
+
+    def update(self, menus: List[Dict]) -> Tuple[int, int]:
+        """根据菜单配置增量更新索引
+
+        Returns:
+            (重新索引的条目数, 删除的条目数)
+        """
+        latest = {}
+        stack = [(menu, ()) for menu in reversed(menus)]
+        while stack:
+            menu, parents = stack.pop()
+            path = parents + (menu['title'],)
+            if menu.get('route'):
+                latest[menu['id']] = (menu, path)
+            stack.extend((child, path) for child in reversed(menu.get('children') or []))
+
+        deleted = [entry for menu_id, entry in self._by_id.items() if menu_id not in latest]
+        stale, changed = [], []
+        for menu_id, (menu, path) in latest.items():
+            entry = self._by_id.get(menu_id)
+            if entry is not None and entry.title == menu['title'] and entry.route == menu['route']:
+                entry.path = path  # 关键字未变,只更新显示用的路径
+                continue
+            if entry is not None:
+                stale.append(entry)
+            changed.append(_Entry(menu_id, menu['title'], menu['route'], path))
+
+        if not deleted and not changed:
+            return 0, 0
+        for entry in deleted + stale:
+            self._remove(entry)
+        if self._dead > max(1024, len(self._by_id) + len(changed)):
+            self._rebuild(list(self._by_id.values()) + changed)
+        elif len(changed) > len(self._by_id) // 8:
+            for entry in changed:
+                self._add(entry, sort=False)
+            for table in self._sorted:
+                table.sort()
+        else:
+            for entry in changed:
+                self._add(entry, sort=True)
+        # 拼接字符串在更新时生成,不占用按键时的搜索时间
+        self._blobs = None
+        self._field_blobs()
+        self._last = None
+        return len(changed), len(deleted)
+
+    def search(self, query: str, limit: int = 20) -> List[SearchResult]:
+        """搜索菜单"""
+        query = _normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        scores = {}
+        last = self._last
+        if last is not None and query.startswith(last[0]):
+            # 上一次已找出全部匹配,新查询的匹配只会在其中
+            for ordinal in last[1]:
+                score = _score(self._keys_of(ordinal), query)
+                if score is not None:
+                    scores[ordinal] = score
+            complete = True
+        else:
+            complete = (self._search_prefix(query, limit, scores)
+                        and self._search_substring(query, limit, scores)
+                        and self._search_fuzzy(query, scores))
+        self._last = (query, list(scores)) if complete else None
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        results = []
+        for ordinal, score in best:
+            entry = self._entries[ordinal]
+            results.append(SearchResult(entry.id, entry.title, entry.route, entry.path, score))
+        return results
+
+    def _keys_of(self, ordinal: int) -> tuple:
+        return tuple(keys[ordinal] for keys in self._keys)
+
+    def _search_prefix(self, query, limit, scores) -> bool:
+        """二分查找各字段的前缀匹配
+
+        同一字段内按关键字长度(剩余字符数)取最短的 limit 条,与 _score 的排序一致。
+
+        Returns:
+            是否需要继续查找下一层(已凑够 limit 条或前缀范围超过 MAX_CANDIDATES 时返回 False)
+        """
+        size = len(query)
+        complete = True
+        for field in FIELDS:
+            table = self._sorted[field]
+            start = bisect_left(table, (query,))
+            end = bisect_left(table, (query + _PREFIX_END,), start)
+            if end - start > MAX_CANDIDATES:
+                end = start + MAX_CANDIDATES
+                complete = False
+            best = heapq.nsmallest(limit, ((len(key), ordinal) for key, ordinal in table[start:end]
+                                           if ordinal not in scores))
+            for length, ordinal in best:
+                scores[ordinal] = (MATCH_PREFIX, field, 0, length - size)
+            if len(scores) >= limit:
+                return False
+        return complete
+
+    def _search_substring(self, query, limit, scores) -> bool:
+        """在各字段拼接后的关键字中查找子串"""
+        complete = True
+        for field, (blob, starts) in enumerate(self._field_blobs()):
+            found = 0
+            position = blob.find(query)
+            while position >= 0:
+                ordinal = bisect_right(starts, position) - 1
+                offset = position - starts[ordinal]
+                if offset and ordinal not in scores:
+                    scores[ordinal] = (MATCH_SUBSTRING, field, offset, starts[ordinal + 1] - starts[ordinal] - 1)
+                found += 1
+                if found >= MAX_CANDIDATES:
+                    complete = False
+                    break
+                # 同一关键字只取第一次出现,跳到下一个关键字
+                position = blob.find(query, starts[ordinal + 1])
+            if len(scores) >= limit:
+                return False
+        return complete
+
+    def _search_fuzzy(self, query, scores) -> bool:
+        """在各字段拼接后的关键字中按子序列匹配,不跨越换行"""
+        # 每个字符之前只跳过不等于它的字符,匹配过程不需要回溯
+        pattern = re.compile(re.escape(query[0]) + ''.join(
+            f'[^\n{re.escape(char)}]*{re.escape(char)}' for char in query[1:]))
+        complete = True
+        for field, (blob, starts) in enumerate(self._field_blobs()):
+            found = 0
+            match = pattern.search(blob)
+            while match is not None:
+                ordinal = bisect_right(starts, match.start()) - 1
+                if ordinal not in scores:
+                    # 与 _fuzzy_gaps 一样取每个字符最早出现的位置
+                    scores[ordinal] = (MATCH_FUZZY, field, match.end() - starts[ordinal] - len(query),
+                                       starts[ordinal + 1] - starts[ordinal] - 1)
+                found += 1
+                if found >= MAX_FUZZY_CANDIDATES:
+                    complete = False
+                    break
+                match = pattern.search(blob, starts[ordinal + 1])
+        return complete
+
+    def _field_blobs(self) -> list:
+        """每个字段的关键字以换行拼接,并记录每个序号的起始偏移(末尾多一个结束偏移)"""
+        if self._blobs is None:
+            self._blobs = []
+            for keys in self._keys:
+                starts = array('q', [0])
+                starts.extend(accumulate(len(key) + 1 for key in keys))
+                self._blobs.append(('\n'.join(keys) + '\n', starts))
+        return self._blobs
+
+    def _add(self, entry: _Entry, sort: bool):
+        ordinal = len(self._entries)
+        entry.ordinal = ordinal
+        self._entries.append(entry)
+        self._by_id[entry.id] = entry
+        for field, key in zip(FIELDS, entry.keys):
+            self._keys[field].append(key)
+            if not key:
+                continue
+            if sort:
+                insort(self._sorted[field], (key, ordinal))
+            else:
+                self._sorted[field].append((key, ordinal))
+
+    def _remove(self, entry: _Entry):
+        """删除条目,序号留空"""
+        ordinal = entry.ordinal
+        if self._by_id.get(entry.id) is entry:
+            del self._by_id[entry.id]
+        self._entries[ordinal] = None
+        for field, key in zip(FIELDS, entry.keys):
+            self._keys[field][ordinal] = ''
+            if key:
+                table = self._sorted[field]
+                del table[bisect_left(table, (key, ordinal))]
+        self._dead += 1
+
+    def _rebuild(self, entries: List[_Entry]):
+        """重新分配序号,重建全部索引"""
+        self._clear()
+        for entry in entries:
+            self._add(entry, sort=False)
+        for table in self._sorted:
+            table.sort()
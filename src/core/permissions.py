@@ -0,0 +1,134 @@
+"""
+菜单权限位图
+"""
+from typing import Dict, Iterable, List
+
+PUBLIC_BIT = 1  # 公开菜单(未配置 permissions)占用的位,用户掩码总是包含该位
+
+
+class PermissionMasks:
+    """菜单权限位图
+
+    加载菜单时把权限字符串依次映射到位(从第 1 位开始),并为每个节点预先计算:
+    - own: 节点自身的权限掩码,0 表示公开;用户拥有其中任一权限即可看到该节点
+    - reach: 子树内各节点 own 的并集,公开节点记为 PUBLIC_BIT;
+      与用户掩码按位与为 0 时子树内没有可见节点,整棵子树一次剪掉
+    - need: 子树内各节点 own 的并集(不含 PUBLIC_BIT);
+      用户拥有其中全部权限时整棵子树可见,直接复用原节点,不再向下遍历
+
+    过滤时只有部分可见的子树才逐层复制节点,切换用户或角色只需重新调用 filter()。
+    """
+
+    def __init__(self, menus: List[Dict] = None):
+        self.bits: Dict[str, int] = {}  # 权限 -> 位掩码
+        self.own: Dict[str, int] = {}
+        self.reach: Dict[str, int] = {}
+        self.need: Dict[str, int] = {}
+        if menus:
+            self.build(menus)
+
+    def build(self, menus: List[Dict]) -> None:
+        """为菜单树计算权限掩码
+
+        先按先序收集节点,再倒序计算,子节点总在父节点之前完成,不递归。
+        """
+        order = []
+        stack = list(menus)
+        while stack:
+            menu = stack.pop()
+            order.append(menu)
+            children = menu.get('children')
+            if children:
+                stack.extend(children)
+
+        bits, own, reach, need = {}, {}, {}, {}
+        for menu in reversed(order):
+            mask = 0
+            permissions = menu.get('permissions')
+            if permissions:
+                for permission in permissions:
+                    bit = bits.get(permission)
+                    if bit is None:
+                        bit = bits[permission] = 1 << (len(bits) + 1)
+                    mask |= bit
+            menu_reach = mask or PUBLIC_BIT
+            menu_need = mask
+            children = menu.get('children')
+            if children:
+                for child in children:
+                    child_id = child['id']
+                    menu_reach |= reach[child_id]
+                    menu_need |= need[child_id]
+            menu_id = menu['id']
+            own[menu_id] = mask
+            reach[menu_id] = menu_reach
+            need[menu_id] = menu_need
+        self.bits, self.own, self.reach, self.need = bits, own, reach, need
+
+    def tables(self) -> tuple:
+        """(bits, own, reach, need),可用 marshal 序列化"""
+        return self.bits, self.own, self.reach, self.need
+
+    @classmethod
+    def from_tables(cls, tables: tuple) -> 'PermissionMasks':
+        """从 tables() 的结果恢复,不重新计算"""
+        masks = cls()
+        masks.bits, masks.own, masks.reach, masks.need = tables
+        return masks
+
+    def mask(self, permissions: Iterable[str]) -> int:
+        """用户权限列表 -> 用户掩码,菜单中未出现的权限忽略"""
+        mask = PUBLIC_BIT
+        bits = self.bits
+        for permission in permissions:
+            mask |= bits.get(permission, 0)
+        return mask
+
+    def allowed(self, menu_id: str, user_mask: int) -> bool:
+        """用户能否看到该节点本身(不考虑父节点)"""
+        own = self.own[menu_id]
+        return not own or bool(own & user_mask)
+
+    def filter(self, menus: List[Dict], user_mask: int) -> List[Dict]:
+        """返回用户可见的菜单树
+
+        整棵子树可见时直接复用原节点,其余可见节点为浅拷贝,children 只包含可见子菜单。
+        没有路由的分组菜单在子菜单全部不可见时一并隐藏。返回的节点应视为只读。
+        """
+        own, reach, need = self.own, self.reach, self.need
+        denied = ~user_mask
+        result = []
+        # (原节点列表, 输出列表) 逐层处理,拷贝节点的 children 最后确定
+        stack = [(menus, result)]
+        groups = []
+        while stack:
+            nodes, output = stack.pop()
+            for menu in nodes:
+                menu_id = menu['id']
+                if not reach[menu_id] & user_mask:
+                    continue
+                mask = own[menu_id]
+                if mask and not mask & user_mask:
+                    continue
+                if not need[menu_id] & denied:
+                    output.append(menu)
+                    continue
+                children = menu.get('children')
+                if not children:
+                    output.append(menu)
+                    continue
+                copy = dict(menu)
+                copy['children'] = kept = []
+                output.append(copy)
+                groups.append((copy, output))
+                stack.append((children, kept))
+        # 子节点先于父节点处理完毕:倒序检查,去掉没有可见子菜单的节点
+        for copy, output in reversed(groups):
+            if copy['children']:
+                continue
+            if copy.get('route'):
+                del copy['children']
+            else:
+                # 按对象身份删除,避免 list.remove 逐个比较字典内容
+                del output[next(i for i, node in enumerate(output) if node is copy)]
+        return result
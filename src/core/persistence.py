@@ -0,0 +1,159 @@
+import json
+import os
+from typing import Callable, Dict, Optional
+
+
+class PersistenceError(Exception):
+    """状态持久化错误"""
+    pass
+
+
+def _dumps(value) -> str:
+    """紧凑的 JSON 序列化"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class StorePersistence:
+    """Store 持久化: 定期快照 + 追加写的 mutation 日志
+
+    每次 commit 追加一行 [序号, mutation, payload] 到日志,
+    日志条数达到 snapshot_interval 时写入完整快照并清空日志。
+    恢复时加载快照,再重放序号大于快照的日志尾部,
+    恢复耗时与快照大小成正比,而与历史修改次数无关。
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    JOURNAL_FILE = "journal.log"
+
+    def __init__(self, directory: str, snapshot_interval: int = 1000, fsync: bool = False):
+        """
+        Args:
+            directory: 存放快照和日志的目录
+            snapshot_interval: 日志达到多少条时压缩为快照
+            fsync: 每次写日志后是否强制落盘
+        """
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self._snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self._journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self._journal = None
+        self._sequence = 0
+        self._journal_size = 0
+
+    @property
+    def sequence(self) -> int:
+        """最后一次写入的序号"""
+        return self._sequence
+
+    def restore(self, mutations: Dict[str, Callable]) -> Optional[Dict]:
+        """恢复状态
+
+        Args:
+            mutations: 重放日志使用的 mutation 表 {名称: mutation(state, payload)}
+
+        Returns:
+            恢复后的状态,没有快照和日志时返回 None
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        state = None
+        self._sequence = 0
+        if os.path.exists(self._snapshot_path):
+            try:
+                with open(self._snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                self._sequence = snapshot['sequence']
+                state = snapshot['state']
+            except (ValueError, KeyError) as e:
+                raise PersistenceError(f"快照文件损坏: {e}")
+
+        entries = self._read_journal(self._sequence)
+        if entries and state is None:
+            state = {}
+        for sequence, mutation, payload in entries:
+            if mutation not in mutations:
+                raise PersistenceError(f"无法重放未注册的mutation: {mutation}")
+            mutations[mutation](state, payload)
+            self._sequence = sequence
+        self._journal_size = len(entries)
+        return state
+
+    def _read_journal(self, after: int) -> list:
+        """读取序号大于 after 的日志
+
+        遇到不完整的行(写入中途崩溃)时停止,并截掉损坏的尾部,
+        避免之后追加的日志接在残缺行后面。
+        """
+        entries = []
+        if not os.path.exists(self._journal_path):
+            return entries
+        valid_size = 0
+        with open(self._journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete line")
+                    sequence, mutation, payload = json.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                if sequence > after:
+                    entries.append((sequence, mutation, payload))
+        if valid_size < os.path.getsize(self._journal_path):
+            with open(self._journal_path, 'r+b') as f:
+                f.truncate(valid_size)
+        return entries
+
+    def record(self, mutation: str, payload, state: Dict) -> None:
+        """记录一次 commit
+
+        payload 无法序列化为 JSON 时直接写入快照。
+        """
+        try:
+            line = _dumps([self._sequence + 1, mutation, payload])
+        except (TypeError, ValueError):
+            self._sequence += 1
+            self.snapshot(state)
+            return
+
+        if self._journal is None:
+            self._journal = open(self._journal_path, 'a', encoding='utf-8')
+        self._journal.write(line + '\n')
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self._sequence += 1
+        self._journal_size += 1
+
+        if self._journal_size >= self.snapshot_interval:
+            self.snapshot(state)
+
+    def snapshot(self, state: Dict) -> None:
+        """写入完整快照并清空日志
+
+        先写临时文件再原子替换;替换后、清空日志前崩溃也不会重复重放,
+        因为恢复时只重放序号大于快照的日志。
+        """
+        try:
+            data = _dumps({'sequence': self._sequence, 'state': state})
+        except (TypeError, ValueError) as e:
+            raise PersistenceError(f"状态无法序列化: {e}")
+
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self._snapshot_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._snapshot_path)
+
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self._journal_path, 'w', encoding='utf-8')
+        self._journal_size = 0
+
+    def close(self) -> None:
+        """关闭日志文件"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class RouteMatch(NamedTuple):
+    """路由匹配结果"""
+    pattern: str           # 注册时的路由模式
+    path: str              # 实际路径(不含查询串)
+    params: Dict[str, str]  # 路径参数
+    value: Any             # 注册的值
+
+
+class _Node:
+    """路由树节点"""
+    __slots__ = ('static', 'param', 'wildcard', 'terminal')
+
+    def __init__(self):
+        self.static = {}       # 静态片段 -> 子节点
+        self.param = None      # :param 子节点
+        self.wildcard = None   # (参数名, pattern, value, 参数名列表)
+        self.terminal = None   # (pattern, value, 参数名列表)
+
+
+def split_path(path: str) -> List[str]:
+    """拆分路径片段,忽略首尾及重复的斜杠"""
+    return [segment for segment in path.split('/') if segment]
+
+
+class RouteTrie:
+    """编译后的路由前缀树
+
+    支持静态片段、:param 参数片段和结尾的 * / *name 通配片段。
+    匹配时每个片段只做一次字典查找,优先级为 静态 > 参数 > 通配,
+    必要时回溯尝试低优先级分支。
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str, value: Any) -> None:
+        """添加路由模式
+
+        Raises:
+            ValueError: 通配片段不在末尾时抛出
+        """
+        node = self._root
+        names = []
+        segments = split_path(pattern)
+        for index, segment in enumerate(segments):
+            if segment.startswith('*'):
+                if index != len(segments) - 1:
+                    raise ValueError(f"通配片段必须位于末尾: {pattern}")
+                if node.wildcard is None:
+                    self._size += 1
+                node.wildcard = (segment[1:] or '*', pattern, value, names)
+                return
+            if segment.startswith(':'):
+                names.append(segment[1:])
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _Node())
+        if node.terminal is None:
+            self._size += 1
+        node.terminal = (pattern, value, names)
+
+    def match(self, path: str) -> Optional[RouteMatch]:
+        """匹配路径,未匹配时返回 None"""
+        segments = split_path(path)
+        count = len(segments)
+        # 栈元素: (是否通配, 节点, 片段下标, 已捕获的参数值)
+        stack: List[Tuple[bool, _Node, int, Tuple[str, ...]]] = [(False, self._root, 0, ())]
+        while stack:
+            is_wildcard, node, index, captured = stack.pop()
+            if is_wildcard or (index == count and node.terminal is None and node.wildcard is not None):
+                name, pattern, value, names = node.wildcard
+                params = dict(zip(names, captured))
+                params[name] = '/'.join(segments[index:])
+                return RouteMatch(pattern, path, params, value)
+            if index == count:
+                if node.terminal is not None:
+                    pattern, value, names = node.terminal
+                    return RouteMatch(pattern, path, dict(zip(names, captured)), value)
+                continue
+
+            # 按优先级倒序入栈,静态分支最先出栈
+            if node.wildcard is not None:
+                stack.append((True, node, index, captured))
+            if node.param is not None:
+                stack.append((False, node.param, index + 1, captured + (segments[index],)))
+            child = node.static.get(segments[index])
+            if child is not None:
+                stack.append((False, child, index + 1, captured))
+        return None
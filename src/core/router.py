@@ -1,18 +1,324 @@
-class Router:
-    """视图路由管理"""
-    def __init__(self):
+import importlib
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Optional, Union
+from urllib.parse import parse_qs
+from PySide6.QtCore import QObject, QTimer, Signal
+from .route_trie import RouteTrie, RouteMatch
+
+
+def import_target(target: str) -> Callable:
+    """按导入路径加载对象
+
+    支持 "package.module:Name" 和 "package.module.Name" 两种写法。
+    """
+    if ':' in target:
+        module_name, _, attr = target.partition(':')
+    else:
+        module_name, _, attr = target.rpartition('.')
+    if not module_name or not attr:
+        raise ImportError(f"无效的导入路径: {target}")
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, attr)
+    except AttributeError:
+        raise ImportError(f"模块 {module_name} 中没有 {attr}")
+
+
+def parse_query(query: str) -> Dict[str, Union[str, list]]:
+    """解析查询串,重复出现的参数保留为列表"""
+    return {
+        key: values[0] if len(values) == 1 else values
+        for key, values in parse_qs(query, keep_blank_values=True).items()
+    }
+
+
+class Router(QObject):
+    """视图路由管理
+
+    已创建的视图按 LRU 缓存(keep-alive),再次进入时直接复用。
+    缓存同时受视图数量和估算内存限制,当前视图不会被淘汰。
+    切换视图时调用视图的 activated()/deactivated() 生命周期钩子。
+
+    路由可以用导入路径注册,页面模块在第一次 push 时才导入,
+    也可以通过 warmup() 在空闲时逐个预先导入。
+
+    路由模式编译为前缀树,支持 /users/:id 参数片段和 /files/*path 通配片段,
+    push 的路径可以带查询串,路径参数、查询参数和显式参数合并后传给视图。
+    视图按实际路径缓存;prefetch() 供菜单悬停时调用,悬停停留一段时间后预先导入页面模块。
+    需要时也可以预先构建视图,预构建的视图单独保存(只保留一个),push 时才放入缓存,
+    不会挤掉用户访问过的视图。
+    """
+
+    DEFAULT_VIEW_COST = 1 << 20  # 视图未提供 estimateMemory 时的估算内存(字节)
+    PREFETCH_DELAY = 150         # 悬停停留多久后开始预取(毫秒)
+
+    viewActivated = Signal(str, object)    # 视图进入(path, view)
+    viewDeactivated = Signal(str, object)  # 视图离开(path, view)
+    viewEvicted = Signal(str, object)      # 视图被淘汰并销毁(path, view)
+    routeNotFound = Signal(str)            # 跳转到未注册的路径
+
+    def __init__(self, max_views: int = 10, max_memory: Optional[int] = None, parent=None):
+        """
+        Args:
+            max_views: 最多缓存的视图数量
+            max_memory: 缓存视图的估算内存上限(字节),None 表示不限制
+        """
+        super().__init__(parent)
         self.routes = {}
         self.current = None
-        
-    def register(self, path, view_class):
-        """注册路由"""
+        self.current_path = None
+        self.max_views = max_views
+        self.max_memory = max_memory
+        self._keep_alive = {}
+        self._cache = OrderedDict()  # path -> view
+        self._costs = {}             # path -> 估算内存
+        self._memory = 0
+        self._warmup_queue = deque()
+        self._trie = RouteTrie()
+        self._prefetch_request = None  # 等待执行的预取 (path, 路由模式, 是否构建视图)
+        self._prefetched = None        # 预先构建的视图 (path, view),不计入缓存
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.timeout.connect(self._run_prefetch)
+
+    def register(self, path, view_class: Union[Callable, str], keep_alive: bool = True):
+        """注册路由
+
+        Args:
+            path: 路由模式,如 /system/users/:id
+            view_class: 视图类、工厂函数,或导入路径字符串
+                (如 "views.user.list:UserListView"),字符串在第一次 push 时才导入
+            keep_alive: 离开后是否缓存视图
+        """
         self.routes[path] = view_class
-        
+        self._keep_alive[path] = keep_alive
+        self._trie.add(path, path)
+
+    def match(self, path) -> Optional[RouteMatch]:
+        """匹配路径(可带查询串),返回的 params 只包含路径参数"""
+        return self._trie.match(path.partition('?')[0])
+
+    def isLoaded(self, path) -> bool:
+        """路由模式对应的页面模块是否已导入"""
+        return path in self.routes and not isinstance(self.routes[path], str)
+
+    def resolve(self, path) -> Callable:
+        """获取路由模式的视图工厂,按需导入页面模块"""
+        target = self.routes[path]
+        if isinstance(target, str):
+            target = import_target(target)
+            self.routes[path] = target
+        return target
+
+    def warmup(self, paths=None, interval: int = 0):
+        """空闲时逐个导入尚未加载的页面模块
+
+        Args:
+            paths: 要预热的路由,默认为全部
+            interval: 两次导入之间的间隔(毫秒),每次只导入一个模块以免阻塞界面
+        """
+        pending = [path for path in (paths or self.routes) if not self.isLoaded(path)]
+        start = not self._warmup_queue
+        self._warmup_queue.extend(pending)
+        if start and self._warmup_queue:
+            QTimer.singleShot(interval, lambda: self._warmup_next(interval))
+
+    def _warmup_next(self, interval: int):
+        """导入预热队列中的下一个模块"""
+        while self._warmup_queue:
+            path = self._warmup_queue.popleft()
+            if path in self.routes and not self.isLoaded(path):
+                try:
+                    self.resolve(path)
+                except Exception:
+                    # 预热失败(包括模块导入时抛出的其他异常)不影响运行,
+                    # 继续预热其余模块,push 时会再次抛出
+                    pass
+                break
+        if self._warmup_queue:
+            QTimer.singleShot(interval, lambda: self._warmup_next(interval))
+
     def push(self, path, params=None):
-        """路由跳转"""
-        if path in self.routes:
-            view = self.routes[path]()
-            if params:
-                view.setParams(params)
+        """路由跳转
+
+        Args:
+            path: 实际路径,可带查询串,如 /system/users/42?tab=roles
+            params: 额外参数,与路径参数、查询参数合并后传给视图的 setParams
+
+        Returns:
+            目标视图,路径未注册时返回 None 并发出 routeNotFound
+        """
+        route, _, query = path.partition('?')
+        match = self._trie.match(route)
+        if match is None:
+            self.routeNotFound.emit(path)
+            return None
+
+        key = match.path
+        view = self._cache.get(key)
+        if view is not None:
+            self._cache.move_to_end(key)
+        elif key == self.current_path:
+            view = self.current
+        elif self._prefetched is not None and self._prefetched[0] == key:
+            view = self._prefetched[1]
+            self._prefetched = None
+        else:
+            view = self.resolve(match.pattern)()
+
+        merged = dict(match.params)
+        if query:
+            merged.update(parse_query(query))
+        if params:
+            merged.update(params)
+        if merged:
+            view.setParams(merged)
+
+        if view is not self.current:
+            self._leave()
             self.current = view
-            return view 
\ No newline at end of file
+            self.current_path = key
+            self._call_hook(view, 'activated')
+            self.viewActivated.emit(key, view)
+            if self._keep_alive.get(match.pattern, True) and key not in self._cache:
+                self._add_to_cache(key, view)
+            self._evict()
+        return view
+
+    def prefetch(self, path, delay: Optional[int] = None, build: bool = False):
+        """预取路由,供菜单悬停等场景调用
+
+        延迟 delay 毫秒后导入页面模块,期间再次调用时只保留最后一次请求,
+        鼠标快速划过菜单不会逐个导入。build 为 True 时同时创建视图,
+        视图单独保存(只保留最近一个),push 到该路径时才放入缓存;不缓存的路由只导入模块。
+
+        Args:
+            path: 实际路径
+            delay: 延迟的毫秒数,默认 PREFETCH_DELAY
+            build: 是否预先构建视图
+        """
+        match = self.match(path)
+        if match is None:
+            return
+        key = match.path
+        if key in self._cache or key == self.current_path:
+            return
+        self._prefetch_request = (key, match.pattern, build)
+        self._prefetch_timer.start(self.PREFETCH_DELAY if delay is None else delay)
+
+    def _run_prefetch(self):
+        """执行最后一次预取请求"""
+        request, self._prefetch_request = self._prefetch_request, None
+        if request is None:
+            return
+        key, pattern, build = request
+        if pattern not in self.routes or key in self._cache or key == self.current_path:
+            return
+        if self._prefetched is not None and self._prefetched[0] == key:
+            return
+        try:
+            factory = self.resolve(pattern)
+            if not build or not self._keep_alive.get(pattern, True):
+                return
+            view = factory()
+        except Exception:
+            # 预取失败不影响运行,push 时会再次抛出
+            return
+        self._drop_prefetched()
+        self._prefetched = (key, view)
+
+    def _drop_prefetched(self):
+        """销毁尚未使用的预构建视图"""
+        if self._prefetched is None:
+            return
+        _, view = self._prefetched
+        self._prefetched = None
+        if hasattr(view, 'deleteLater'):
+            view.deleteLater()
+
+    def _add_to_cache(self, key, view):
+        """放入缓存(最近使用位置)"""
+        self._cache[key] = view
+        self._costs[key] = self._estimate(view)
+        self._memory += self._costs[key]
+
+    def cached(self, path) -> Optional[object]:
+        """获取已缓存的视图"""
+        return self._cache.get(path)
+
+    def cacheInfo(self) -> dict:
+        """缓存统计"""
+        return {
+            "views": len(self._cache),
+            "memory": self._memory,
+            "max_views": self.max_views,
+            "max_memory": self.max_memory,
+        }
+
+    def evict(self, path) -> bool:
+        """从缓存中移除并销毁视图,当前视图不会被移除"""
+        if path not in self._cache or path == self.current_path:
+            return False
+        self._remove(path)
+        return True
+
+    def clearCache(self):
+        """清空缓存(保留当前视图)和预构建的视图"""
+        self._drop_prefetched()
+        for path in list(self._cache):
+            self.evict(path)
+
+    def _leave(self):
+        """离开当前视图,未缓存的视图直接销毁"""
+        view, path = self.current, self.current_path
+        if view is None:
+            return
+        self._call_hook(view, 'deactivated')
+        self.viewDeactivated.emit(path, view)
+        if path in self._cache:
+            # 视图使用过程中内存可能增长,离开时重新估算
+            cost = self._estimate(view)
+            self._memory += cost - self._costs[path]
+            self._costs[path] = cost
+        else:
+            self._destroy(path, view)
+        self.current = None
+        self.current_path = None
+
+    def _evict(self):
+        """按 LRU 顺序淘汰超出限制的视图"""
+        for path in list(self._cache):
+            over_count = len(self._cache) > self.max_views
+            over_memory = self.max_memory is not None and self._memory > self.max_memory
+            if not (over_count or over_memory):
+                break
+            if path != self.current_path:
+                self._remove(path)
+
+    def _remove(self, path):
+        """移出缓存并销毁"""
+        view = self._cache.pop(path)
+        self._memory -= self._costs.pop(path)
+        self._destroy(path, view)
+
+    def _destroy(self, path, view):
+        """销毁视图"""
+        self.viewEvicted.emit(path, view)
+        if hasattr(view, 'deleteLater'):
+            view.deleteLater()
+
+    def _estimate(self, view) -> int:
+        """估算视图占用的内存"""
+        estimate = getattr(view, 'estimateMemory', None)
+        if estimate is not None:
+            cost = estimate()
+            if cost:
+                return cost
+        return self.DEFAULT_VIEW_COST
+
+    @staticmethod
+    def _call_hook(view, name):
+        """调用视图的生命周期钩子"""
+        hook = getattr(view, name, None)
+        if hook is not None:
+            hook()
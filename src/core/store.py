@@ -1,16 +1,489 @@
-class Store:
-    """全局状态管理"""
-    def __init__(self):
+import asyncio
+import inspect
+import itertools
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Optional, Set, Union
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+from .persistence import StorePersistence
+
+# 依赖全部状态(遍历、取长度等)
+_ALL = "*"
+
+# 不可变类型,同一对象即可认为值未变化
+_IMMUTABLE = (str, int, float, bool, bytes, tuple, frozenset, type(None))
+
+
+class _TrackingState(Mapping):
+    """只读状态代理,记录读取过的键"""
+
+    def __init__(self, state: dict, keys: Set[str]):
+        self._state = state
+        self._keys = keys
+
+    def __getitem__(self, key):
+        self._keys.add(key)
+        return self._state[key]
+
+    def __contains__(self, key):
+        self._keys.add(key)
+        return key in self._state
+
+    def __iter__(self):
+        self._keys.add(_ALL)
+        return iter(self._state)
+
+    def __len__(self):
+        self._keys.add(_ALL)
+        return len(self._state)
+
+
+class _RecordingState(MutableMapping):
+    """传给 mutation 的状态代理,记录可能被修改的键
+
+    读取过的键也视为已修改,以覆盖 state['users'].append(...) 这类原地修改。
+    """
+
+    def __init__(self, state: dict):
+        self._state = state
+        self.touched = set()
+
+    def __getitem__(self, key):
+        self.touched.add(key)
+        return self._state[key]
+
+    def __setitem__(self, key, value):
+        self.touched.add(key)
+        self._state[key] = value
+
+    def __delitem__(self, key):
+        self.touched.add(key)
+        del self._state[key]
+
+    def __contains__(self, key):
+        return key in self._state
+
+    def __iter__(self):
+        self.touched.add(_ALL)
+        return iter(self._state)
+
+    def __len__(self):
+        return len(self._state)
+
+
+class _GetterAccess:
+    """getter 访问代理,读取 getter 时合并其依赖"""
+
+    def __init__(self, store: 'Store', keys: Set[str]):
+        self._store = store
+        self._keys = keys
+
+    def __getitem__(self, name: str):
+        value, keys = self._store._evaluate_getter(name)
+        self._keys.update(keys)
+        return value
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self[name]
+
+
+class _Subscription:
+    """选择器订阅"""
+
+    def __init__(self, selector: Callable, callback: Callable):
+        self.selector = selector
+        self.callback = callback
+        self.keys = set()
+        self.value = None
+        self.active = True
+
+
+def _unchanged(old, new) -> bool:
+    """判断选择结果是否未变化
+
+    同一个可变对象可能被原地修改,视为已变化。
+    """
+    if old is new:
+        return isinstance(new, _IMMUTABLE)
+    try:
+        return bool(old == new)
+    except Exception:
+        return False
+
+
+class ActionCancelled(Exception):
+    """后台 action 已被取消"""
+    pass
+
+
+class ActionContext:
+    """后台 action 的执行上下文
+
+    在工作线程中使用: state 为派发时的状态快照,
+    commit 会被转发到 GUI 线程执行,action 被取消后的提交会被丢弃。
+    """
+
+    def __init__(self, task: 'ActionTask', state: dict):
+        self._task = task
+        self.state = state
+
+    @property
+    def cancelled(self) -> bool:
+        """action 是否已被取消"""
+        return self._task.cancelled
+
+    def check(self) -> None:
+        """已取消时抛出 ActionCancelled,用于在耗时步骤之间检查"""
+        if self._task.cancelled:
+            raise ActionCancelled()
+
+    def commit(self, mutation: str, payload=None) -> None:
+        """在 GUI 线程提交 mutation"""
+        self.check()
+        self._task.signals.commitRequested.emit(self._task.id, mutation, payload)
+
+
+class _ActionSignals(QObject):
+    """后台 action 回传结果用的信号"""
+    commitRequested = Signal(int, str, object)  # task id, mutation, payload
+    finished = Signal(int, object)              # task id, result
+    failed = Signal(int, str)                   # task id, error
+    cancelled = Signal(int)                     # task id
+
+
+class ActionTask(QRunnable):
+    """在线程池中执行的 action
+
+    普通函数直接在工作线程调用,协程函数在工作线程的独立事件循环中运行。
+    """
+
+    def __init__(self, task_id: int, key: str, action: Callable, payload, state: dict):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.id = task_id
+        self.key = key
+        self.action = action
+        self.payload = payload
+        self.state = state
+        self.cancelled = False
+        self.signals = _ActionSignals()
+        self._loop = None
+        self._future = None
+
+    def cancel(self) -> None:
+        """请求取消,协程 action 会在下一个 await 处收到 CancelledError"""
+        self.cancelled = True
+        loop, future = self._loop, self._future
+        if loop is not None and future is not None:
+            try:
+                loop.call_soon_threadsafe(future.cancel)
+            except RuntimeError:
+                # 事件循环已结束
+                pass
+
+    def run(self):
+        context = ActionContext(self, self.state)
+        try:
+            context.check()
+            if inspect.iscoroutinefunction(self.action):
+                result = asyncio.run(self._run_coroutine(context))
+            else:
+                result = self.action(context, self.payload)
+            context.check()
+        except (ActionCancelled, asyncio.CancelledError):
+            self.signals.cancelled.emit(self.id)
+        except Exception as e:
+            self.signals.failed.emit(self.id, str(e))
+        else:
+            self.signals.finished.emit(self.id, result)
+
+    async def _run_coroutine(self, context: ActionContext):
+        """运行协程 action,保存 future 以便跨线程取消"""
+        self._loop = asyncio.get_running_loop()
+        self._future = asyncio.ensure_future(self.action(context, self.payload))
+        if self.cancelled:
+            self._future.cancel()
+        try:
+            return await self._future
+        finally:
+            self._loop = None
+            self._future = None
+
+
+class Store(QObject):
+    """全局状态管理
+
+    getter 和订阅的选择器在计算时记录读取过的状态键,
+    commit 后只重新计算依赖了被修改键的 getter 和订阅,
+    选择结果确实变化时才通知订阅者。
+
+    后台 action(协程函数或以 background=True 注册的函数)在线程池中执行,
+    通过 ActionContext.commit 把修改转发回 GUI 线程。
+    同一个 key 的 action 只保留最新一次,之前未完成的会被取消。
+    """
+
+    actionStateChanged = Signal(str)        # action 的 pending/error 状态变更
+    actionFinished = Signal(str, object)    # action 完成(key, 返回值)
+    actionFailed = Signal(str, str)         # action 失败(key, 错误信息)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self._state = {}
         self._mutations = {}
         self._actions = {}
-        
+        self._getters = {}
+        self._getter_cache = {}      # name -> (value, keys)
+        self._getter_index = {}      # key -> {getter name}
+        self._subscriptions = {}     # key -> {subscription}
+        self._background_actions = set()
+        self._tasks = {}             # task id -> ActionTask
+        self._running = {}           # key -> 当前 task id
+        self._action_errors = {}     # key -> 错误信息
+        self._task_ids = itertools.count(1)
+        self._pool = QThreadPool(self)
+        self._persistence = None
+
+    @property
+    def state(self) -> dict:
+        """当前状态(只读使用)"""
+        return self._state
+
+    @property
+    def getters(self) -> _GetterAccess:
+        """getter 访问器: store.getters.userCount 或 store.getters['userCount']"""
+        return _GetterAccess(self, set())
+
+    def registerMutation(self, name: str, mutation: Callable[[MutableMapping, Any], None]):
+        """注册 mutation: mutation(state, payload)"""
+        self._mutations[name] = mutation
+
+    def registerAction(self, name: str, action: Callable, background: bool = False):
+        """注册 action
+
+        Args:
+            name: action 名称
+            action: 同步 action 为 action(store, payload);
+                后台 action 为 action(context, payload),可以是协程函数
+            background: 是否在线程池中执行,协程函数总是在后台执行
+        """
+        self._actions[name] = action
+        if background or inspect.iscoroutinefunction(action):
+            self._background_actions.add(name)
+        else:
+            self._background_actions.discard(name)
+
+    def registerGetter(self, name: str, getter: Callable[[Mapping, _GetterAccess], Any]):
+        """注册计算属性: getter(state, getters),结果按依赖缓存"""
+        self._getters[name] = getter
+        self._getter_cache.pop(name, None)
+
+    def getter(self, name: str):
+        """读取计算属性"""
+        return self._evaluate_getter(name)[0]
+
     def commit(self, mutation, payload=None):
         """同步修改状态"""
         if mutation in self._mutations:
-            self._mutations[mutation](self._state, payload)
-            
-    def dispatch(self, action, payload=None):
-        """异步修改状态"""
-        if action in self._actions:
-            self._actions[action](self, payload) 
\ No newline at end of file
+            state = _RecordingState(self._state)
+            self._mutations[mutation](state, payload)
+            try:
+                if self._persistence is not None:
+                    self._persistence.record(mutation, payload, self._state)
+            finally:
+                # 状态已经修改,持久化失败时也要通知订阅者
+                if state.touched:
+                    self._notify(state.touched)
+
+    def enablePersistence(self, directory: str, snapshot_interval: int = 1000, fsync: bool = False) -> bool:
+        """开启持久化并恢复上次的状态
+
+        需要在注册完 mutation 之后调用,恢复时会用它们重放日志。
+        之后每次 commit 都会追加到日志,定期压缩为快照。
+
+        Returns:
+            是否恢复了已有状态
+        """
+        self.disablePersistence()
+        persistence = StorePersistence(directory, snapshot_interval, fsync)
+        state = persistence.restore(self._mutations)
+        self._persistence = persistence
+        if state is None:
+            return False
+        self._state.clear()
+        self._state.update(state)
+        self._notify({_ALL})
+        return True
+
+    def disablePersistence(self) -> None:
+        """关闭持久化"""
+        if self._persistence is not None:
+            self._persistence.close()
+            self._persistence = None
+
+    def saveSnapshot(self) -> None:
+        """立即写入快照(例如在程序退出前)"""
+        if self._persistence is not None:
+            self._persistence.snapshot(self._state)
+
+    def dispatch(self, action, payload=None, key: Optional[str] = None):
+        """异步修改状态
+
+        Args:
+            action: action 名称
+            payload: 参数
+            key: 去重键,默认为 action 名称;同一 key 只保留最新一次派发
+
+        Returns:
+            同步 action 返回其结果,后台 action 返回 ActionTask
+        """
+        if action not in self._actions:
+            return None
+        if action not in self._background_actions:
+            return self._actions[action](self, payload)
+
+        key = key or action
+        self.cancel(key, notify=False)
+        task = ActionTask(next(self._task_ids), key, self._actions[action], payload, dict(self._state))
+        task.signals.commitRequested.connect(self._on_task_commit)
+        task.signals.finished.connect(self._on_task_finished)
+        task.signals.failed.connect(self._on_task_failed)
+        task.signals.cancelled.connect(self._on_task_cancelled)
+        self._tasks[task.id] = task
+        self._running[key] = task.id
+        self._action_errors.pop(key, None)
+        self.actionStateChanged.emit(key)
+        self._pool.start(task)
+        return task
+
+    def cancel(self, key: str, notify: bool = True) -> bool:
+        """取消 key 对应的后台 action,已提交但未执行的修改会被丢弃"""
+        task_id = self._running.pop(key, None)
+        if task_id is None:
+            return False
+        task = self._tasks.get(task_id)
+        if task is not None:
+            task.cancel()
+        if notify:
+            self.actionStateChanged.emit(key)
+        return True
+
+    def isPending(self, key: str) -> bool:
+        """后台 action 是否正在执行"""
+        return key in self._running
+
+    def actionError(self, key: str) -> Optional[str]:
+        """后台 action 最近一次失败的错误信息"""
+        return self._action_errors.get(key)
+
+    def waitForActions(self, msecs: int = -1) -> bool:
+        """等待线程池中的 action 执行结束(不处理回传的信号)"""
+        return self._pool.waitForDone(msecs)
+
+    def _is_current(self, task: Optional[ActionTask]) -> bool:
+        """任务是否为其 key 当前有效的任务"""
+        return task is not None and not task.cancelled and self._running.get(task.key) == task.id
+
+    @Slot(int, str, object)
+    def _on_task_commit(self, task_id: int, mutation: str, payload):
+        """在 GUI 线程执行后台 action 的提交"""
+        if self._is_current(self._tasks.get(task_id)):
+            self.commit(mutation, payload)
+
+    @Slot(int, object)
+    def _on_task_finished(self, task_id: int, result):
+        """后台 action 完成"""
+        task = self._tasks.pop(task_id, None)
+        if self._is_current(task):
+            del self._running[task.key]
+            self.actionStateChanged.emit(task.key)
+            self.actionFinished.emit(task.key, result)
+
+    @Slot(int, str)
+    def _on_task_failed(self, task_id: int, error: str):
+        """后台 action 失败"""
+        task = self._tasks.pop(task_id, None)
+        if self._is_current(task):
+            del self._running[task.key]
+            self._action_errors[task.key] = error
+            self.actionStateChanged.emit(task.key)
+            self.actionFailed.emit(task.key, error)
+
+    @Slot(int)
+    def _on_task_cancelled(self, task_id: int):
+        """后台 action 已取消"""
+        self._tasks.pop(task_id, None)
+
+    def subscribe(self, selector: Union[str, Callable], callback: Callable[[Any, Any], None]) -> Callable[[], None]:
+        """订阅状态切片
+
+        Args:
+            selector: 状态键名,或 selector(state, getters) 函数
+            callback: callback(新值, 旧值),仅在选择结果变化时调用
+
+        Returns:
+            取消订阅函数
+        """
+        if isinstance(selector, str):
+            key = selector
+            selector = lambda state, getters: state.get(key)
+        subscription = _Subscription(selector, callback)
+        subscription.value = self._select(subscription)
+
+        def unsubscribe():
+            subscription.active = False
+            self._unindex(self._subscriptions, subscription.keys, subscription)
+
+        return unsubscribe
+
+    def _select(self, subscription: _Subscription):
+        """计算订阅的选择结果并更新依赖索引"""
+        keys = set()
+        value = subscription.selector(_TrackingState(self._state, keys), _GetterAccess(self, keys))
+        self._unindex(self._subscriptions, subscription.keys - keys, subscription)
+        subscription.keys = keys
+        for key in keys:
+            self._subscriptions.setdefault(key, set()).add(subscription)
+        return value
+
+    def _evaluate_getter(self, name: str):
+        """计算 getter,返回 (值, 依赖键)"""
+        cached = self._getter_cache.get(name)
+        if cached is not None:
+            return cached
+        keys = set()
+        value = self._getters[name](_TrackingState(self._state, keys), _GetterAccess(self, keys))
+        self._getter_cache[name] = (value, keys)
+        for key in keys:
+            self._getter_index.setdefault(key, set()).add(name)
+        return value, keys
+
+    def _notify(self, touched: Set[str]):
+        """让依赖被修改键的 getter 失效,并通知选择结果变化的订阅者"""
+        if _ALL in touched:
+            self._getter_cache.clear()
+            self._getter_index.clear()
+            affected = set().union(*self._subscriptions.values()) if self._subscriptions else set()
+        else:
+            for name in set().union(*(self._getter_index.pop(key, ()) for key in touched | {_ALL})):
+                self._getter_cache.pop(name, None)
+            affected = set().union(*(self._subscriptions.get(key, ()) for key in touched | {_ALL}))
+
+        for subscription in list(affected):
+            if not subscription.active:
+                continue
+            old = subscription.value
+            new = self._select(subscription)
+            subscription.value = new
+            if not _unchanged(old, new):
+                subscription.callback(new, old)
+
+    @staticmethod
+    def _unindex(index: Dict[str, set], keys, item):
+        """从依赖索引中移除"""
+        for key in keys:
+            items = index.get(key)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del index[key]
@@ -1,18 +1,181 @@
-from PySide6.QtCore import QObject, Signal
+import re
+from pathlib import Path
+from string import Template
+from PySide6.QtCore import QObject, Signal, QEvent
+from PySide6.QtWidgets import QApplication, QWidget
 from enum import Enum
+from .components import BaseComponent
+
+# 应用级样式模板
+STYLE_TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "resources" / "styles" / "theme.qss"
+# 标记窗口所用主题的动态属性
+THEME_PROPERTY = "theme"
+
+_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.S)
+_RULE_PATTERN = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+def scope_stylesheet(qss: str, name: str, value: str) -> str:
+    """把样式表的每条规则限定到动态属性 name=value 的窗口
+
+    每个选择器生成两种形式: 作为该窗口的后代匹配(*[name="value"] 选择器),
+    以及窗口自身匹配(属性加在第一段选择器上)。
+    所有规则增加相同的属性权重,规则之间的优先级保持不变。
+    """
+    attribute = f'[{name}="{value}"]'
+    rules = []
+    for selectors, body in _RULE_PATTERN.findall(_COMMENT_PATTERN.sub("", qss)):
+        scoped = []
+        for selector in selectors.split(","):
+            selector = " ".join(selector.split())
+            if not selector:
+                continue
+            first, sep, rest = selector.partition(" ")
+            colon = first.find(":")
+            if colon < 0:
+                colon = len(first)
+            scoped.append(f"*{attribute} {selector}")
+            scoped.append(first[:colon] + attribute + first[colon:] + sep + rest)
+        rules.append(f"{', '.join(scoped)} {{{body}}}")
+    return "\n".join(rules)
+
+
+def update_style_property(widget, name: str, value) -> None:
+    """设置用于样式匹配的动态属性,并只重新应用该控件的样式"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
 
 class Theme(Enum):
     LIGHT = "light"
     DARK = "dark"
     ORANGE = "orange"
 
+class ThemeScheduler(QObject):
+    """主题应用调度器
+
+    切换主题时给顶层窗口设置主题属性,只立即重新应用可见控件的样式;
+    隐藏的子树(收起的子菜单、堆叠窗口中未显示的页面等)标记为待更新,
+    在下一次显示时再应用。切换耗时与屏幕上的控件数量相关,
+    而与创建过的控件总数无关。
+    """
+
+    def __init__(self, property_name: str = THEME_PROPERTY, parent=None):
+        super().__init__(parent)
+        self.property_name = property_name
+        self._theme = None
+        self._dirty = {}  # 待更新的隐藏子树根 -> 其 destroyed 信号的处理函数
+
+    def apply(self, theme: Theme, windows=None, restyle: bool = True) -> int:
+        """应用主题
+
+        Args:
+            theme: 主题
+            windows: 顶层窗口,默认为 QApplication 的全部顶层窗口
+            restyle: 是否重新应用样式,为 False 时只设置主题属性
+                (例如随后会重新设置应用级样式表)
+
+        Returns:
+            立即重新应用样式的控件数量
+        """
+        self._theme = theme
+        if windows is None:
+            windows = QApplication.topLevelWidgets()
+        return sum(self.attach(window, restyle) for window in windows)
+
+    def attach(self, window: QWidget, restyle: bool = True) -> int:
+        """给窗口设置当前主题,可见时立即应用样式,否则标记为待更新"""
+        if self._theme is None:
+            return 0
+        window.setProperty(self.property_name, self._theme.value)
+        if not restyle:
+            return 0
+        if window.isVisible():
+            return self._restyle(window)
+        self._mark_dirty(window)
+        return 0
+
+    def isDirty(self, widget: QWidget) -> bool:
+        """控件所在子树是否等待应用样式"""
+        while widget is not None:
+            if widget in self._dirty:
+                return True
+            if widget.isWindow():
+                return False
+            widget = widget.parentWidget()
+        return False
+
+    def pendingCount(self) -> int:
+        """待更新的子树数量"""
+        return len(self._dirty)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show and obj in self._dirty:
+            self._clear_dirty(obj)
+            self._restyle(obj)
+        return False
+
+    def _mark_dirty(self, widget: QWidget):
+        """标记隐藏子树,显示时再应用样式"""
+        if widget not in self._dirty:
+            # 控件在显示前被删除时移除标记,不保留已删除控件的包装对象
+            forget = lambda *args: self._dirty.pop(widget, None)
+            self._dirty[widget] = forget
+            widget.installEventFilter(self)
+            widget.destroyed.connect(forget)
+
+    def _clear_dirty(self, widget: QWidget):
+        """取消待更新标记"""
+        forget = self._dirty.pop(widget)
+        widget.removeEventFilter(self)
+        widget.destroyed.disconnect(forget)
+
+    def _restyle(self, root: QWidget) -> int:
+        """重新应用子树中可见控件的样式,遇到隐藏的子控件时标记为待更新"""
+        count = 0
+        stack = [root]
+        while stack:
+            widget = stack.pop()
+            style = widget.style()
+            style.unpolish(widget)
+            style.polish(widget)
+            widget.update()
+            if isinstance(widget, BaseComponent):
+                widget.updateStyle(self._theme)
+            count += 1
+            for child in widget.children():
+                if not isinstance(child, QWidget) or child.isWindow():
+                    continue
+                if child.isHidden():
+                    self._mark_dirty(child)
+                else:
+                    if child in self._dirty:
+                        self._clear_dirty(child)
+                    stack.append(child)
+        return count
+
+
 class ThemeManager(QObject):
-    """主题管理器"""
+    """主题管理器
+
+    主题样式模板按每个主题编译一次,并限定到带有对应主题属性的窗口,
+    合并后的样式表只设置到 QApplication 一次。切换主题时由
+    ThemeScheduler 修改窗口的主题属性并按可见性重新应用样式,
+    组件通过 objectName 和动态属性匹配样式,不再各自拼接和设置样式表。
+    """
     themeChanged = Signal(Theme)  # 主题变更信号
     
-    def __init__(self):
+    def __init__(self, template_path=STYLE_TEMPLATE_PATH):
         super().__init__()
         self._current_theme = Theme.ORANGE
+        self._template_path = template_path
+        self._template = None
+        self._compiled = {}
+        self._app_stylesheet = None
+        self.scheduler = ThemeScheduler(parent=self)
         self._themes = {
             Theme.LIGHT: {
                 "primary": "#1890FF",
@@ -48,7 +211,50 @@ class ThemeManager(QObject):
         """设置主题"""
         if theme != self._current_theme:
             self._current_theme = theme
+            self.apply()
             self.themeChanged.emit(theme)
+            
+    def stylesheet(self, theme: Theme = None) -> str:
+        """获取主题编译后的样式表(已限定到主题属性),每个主题只编译一次"""
+        theme = theme or self._current_theme
+        qss = self._compiled.get(theme)
+        if qss is None:
+            if self._template is None:
+                self._template = Template(Path(self._template_path).read_text(encoding="utf-8"))
+            qss = scope_stylesheet(self._template.substitute(self._themes[theme]),
+                                   THEME_PROPERTY, theme.value)
+            self._compiled[theme] = qss
+        return qss
+        
+    def application_stylesheet(self) -> str:
+        """获取包含全部主题的应用级样式表"""
+        if self._app_stylesheet is None:
+            self._app_stylesheet = "\n".join(self.stylesheet(theme) for theme in Theme)
+        return self._app_stylesheet
+        
+    def apply(self, app: QApplication = None) -> bool:
+        """应用当前主题
+
+        应用级样式表只在首次调用时设置,之后只切换顶层窗口的主题属性。
+
+        Returns:
+            是否已应用(尚未创建 QApplication 时返回 False)
+        """
+        app = app or QApplication.instance()
+        if app is None:
+            return False
+        qss = self.application_stylesheet()
+        if app.styleSheet() != qss:
+            # 设置样式表时 Qt 会重新应用全部控件的样式,只需先设置主题属性
+            self.scheduler.apply(self._current_theme, restyle=False)
+            app.setStyleSheet(qss)
+        else:
+            self.scheduler.apply(self._current_theme)
+        return True
+        
+    def attach(self, window: QWidget) -> int:
+        """给之后创建的顶层窗口应用当前主题"""
+        return self.scheduler.attach(window)
     
     def get_style(self) -> dict:
         """获取当前主题样式"""
@@ -0,0 +1,40 @@
+"""
+汉字拼音首字母
+"""
+from bisect import bisect_right
+
+# GB2312 一级汉字按拼音排序,每个声母区间的起始编码(高字节 * 256 + 低字节 - 65536)
+_BOUNDARIES = [
+    (-20319, 'a'), (-20283, 'b'), (-19775, 'c'), (-19218, 'd'), (-18710, 'e'),
+    (-18526, 'f'), (-18239, 'g'), (-17922, 'h'), (-17417, 'j'), (-16474, 'k'),
+    (-16212, 'l'), (-15640, 'm'), (-15165, 'n'), (-14922, 'o'), (-14914, 'p'),
+    (-14630, 'q'), (-14149, 'r'), (-14090, 's'), (-13318, 't'), (-12838, 'w'),
+    (-12556, 'x'), (-11847, 'y'), (-11055, 'z'),
+]
+_STARTS = [code for code, _ in _BOUNDARIES]
+_LEVEL1_END = -10247  # 一级汉字结束编码
+
+
+def initial(char: str) -> str:
+    """获取单个字符的拼音首字母
+
+    字母和数字返回小写形式;只识别 GB2312 一级汉字(常用字),
+    其余字符返回空字符串。
+    """
+    if char.isascii():
+        return char.lower() if char.isalnum() else ''
+    try:
+        encoded = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return ''
+    if len(encoded) != 2:
+        return ''
+    code = encoded[0] * 256 + encoded[1] - 65536
+    if code < _STARTS[0] or code >= _LEVEL1_END:
+        return ''
+    return _BOUNDARIES[bisect_right(_STARTS, code) - 1][1]
+
+
+def initials(text: str) -> str:
+    """获取文本的拼音首字母,如 "用户管理" -> "yhgl" """
+    return ''.join(initial(char) for char in text)
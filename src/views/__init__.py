@@ -1,6 +1,25 @@
 """
 页面视图
+
+页面按需导入,访问 views.UserListView 时才加载对应模块,
+避免导入 views 包时加载全部页面。
 """
-from .user.list import UserListView
+import importlib
+
+_LAZY_VIEWS = {
+    'UserListView': '.user.list',
+}
+
+# 路由表: 路径 -> 页面导入路径,页面模块在第一次访问时才导入
+ROUTES = {
+    '/system/users': 'views.user.list:UserListView',
+}
+
+__all__ = list(_LAZY_VIEWS) + ['ROUTES']
+
 
-__all__ = ['UserListView'] 
\ No newline at end of file
+def __getattr__(name):
+    if name in _LAZY_VIEWS:
+        module = importlib.import_module(_LAZY_VIEWS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
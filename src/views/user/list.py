@@ -24,11 +24,35 @@ class UserListView(BaseComponent):
         layout.addWidget(self.table)
         
         # 绑定数据
-        self.vm.dataChanged.connect(self.onDataChanged)
+        self.vm.keyChanged.connect(self.onKeyChanged)
+        self.vm.rowsUpdated.connect(self.onRowsUpdated)
+        self.vm.rowsInserted.connect(self.onRowsInserted)
+        self.vm.rowsRemoved.connect(self.onRowsRemoved)
         
         # 加载数据
         self.vm.loadData()
         
-    def onDataChanged(self):
-        """数据变更处理"""
-        self.table.setData(self.vm.data['users'])
\ No newline at end of file
+    def onKeyChanged(self, key):
+        """整体替换用户列表"""
+        if key == 'users':
+            self.table.setData(self.vm.data.get('users', []))
+            
+    def onRowsUpdated(self, key, first, last):
+        """只重绘更新的行"""
+        if key == 'users':
+            users = self.vm.data['users']
+            self.table.data = users
+            self.table.updateRows(first, users[first:last + 1])
+            
+    def onRowsInserted(self, key, first, last):
+        """插入新增的行"""
+        if key == 'users':
+            users = self.vm.data['users']
+            self.table.data = users
+            self.table.insertRows(first, users[first:last + 1])
+            
+    def onRowsRemoved(self, key, first, last):
+        """删除移除的行"""
+        if key == 'users':
+            self.table.data = self.vm.data['users']
+            self.table.removeRows(first, last - first + 1)
\ No newline at end of file
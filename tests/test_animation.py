@@ -0,0 +1,102 @@
+import pytest
+from PySide6.QtWidgets import QWidget
+from PySide6.QtTest import QTest
+from src.components.layout.menu_item import MenuItem, AnimationManager
+
+
+def wait_idle(manager, timeout=1000):
+    """等待全部动画结束"""
+    waited = 0
+    while (manager.runningCount() or manager._pending) and waited < timeout:
+        QTest.qWait(10)
+        waited += 10
+
+
+@pytest.fixture
+def manager(app, monkeypatch):
+    manager = AnimationManager()
+    monkeypatch.setattr(manager, 'DURATION', 30)
+    yield manager
+    manager.setReducedMotion(False)
+    wait_idle(manager)
+
+
+def test_requests_coalesce_into_one_group(manager):
+    """同一轮事件循环的请求合并为一个并行动画组,结束后动画回到池中"""
+    widgets = [QWidget() for _ in range(3)]
+    finished = []
+    for i, widget in enumerate(widgets):
+        manager.animate(widget, b"maximumHeight", 100, start=0, on_finished=lambda i=i: finished.append(i))
+    assert manager.runningCount() == 0  # 下一次事件循环才开始
+    manager.flush()
+    assert manager.runningCount() == 3
+    assert len(manager._groups) == 1
+    pooled = manager.pooledCount()
+
+    wait_idle(manager)
+    assert sorted(finished) == [0, 1, 2]
+    assert [w.maximumHeight() for w in widgets] == [100, 100, 100]
+    assert manager.pooledCount() == pooled + 3
+
+
+def test_superseded_request_drops_callback(manager):
+    """新请求取代未完成的动画,旧回调不再调用"""
+    widget = QWidget()
+    finished = []
+    manager.animate(widget, b"maximumHeight", 0, start=100, on_finished=lambda: finished.append("collapse"))
+    manager.flush()
+    manager.animate(widget, b"maximumHeight", 100, on_finished=lambda: finished.append("expand"))
+    manager.flush()
+    assert manager.runningCount() == 1
+    wait_idle(manager)
+    assert finished == ["expand"]
+    assert widget.maximumHeight() == 100
+
+
+def test_pool_reused(manager):
+    """反复播放只复用池中的动画"""
+    widget = QWidget()
+    wait_idle(manager)
+    for height in (50, 0, 50, 0):
+        manager.animate(widget, b"maximumHeight", height)
+        manager.flush()
+        wait_idle(manager)
+    assert manager.pooledCount() <= manager.POOL_SIZE
+    assert manager.pooledCount() >= 1
+    assert len(manager._keys) == 0 and len(manager._callbacks) == 0
+
+
+def test_reduced_motion(manager):
+    """reduced motion 下立即完成,正在播放的动画跳到结尾"""
+    widget = QWidget()
+    finished = []
+    manager.animate(widget, b"maximumHeight", 80, start=0, on_finished=lambda: finished.append(1))
+    manager.flush()
+    manager.setReducedMotion(True)
+    assert finished == [1] and widget.maximumHeight() == 80
+    assert manager.runningCount() == 0
+
+    manager.animate(widget, b"maximumHeight", 10, on_finished=lambda: finished.append(2))
+    assert finished == [1, 2] and widget.maximumHeight() == 10
+
+
+def test_menu_rapid_toggle(manager):
+    """快速连续展开/收起,子菜单最终状态正确,收起回调不会累积"""
+    item = MenuItem("系统管理", "")
+    for i in range(5):
+        item.add_sub_item(f"子菜单{i}", f"/m/{i}")
+    item.show()
+    for _ in range(10):
+        item._on_clicked()
+        item._on_clicked()
+    item._on_clicked()  # 最终为展开
+    wait_idle(manager)
+    assert item.is_expanded
+    assert not item.sub_menu.isHidden()
+    assert item.sub_menu.maximumHeight() == item.sub_layout.sizeHint().height()
+    assert len(manager._callbacks) == 0
+
+    item._on_clicked()
+    wait_idle(manager)
+    assert item.sub_menu.isHidden()
+    assert item.sub_menu.maximumHeight() == 0
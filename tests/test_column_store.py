@@ -0,0 +1,64 @@
+from array import array
+from src.components.column_store import ColumnStore
+
+
+def make_store():
+    """创建测试存储"""
+    return ColumnStore.fromRows([
+        {"name": "c", "age": 30, "score": 1.5},
+        {"name": "a", "age": 20, "score": 2.5},
+        {"name": "b", "age": 30, "score": 0.5},
+        {"name": None, "age": 20, "score": 3.5},
+    ])
+
+
+def test_typed_columns():
+    """测试数值列使用数组存储"""
+    store = make_store()
+    assert isinstance(store.column("age"), array)
+    assert isinstance(store.column("score"), array)
+    assert isinstance(store.column("name"), list)
+    assert store.row(1) == {"name": "a", "age": 20, "score": 2.5}
+
+
+def test_single_column_sort_reuses_order():
+    """测试单列排序复用索引"""
+    store = make_store()
+    ascending = store.permutation([("name", True)])
+    assert list(ascending) == [1, 2, 0, 3]  # None 排在最后
+    assert store.sortOrder("name") is ascending
+    assert list(store.permutation([("name", False)])) == [3, 0, 2, 1]
+
+
+def test_multi_column_sort():
+    """测试多列排序"""
+    store = make_store()
+    order = store.permutation([("age", True), ("name", False)])
+    assert list(order) == [3, 1, 0, 2]
+    assert store.permutation([("age", True), ("name", False)]) is order
+
+
+def test_inverse_permutation():
+    """测试逆排列按排序条件缓存,列变化后重新构建"""
+    store = make_store()
+    spec = [("age", True), ("name", False)]
+    inverse = store.inversePermutation(spec)
+    order = store.permutation(spec)
+    assert [inverse[row] for row in order] == list(range(len(store)))
+    assert store.inversePermutation(spec) is inverse
+    store.invalidate(["score"])
+    assert store.inversePermutation(spec) is inverse
+    store.invalidate(["age"])
+    assert store.inversePermutation(spec) is not inverse
+
+
+def test_invalidate_columns():
+    """测试按列丢弃索引"""
+    store = make_store()
+    store.permutation([("age", True), ("name", True)])
+    store.sortOrder("score")
+
+    store.invalidate(["name"])
+    assert "name" not in store._orders
+    assert "score" in store._orders
+    assert store._permutations == {}
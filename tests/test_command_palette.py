@@ -0,0 +1,49 @@
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QWidget
+from src.components.layout.command_palette import CommandPalette
+
+MENUS = [
+    {"id": "user", "title": "用户管理", "route": "/system/user"},
+    {"id": "role", "title": "角色管理", "route": "/system/role"},
+]
+
+
+@pytest.fixture
+def palette(app):
+    window = QWidget()
+    window.resize(800, 600)
+    palette = CommandPalette(MENUS, window)
+    window.show()
+    yield palette
+    window.close()
+    window.deleteLater()
+
+
+def test_search_and_select(palette):
+    """测试输入搜索,上下选择,回车发出路由"""
+    received = []
+    palette.routeSelected.connect(lambda route, title: received.append((route, title)))
+    palette.popup()
+    assert palette.isVisible()
+
+    palette.input.setText("gl")
+    assert palette.results.count() == 2
+    assert palette.results.currentRow() == 0
+    QTest.keyClick(palette.input, Qt.Key_Down)
+    assert palette.results.currentRow() == 1
+    QTest.keyClick(palette.input, Qt.Key_Return)
+    assert received == [("/system/role", "角色管理")]
+    assert not palette.isVisible()
+
+
+def test_escape_and_update(palette):
+    """测试 Esc 关闭,菜单变化后更新索引"""
+    palette.popup()
+    QTest.keyClick(palette.input, Qt.Key_Escape)
+    assert not palette.isVisible()
+
+    palette.setMenus(MENUS + [{"id": "log", "title": "日志", "route": "/log"}])
+    palette.input.setText("rz")
+    assert palette.results.count() == 1
@@ -0,0 +1,60 @@
+import pytest
+from src.core.theme import ThemeManager
+from src.core.router import Router
+from src.core.components import BaseComponent
+from src.components.layout.content import Content
+
+
+@pytest.fixture
+def content(app):
+    router = Router(max_views=10)
+    for path in ("/a", "/b", "/c", "/d"):
+        router.register(path, BaseComponent)
+    return Content(ThemeManager(), router, max_pages=2)
+
+
+def test_show_routed_page(content):
+    """测试显示路由页面"""
+    content.show_route("/a", "A")
+    page = content.currentWidget()
+    assert page is content.router.current
+    assert content.pool_stats()["misses"] == 1
+
+    content.show_route("/b", "B")
+    content.show_route("/a", "A")
+    assert content.currentWidget() is page
+    stats = content.pool_stats()
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_unknown_route_shows_placeholder(content):
+    """测试未注册的路由显示开发中提示"""
+    content.show_route("/missing", "未知")
+    assert content.currentWidget() is content.developing
+    assert content.title_label.text() == "未知"
+
+
+def test_pool_is_bounded(content):
+    """测试页面池有上限并移除最久未使用的页面"""
+    content.show_route("/a", "A")
+    first = content.currentWidget()
+    content.show_route("/b", "B")
+    content.show_route("/c", "C")
+
+    stats = content.pool_stats()
+    assert stats["size"] == 2
+    assert content.indexOf(first) == -1
+    assert content.router.cached("/a") is None
+    # 占位页面 + 两个存活页面
+    assert content.count() == 3
+
+
+def test_router_eviction_detaches_page(content):
+    """测试路由淘汰页面时同步移除"""
+    content.show_route("/a", "A")
+    first = content.currentWidget()
+    content.show_route("/b", "B")
+    content.router.evict("/a")
+    assert content.indexOf(first) == -1
+    assert content.pool_stats()["size"] == 1
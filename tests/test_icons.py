@@ -0,0 +1,70 @@
+import json
+import pytest
+from PySide6.QtGui import QImage, QColor
+from src.components.layout.menu_item import MenuItem, IconCache
+
+
+def write_icon(path, color, size=32):
+    image = QImage(size, size, QImage.Format_ARGB32)
+    image.fill(QColor(color))
+    image.save(str(path))
+
+
+@pytest.fixture
+def icons(app, tmp_path):
+    """使用临时图标目录的图标缓存"""
+    write_icon(tmp_path / "file.png", "red")
+    write_icon(tmp_path / "money.png", "blue")
+    cache = IconCache()
+    cache.set_directory(tmp_path)
+    yield cache
+    cache.set_directory(tmp_path.parent / "no_icons")
+
+
+def test_cache_key_name_size_dpr(icons):
+    """同名同尺寸同像素比只解码一次"""
+    first = icons.pixmap("file", 16)
+    assert first.width() == 16 and not first.isNull()
+    assert icons.pixmap("file", 16) is first
+    hidpi = icons.pixmap("file", 16, 2.0)
+    assert hidpi.width() == 32 and hidpi.devicePixelRatio() == 2.0
+    assert icons.stats() == {"hits": 1, "misses": 2, "pixmaps": 2}
+
+
+def test_missing_icon_cached(icons):
+    """不存在的图标返回空位图,且不会重复查找"""
+    assert icons.pixmap("missing").isNull()
+    icons.pixmap("missing")
+    assert icons.stats()["misses"] == 1
+    assert icons.icon("missing").isNull()
+
+
+def test_atlas(icons, tmp_path):
+    """有图集时从图集裁剪图标"""
+    atlas = QImage(64, 32, QImage.Format_ARGB32)
+    atlas.fill(QColor("blue"))
+    for x in range(32):
+        for y in range(32):
+            atlas.setPixelColor(x, y, QColor("red"))
+    atlas.save(str(tmp_path / "atlas.png"))
+    (tmp_path / "atlas.json").write_text(json.dumps({"file": [0, 0, 32, 32], "money": [32, 0, 32, 32]}))
+    (tmp_path / "file.png").unlink()
+    icons.clear()
+    pixmap = icons.pixmap("file", 16)
+    assert pixmap.width() == 16
+    assert pixmap.toImage().pixelColor(8, 8) == QColor("red")
+    assert not icons.icon("money").isNull()
+
+
+def test_menu_items_share_icons_and_decode_when_shown(icons):
+    """菜单项首次显示时才解码图标,同名图标只解码一次"""
+    parent = MenuItem("菜单", "")
+    for i in range(50):
+        parent.add_sub_item(f"子菜单{i}", f"/m/{i}", "file" if i % 2 else "money")
+    assert icons.stats()["misses"] == 0
+
+    parent.show()
+    assert icons.stats()["misses"] == 0  # 子菜单尚未展开
+    parent.set_expanded(True)
+    assert icons.stats() == {"hits": 48, "misses": 2, "pixmaps": 2}
+    assert parent.sub_items[1].icon_label.pixmap().cacheKey() == parent.sub_items[3].icon_label.pixmap().cacheKey()
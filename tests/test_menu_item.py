@@ -0,0 +1,37 @@
+import pytest
+from src.components.layout.menu_item import MenuItem
+
+
+@pytest.fixture
+def item(app):
+    item = MenuItem("系统管理", "")
+    item.add_sub_item("用户管理", "/system/users")
+    return item
+
+
+def test_press_state_uses_property(item):
+    """测试按下状态通过动态属性切换,不设置样式表"""
+    button = item.btn_container
+    item._on_pressed(None)
+    assert button.property("pressed") is True
+    item._on_leave(None)
+    assert button.property("pressed") is False
+    assert button.styleSheet() == ""
+
+
+def test_expanded_state_uses_property(item):
+    """测试展开状态通过动态属性切换"""
+    item._on_released(None)
+    assert item.is_expanded
+    assert item.btn_container.property("expanded") is True
+    item._on_released(None)
+    assert item.btn_container.property("expanded") is False
+    assert item.btn_container.styleSheet() == ""
+
+
+def test_hover_emits_route(item):
+    """测试悬停子菜单发出路由"""
+    received = []
+    item.hovered.connect(received.append)
+    item.sub_items[0]._on_enter(None)
+    assert received == ["/system/users"]
@@ -1,12 +1,18 @@
+import gc
 import os
 import json
 import pytest
-from src.core.menu_loader import MenuLoader, MenuLoadError
+from PySide6.QtCore import QThread
+from PySide6.QtTest import QTest
+from src.core.menu_loader import MenuLoader, MenuLoadError, MenuIndex, sort_menus, _pause_gc
+from src.core.diff import diff_tree, NODE_INSERTED, NODE_MOVED, NODE_UPDATED, NODE_REMOVED
 
 @pytest.fixture
-def menu_loader():
-    """创建MenuLoader实例"""
-    return MenuLoader()
+def menu_loader(tmp_path, monkeypatch):
+    """创建MenuLoader实例,缓存写入临时目录"""
+    loader = MenuLoader()
+    monkeypatch.setattr(loader, '_cache_path', str(tmp_path / "cache" / "menus.cache"))
+    return loader
 
 @pytest.fixture
 def valid_config(tmp_path):
@@ -127,4 +133,223 @@ def test_validate_nested_menus(menu_loader):
     }
     
     # 不应该抛出异常
-    menu_loader._validate_config(config) 
\ No newline at end of file
+    menu_loader._validate_config(config)
+
+def write_menus(path, menus):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"version": "1.0", "menus": menus}, f)
+
+def test_diff_tree_by_id():
+    """测试按 id 对比菜单树"""
+    old = [
+        {"id": "a", "title": "A", "children": [{"id": "a1", "title": "A1"}, {"id": "a2", "title": "A2"}]},
+        {"id": "b", "title": "B"},
+        {"id": "c", "title": "C", "children": [{"id": "c1", "title": "C1"}]},
+    ]
+    new = [
+        {"id": "b", "title": "B"},
+        {"id": "a", "title": "A", "children": [{"id": "a2", "title": "A2-new"}, {"id": "c1", "title": "C1"}]},
+        {"id": "d", "title": "D", "children": [{"id": "d1", "title": "D1"}]},
+    ]
+    changes = diff_tree(old, new)
+    assert [tuple(change[:4]) for change in changes] == [
+        (NODE_REMOVED, "c", None, -1),
+        (NODE_REMOVED, "a1", "a", -1),
+        (NODE_MOVED, "a", None, 1),  # 只移动一个节点即可调整顺序
+        (NODE_INSERTED, "d", None, 2),
+        (NODE_INSERTED, "c1", "a", 1),  # 原父节点已删除,在新位置重新插入
+        (NODE_UPDATED, "a2", "a", 0),
+    ]
+
+def test_diff_tree_sort_order():
+    """测试按显示顺序对比,sort 变化报告为移动和更新"""
+    old = [{"id": "a", "title": "A", "sort": 1}, {"id": "b", "title": "B", "sort": 2}]
+    new = [{"id": "a", "title": "A", "sort": 3}, {"id": "b", "title": "B", "sort": 2}]
+    changes = diff_tree(old, new, order=sort_menus)
+    assert [(change.kind, change.id, change.row) for change in changes] == [
+        (NODE_MOVED, "a", 1), (NODE_UPDATED, "a", 1)]
+    assert diff_tree(new, json.loads(json.dumps(new)), order=sort_menus) == []
+
+def test_reload_emits_changes(app, menu_loader, tmp_path, monkeypatch):
+    """测试重新加载时发出节点级变更信号"""
+    path = tmp_path / "menus.json"
+    write_menus(path, [{"id": "a", "title": "A", "route": "/a"}])
+    monkeypatch.setattr(menu_loader, '_config_path', str(path))
+    monkeypatch.setattr(menu_loader, '_menu_config', None)
+    menu_loader.load_config()
+
+    received = []
+    menu_loader.menu_inserted.connect(lambda *args: received.append(("inserted",) + args[:3]))
+    menu_loader.menu_updated.connect(lambda menu_id, config: received.append(("updated", menu_id)))
+    write_menus(path, [{"id": "a", "title": "A2", "route": "/a"}, {"id": "b", "title": "B"}])
+    changes = menu_loader.reload()
+    assert len(changes) == 2
+    assert received == [("inserted", "b", "", 1), ("updated", "a")]
+    assert menu_loader.menu_config[0]["title"] == "A2"
+
+    # 加载失败时保留当前配置
+    path.write_text("{invalid json", encoding='utf-8')
+    assert menu_loader.reload() == []
+    assert menu_loader.menu_config[0]["title"] == "A2"
+
+def test_watch_debounces_writes(app, menu_loader, tmp_path, monkeypatch):
+    """测试监听文件变化,合并连续写入只重新加载一次"""
+    path = tmp_path / "menus.json"
+    write_menus(path, [{"id": "a", "title": "A"}])
+    monkeypatch.setattr(menu_loader, '_config_path', str(path))
+    monkeypatch.setattr(menu_loader, '_menu_config', None)
+    monkeypatch.setattr(MenuLoader, 'RELOAD_DELAY', 50)
+    menu_loader.load_config()
+
+    patched = []
+    menu_loader.menu_patched.connect(lambda changes, menus: patched.append(menus))
+    menu_loader.watch()
+    try:
+        for title in ("A1", "A2", "A3"):
+            write_menus(path, [{"id": "a", "title": title}])
+        for _ in range(40):
+            QTest.qWait(50)
+            if patched:
+                break
+        QTest.qWait(100)
+        assert len(patched) == 1
+        assert patched[0][0]["title"] == "A3"
+    finally:
+        menu_loader.watch(False)
+    assert not menu_loader.is_watching()
+
+def test_load_async(app, menu_loader, tmp_path, monkeypatch):
+    """测试在工作线程加载,在 GUI 线程发出信号"""
+    path = tmp_path / "menus.json"
+    write_menus(path, [{"id": "b", "title": "B", "sort": 2},
+                       {"id": "a", "title": "A", "sort": 1, "children": [
+                           {"id": "a2", "title": "A2", "sort": 2}, {"id": "a1", "title": "A1", "sort": 1}]}])
+    monkeypatch.setattr(menu_loader, '_config_path', str(path))
+    monkeypatch.setattr(menu_loader, '_menu_config', None)
+
+    threads = []
+    menu_loader.menu_loaded.connect(lambda menus: threads.append(QThread.currentThread()))
+    menu_loader.load_async()
+    menu_loader.wait()
+    for _ in range(40):
+        if threads:
+            break
+        QTest.qWait(10)
+    assert threads == [app.thread()]
+    # 各级同级菜单已按 sort 排序
+    assert [menu["id"] for menu in menu_loader.menu_config] == ["a", "b"]
+    assert [menu["id"] for menu in menu_loader.menu_config[0]["children"]] == ["a1", "a2"]
+    assert menu_loader.menu_index["a1"] is menu_loader.menu_config[0]["children"][0]
+
+def test_load_async_error(app, menu_loader, monkeypatch):
+    """测试后台加载失败时发出错误信号"""
+    monkeypatch.setattr(menu_loader, '_config_path', 'nonexistent.json')
+    errors = []
+    menu_loader.load_error.connect(errors.append)
+    menu_loader.load_async()
+    menu_loader.wait()
+    for _ in range(40):
+        if errors:
+            break
+        QTest.qWait(10)
+    assert len(errors) == 1 and "配置文件不存在" in errors[0]
+
+def test_compiled_cache(menu_loader, tmp_path, monkeypatch):
+    """测试缓存按修改时间、大小和哈希命中,内容变化时重新解析"""
+    path = tmp_path / "menus.json"
+    write_menus(path, [{"id": "a", "title": "A"}])
+    monkeypatch.setattr(menu_loader, '_config_path', str(path))
+
+    menu_loader.load_config()
+    assert not menu_loader.from_cache
+    menu_loader.load_config()
+    assert menu_loader.from_cache
+    assert menu_loader.menu_config == [{"id": "a", "title": "A"}]
+
+    # 内容相同但修改时间变化:按哈希命中
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    menu_loader.load_config()
+    assert menu_loader.from_cache
+
+    # 内容变化:重新解析
+    write_menus(path, [{"id": "a", "title": "A2"}])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+    menu_loader.load_config()
+    assert not menu_loader.from_cache
+    assert menu_loader.menu_config[0]["title"] == "A2"
+
+    # 缓存损坏时忽略
+    with open(menu_loader._cache_path, 'wb') as f:
+        f.write(b"broken")
+    menu_loader.load_config()
+    assert not menu_loader.from_cache
+    assert menu_loader.menu_config[0]["title"] == "A2"
+
+def test_filter_menus(menu_loader, tmp_path, monkeypatch):
+    """按用户权限过滤,权限位图随缓存保存"""
+    path = tmp_path / "menus.json"
+    write_menus(path, [
+        {"id": "a", "title": "A", "route": "/a"},
+        {"id": "b", "title": "B", "route": "/b", "permissions": ["admin"]},
+    ])
+    monkeypatch.setattr(menu_loader, '_config_path', str(path))
+    menu_loader.load_config()
+    assert [m["id"] for m in menu_loader.filter_menus([])] == ["a"]
+    assert [m["id"] for m in menu_loader.filter_menus(["admin"])] == ["a", "b"]
+    
+    menu_loader.load_config()
+    assert menu_loader.from_cache
+    assert [m["id"] for m in menu_loader.filter_menus(["admin"])] == ["a", "b"]
+
+def test_menu_index():
+    """测试路由/id/父节点索引与祖先路径"""
+    menus = [
+        {"id": "system", "title": "系统管理", "children": [
+            {"id": "users", "title": "用户管理", "route": "/system/users", "children": [
+                {"id": "detail", "title": "用户详情", "route": "/system/users/detail"},
+            ]},
+        ]},
+        {"id": "home", "title": "首页", "route": "/"},
+    ]
+    index = MenuIndex(menus)
+    assert index.find_route("/system/users") is menus[0]["children"][0]
+    assert index.find_route("/missing") is None
+    assert index.parents["detail"] == "users" and index.parents["system"] is None
+    assert [m["id"] for m in index.path("detail")] == ["system", "users", "detail"]
+    assert index.breadcrumb("/system/users/detail") == ["系统管理", "用户管理", "用户详情"]
+    assert index.breadcrumb("/") == ["首页"]
+    assert index.path("missing") == []
+    
+    restored = MenuIndex.from_tables(index.tables())
+    assert restored.breadcrumb("/system/users") == ["系统管理", "用户管理"]
+
+def test_loader_breadcrumb_from_cache(menu_loader, tmp_path, monkeypatch):
+    """测试命中缓存时索引同样可用"""
+    path = tmp_path / "menus.json"
+    write_menus(path, [{"id": "a", "title": "A", "children": [{"id": "b", "title": "B", "route": "/b"}]}])
+    monkeypatch.setattr(menu_loader, '_config_path', str(path))
+    menu_loader.load_config()
+    menu_loader.load_config()
+    assert menu_loader.from_cache
+    assert menu_loader.breadcrumb("/b") == ["A", "B"]
+    assert menu_loader.find_route("/b")["id"] == "b"
+
+def test_pause_gc_nested_and_respects_disabled():
+    """测试重叠的读取只在最后一个结束时恢复 GC,已被关闭的 GC 保持关闭"""
+    assert gc.isenabled()
+    first, second = _pause_gc(), _pause_gc()
+    first.__enter__()
+    second.__enter__()
+    first.__exit__(None, None, None)
+    assert not gc.isenabled()
+    second.__exit__(None, None, None)
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with _pause_gc():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
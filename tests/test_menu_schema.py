@@ -0,0 +1,101 @@
+import pytest
+from src.core.menu_schema import MenuValidator, ValidationIssue, format_issues
+from src.core.menu_loader import MenuLoadError
+
+@pytest.fixture
+def validator():
+    return MenuValidator()
+
+def validate(validator, menus):
+    return validator.validate({"version": "1.0", "menus": menus})
+
+def test_valid_config(validator):
+    """合法配置没有错误"""
+    menus = [{
+        "id": "system", "title": "系统管理", "icon": "settings", "sort": 1,
+        "children": [{"id": "users", "title": "用户管理", "route": "/system/users",
+                      "permissions": ["manage_users"], "sort": 1.5}],
+    }]
+    assert validate(validator, menus) == []
+
+def test_top_level(validator):
+    """顶层结构错误"""
+    assert validator.validate([]) == [ValidationIssue('$', "配置必须是一个对象")]
+    assert [str(i) for i in validator.validate({})] == ["$: 缺少version字段", "$: 缺少menus字段"]
+    assert validator.validate({"version": "1.0", "menus": {}})[0].path == '$.menus'
+
+def test_collects_all_errors_with_paths(validator):
+    """一次返回全部错误,按文档顺序给出 JSON 路径"""
+    menus = [
+        {"title": "缺少id"},
+        {"id": "a", "title": "A", "children": [
+            {"id": "b", "title": 1},
+            {"id": "c", "title": "C", "sort": "1", "permissions": ["x", 2]},
+            "child",
+        ]},
+    ]
+    issues = validate(validator, menus)
+    assert [issue.path for issue in issues] == [
+        "$.menus[0]",
+        "$.menus[1].children[0].title",
+        "$.menus[1].children[1].sort",
+        "$.menus[1].children[1].permissions[1]",
+        "$.menus[1].children[2]",
+    ]
+    assert "缺少id字段" in issues[0].message
+    assert issues[1].message == "title必须是字符串: b"
+
+def test_bool_is_not_number(validator):
+    """true/false 不能作为 sort"""
+    issues = validate(validator, [{"id": "a", "title": "A", "sort": True}])
+    assert [str(i) for i in issues] == ["$.menus[0].sort: sort必须是数字: a"]
+
+def test_unknown_field(validator):
+    """未知字段(多为拼写错误)"""
+    issues = validate(validator, [{"id": "a", "title": "A", "rout": "/a"}])
+    assert [str(i) for i in issues] == ["$.menus[0].rout: 未知字段: rout"]
+
+def test_duplicate_id_and_route(validator):
+    """重复的 id 和路由给出首次出现的位置"""
+    menus = [
+        {"id": "a", "title": "A", "route": "/a"},
+        {"id": "p", "title": "P", "children": [{"id": "a", "title": "A2", "route": "/a"}]},
+    ]
+    issues = validate(validator, menus)
+    assert [str(i) for i in issues] == [
+        "$.menus[1].children[0].id: id重复: a(首次出现于 $.menus[0])",
+        "$.menus[1].children[0].route: route重复: /a(首次出现于 $.menus[0])",
+    ]
+
+def test_deep_tree_without_recursion(validator):
+    """层级远超递归深度限制的配置也能校验"""
+    root = node = {"id": "n0", "title": "0"}
+    for i in range(1, 5000):
+        child = {"id": f"n{i}", "title": str(i)}
+        node["children"] = [child]
+        node = child
+    node["sort"] = "x"
+    issues = validate(validator, [root])
+    assert len(issues) == 1
+    assert issues[0].path.startswith("$.menus[0].children[0].children[0]")
+    assert issues[0].path.endswith(".sort")
+
+def test_format_issues():
+    """超出数量的错误只给出数量"""
+    issues = [ValidationIssue(f"$.menus[{i}]", "菜单项必须是对象") for i in range(12)]
+    text = format_issues(issues, limit=2)
+    assert text.splitlines() == [
+        "配置校验失败,共 12 处错误:",
+        "$.menus[0]: 菜单项必须是对象",
+        "$.menus[1]: 菜单项必须是对象",
+        "... 其余 10 处",
+    ]
+
+def test_loader_error_carries_all_issues():
+    """MenuLoader 校验失败时异常包含全部错误"""
+    from src.core.menu_loader import MenuLoader
+    config = {"version": "1.0", "menus": [{"id": 1, "title": "A"}, {"id": "b"}]}
+    with pytest.raises(MenuLoadError) as exc_info:
+        MenuLoader()._validate_config(config)
+    assert len(exc_info.value.errors) == 2
+    assert "共 2 处错误" in str(exc_info.value)
@@ -0,0 +1,100 @@
+import pytest
+from src.utils.pinyin import initial, initials
+from src.core.menu_search import MenuSearchIndex, MATCH_PREFIX, MATCH_SUBSTRING, MATCH_FUZZY, FIELD_INITIALS
+
+MENUS = [
+    {"id": "system", "title": "系统管理", "children": [
+        {"id": "user", "title": "用户管理", "route": "/system/user"},
+        {"id": "role", "title": "角色管理", "route": "/system/role"},
+        {"id": "menu", "title": "菜单配置", "route": "/system/menu"},
+    ]},
+    {"id": "dashboard", "title": "仪表盘", "route": "/dashboard"},
+    {"id": "orders", "title": "订单列表", "route": "/orders/list"},
+]
+
+
+@pytest.fixture
+def index():
+    return MenuSearchIndex(MENUS)
+
+
+def ids(results):
+    return [result.id for result in results]
+
+
+def test_pinyin_initials():
+    """测试拼音首字母"""
+    assert initials("用户管理") == "yhgl"
+    assert initials("系统 Admin1") == "xtadmin1"
+    assert initial("·") == ""
+
+
+def test_only_routed_menus_indexed(index):
+    """测试只索引有路由的菜单,并记录路径"""
+    assert len(index) == 5
+    result = index.search("用户管理")[0]
+    assert result.route == "/system/user"
+    assert result.path == ("系统管理", "用户管理")
+    assert result.score[0] == MATCH_PREFIX
+
+
+def test_search_fields(index):
+    """测试按标题、拼音首字母、id 和路由搜索"""
+    assert ids(index.search("yhgl")) == ["user"]
+    assert index.search("yhgl")[0].score[1] == FIELD_INITIALS
+    assert ids(index.search("dash")) == ["dashboard"]
+    assert ids(index.search("/orders")) == ["orders"]
+    assert ids(index.search("  YB P ")) == ["dashboard"]
+
+
+def test_ranking(index):
+    """测试前缀优先于子串,子串优先于模糊匹配"""
+    results = index.search("gl")
+    assert [result.score[0] for result in results][:2] == [MATCH_SUBSTRING, MATCH_SUBSTRING]
+    assert set(ids(results)) >= {"user", "role"}
+
+    results = index.search("ygl")
+    assert ids(results) == ["user"]
+    assert results[0].score[0] == MATCH_FUZZY
+    assert index.search("zzz") == []
+
+
+def test_prefix_ranked_by_length():
+    """测试前缀匹配按剩余长度排序,不受字典序影响"""
+    menus = [{"id": f"archive{i:02d}", "title": f"Report Archive {i:02d}", "route": f"/archive/{i}"}
+             for i in range(30)]
+    menus.append({"id": "reports", "title": "Reports", "route": "/reports"})
+    results = MenuSearchIndex(menus).search("report", 3)
+    assert results[0].id == "reports"
+    assert results[0].score == (MATCH_PREFIX, 0, 0, 1)
+    assert [result.score for result in results] == sorted(result.score for result in results)
+
+
+def test_narrowing_matches_full_search(index):
+    """测试连续输入时在上一次结果中筛选,结果与完整搜索一致"""
+    for query in ["s", "sy", "sys", "syst", "/system/r"]:
+        narrowed = index.search(query, limit=100)
+        index._last = None
+        assert narrowed == index.search(query, limit=100)
+
+
+def test_incremental_update(index):
+    """测试增量更新只重新索引变化的条目"""
+    menus = [dict(menu) for menu in MENUS]
+    menus[0] = dict(menus[0], title="权限管理")  # 只影响子菜单路径
+    menus[2] = dict(menus[2], title="订单中心")
+    del menus[1]
+    assert index.update(menus) == (1, 1)
+    assert index.search("ddzx")[0].id == "orders"
+    assert index.search("ybp") == []
+    assert index.search("用户")[0].path == ("权限管理", "用户管理")
+    assert index.update(menus) == (0, 0)
+
+
+def test_rebuild_after_many_deletes():
+    """测试删除过多时重建序号"""
+    menus = [{"id": f"m{i}", "title": f"菜单{i}", "route": f"/m/{i}"} for i in range(3000)]
+    index = MenuSearchIndex(menus)
+    assert index.update(menus[:100]) == (0, 2900)
+    assert len(index._entries) == 100
+    assert ids(index.search("m99")) == ["m99"]
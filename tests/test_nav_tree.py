@@ -0,0 +1,152 @@
+import copy
+from src.core.diff import diff_tree
+from src.core.menu_loader import sort_menus
+from PySide6.QtCore import QModelIndex
+from src.core.theme import ThemeManager
+from src.components.layout.nav_tree import NavigationTree, MenuTreeModel, ROUTE_ROLE, ID_ROLE
+from src.components.layout.sidebar import Sidebar
+
+
+def make_menus(count, depth=2):
+    """生成 count 个一级菜单,每个带 depth 层子菜单"""
+    menus = []
+    for i in range(count):
+        node = {"id": f"m{i}", "title": f"菜单{i}", "route": f"/m/{i}", "sort": count - i}
+        leaf = node
+        for level in range(depth):
+            child = {"id": f"m{i}-{level}", "title": f"子菜单{i}-{level}", "route": f"/m/{i}/{level}"}
+            leaf["children"] = [child]
+            leaf = child
+        menus.append(node)
+    return menus
+
+
+def test_model_builds_nodes_lazily(app):
+    """测试模型只为访问过的层级创建节点"""
+    model = MenuTreeModel(make_menus(10000))
+    assert model.rowCount() == 10000
+    first = model.index(0, 0)
+    assert first.data(ID_ROLE) == "m9999"  # 按 sort 排序
+    assert model.hasChildren(first)
+    assert model.node(first)._children is None
+
+    child = model.index(0, 0, first)
+    assert child.data(ROUTE_ROLE) == "/m/9999/0"
+    assert model.parent(child) == first
+    assert model.parent(first) == QModelIndex()
+
+
+def test_click_toggles_and_emits_route(app):
+    """测试点击展开子菜单并发出路由"""
+    tree = NavigationTree(ThemeManager())
+    tree.setMenus(make_menus(3))
+    received = []
+    tree.menuClicked.connect(received.append)
+
+    index = tree.model().index(0, 0)
+    tree._on_index_clicked(index)
+    assert tree.isExpanded(index)
+    assert received == ["/m/2"]
+    tree._on_index_clicked(index)
+    assert not tree.isExpanded(index)
+
+
+def test_rail_mode_collapses_all(app):
+    """测试图标栏模式收起全部子菜单"""
+    tree = NavigationTree(ThemeManager())
+    tree.setMenus(make_menus(3))
+    index = tree.model().index(0, 0)
+    tree.expand(index)
+    tree.setRail(True)
+    assert tree.isRail()
+    assert not tree.isExpanded(index)
+    assert tree.indentation() == 0
+    tree._on_index_clicked(index)
+    assert not tree.isExpanded(index)
+
+
+def test_sidebar_auto_mode(app):
+    """测试菜单节点较多时侧边栏使用导航树"""
+    small = Sidebar(ThemeManager(), make_menus(3))
+    assert small.mode == Sidebar.MODE_WIDGETS
+    large = Sidebar(ThemeManager(), make_menus(Sidebar.TREE_MODE_THRESHOLD))
+    assert large.mode == Sidebar.MODE_TREE
+    assert large.menu_items == []
+
+    received = []
+    large.menuClicked.connect(lambda route, title: received.append((route, title)))
+    large.tree.menuClicked.emit("/m/5/1")
+    assert received == [("/m/5/1", "子菜单5-1")]
+
+
+def test_apply_changes_updates_rows(app):
+    """测试按节点级变更修改模型,只通知受影响的行"""
+    old = make_menus(3)
+    model = MenuTreeModel(old)
+    first = model.index(0, 0)
+    model.rowCount(first)  # 创建 m2 的子节点
+
+    new = copy.deepcopy(old)
+    new[2]["title"] = "新标题"          # m2 更新
+    new[2]["children"].append({"id": "x", "title": "新子菜单", "route": "/x"})
+    del new[0]                          # 删除 m0
+    new.append({"id": "y", "title": "新菜单", "route": "/y", "sort": 0})
+    signals = []
+    model.rowsInserted.connect(lambda *args: signals.append("inserted"))
+    model.rowsRemoved.connect(lambda *args: signals.append("removed"))
+    model.modelReset.connect(lambda: signals.append("reset"))
+    model.applyChanges(diff_tree(old, new, order=sort_menus), new)
+
+    assert "reset" not in signals
+    assert [model.index(row, 0).data(ID_ROLE) for row in range(model.rowCount())] == ["y", "m2", "m1"]
+    m2 = model.index(1, 0)
+    assert m2.data() == "新标题"
+    assert [model.index(row, 0, m2).data(ID_ROLE) for row in range(model.rowCount(m2))] == ["m2-0", "x"]
+    # 未创建子节点的节点按新配置创建
+    m1 = model.index(2, 0)
+    assert model.index(0, 0, m1).data(ID_ROLE) == "m1-0"
+
+
+def test_apply_changes_child_of_removed_parent(app):
+    """测试父节点删除后,其已创建的子节点移到其他父节点时作为新节点插入"""
+    old = [
+        {"id": "p", "title": "P", "children": [{"id": "x", "title": "X", "route": "/x"}]},
+        {"id": "q", "title": "Q", "children": [{"id": "q0", "title": "Q0", "route": "/q0"}]},
+    ]
+    model = MenuTreeModel(old)
+    p, q = model.index(0, 0), model.index(1, 0)
+    model.rowCount(p)
+    model.rowCount(q)
+    stale = model.node(model.index(0, 0, p))
+
+    new = [{"id": "q", "title": "Q", "children": [
+        {"id": "q0", "title": "Q0", "route": "/q0"},
+        {"id": "x", "title": "X", "route": "/x"},
+    ]}]
+    moved = []
+    model.rowsMoved.connect(lambda *args: moved.append(args))
+    model.applyChanges(diff_tree(old, new, order=sort_menus), new)
+
+    assert moved == []
+    assert model.rowCount() == 1
+    q = model.index(0, 0)
+    x = model.index(1, 0, q)
+    assert x.data(ID_ROLE) == "x"
+    assert model.node(x) is not stale
+    assert model.parent(x) == q
+    # id 索引跟随变更更新
+    assert model.indexForPath(["q", "x"]) == x
+    assert not model.indexForPath(["p", "x"]).isValid()
+
+
+def test_reveal_path(app):
+    """测试按 id 路径选中深层菜单并展开父菜单"""
+    tree = NavigationTree()
+    tree.setMenus(make_menus(100))
+    assert tree.revealPath(["m5", "m5-0", "m5-1"])
+    current = tree.currentIndex()
+    assert current.data(ID_ROLE) == "m5-1"
+    assert tree.isExpanded(current.parent())
+    assert tree.isExpanded(current.parent().parent())
+    assert not tree.revealPath(["m5", "missing"])
+    assert not tree.selectionModel().hasSelection()
@@ -0,0 +1,78 @@
+import threading
+import pytest
+from src.components.page_loader import PageCache, PageLoader, ListPageProvider
+
+
+class CountingProvider(ListPageProvider):
+    """记录调用次数与线程的数据源"""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.calls = []
+        self.threads = set()
+
+    def fetchPage(self, page, size):
+        self.calls.append(page)
+        self.threads.add(threading.get_ident())
+        return super().fetchPage(page, size)
+
+
+@pytest.fixture
+def provider():
+    return CountingProvider([{"id": i} for i in range(95)])
+
+
+def test_page_cache_lru():
+    """测试LRU淘汰"""
+    cache = PageCache(2)
+    cache.put(1, ["a"])
+    cache.put(2, ["b"])
+    cache.get(1)
+    cache.put(3, ["c"])
+
+    assert 1 in cache
+    assert 2 not in cache
+    assert 3 in cache
+
+
+def test_loader_loads_off_gui_thread(app, qtbot, provider):
+    """测试后台加载并缓存"""
+    loader = PageLoader(provider)
+    assert loader.request(2, 10) is None
+
+    with qtbot.waitSignal(loader.pageLoaded, timeout=2000) as blocker:
+        pass
+    page, size, rows = blocker.args
+    assert (page, size) == (2, 10)
+    assert rows[0]["id"] == 10
+    assert threading.get_ident() not in provider.threads
+
+    # 再次请求直接命中缓存
+    assert loader.request(2, 10) == rows
+    assert provider.calls == [2]
+
+
+def test_loader_prefetch_bounds(app, provider):
+    """测试预取忽略越界页"""
+    loader = PageLoader(provider)
+    assert loader.pageCount(10) == 10
+
+    loader.prefetch(0, 10)
+    loader.prefetch(11, 10)
+    loader.waitForDone()
+    assert provider.calls == []
+
+
+def test_loader_ignores_stale_results(app, qtbot, provider):
+    """测试切换数据源后丢弃旧结果"""
+    loader = PageLoader(provider)
+    loaded = []
+    loader.pageLoaded.connect(lambda page, size, rows: loaded.append(page))
+
+    loader.request(1, 10)
+    loader.waitForDone()
+    loader.invalidate()
+    qtbot.wait(50)
+
+    assert loaded == []
+    assert loader.cached(1, 10) is None
@@ -0,0 +1,71 @@
+from src.core.permissions import PermissionMasks, PUBLIC_BIT
+
+MENUS = [
+    {"id": "dashboard", "title": "仪表盘", "route": "/dashboard"},
+    {"id": "system", "title": "系统管理", "children": [
+        {"id": "users", "title": "用户管理", "route": "/system/users", "permissions": ["manage_users"]},
+        {"id": "roles", "title": "角色管理", "route": "/system/roles", "permissions": ["manage_roles", "admin"]},
+    ]},
+    {"id": "finance", "title": "财务", "permissions": ["finance"], "children": [
+        {"id": "bills", "title": "账单", "route": "/finance/bills"},
+    ]},
+    {"id": "reports", "title": "报表", "route": "/reports", "children": [
+        {"id": "audit", "title": "审计", "route": "/reports/audit", "permissions": ["admin"]},
+    ]},
+]
+
+def ids(menus):
+    """可见菜单的 (id, 子菜单) 结构"""
+    return [(menu["id"], ids(menu.get("children") or [])) for menu in menus]
+
+def test_masks():
+    """权限按出现顺序映射到位,子树掩码为各节点掩码的并集"""
+    masks = PermissionMasks(MENUS)
+    assert sorted(masks.bits) == ["admin", "finance", "manage_roles", "manage_users"]
+    assert all(bit > PUBLIC_BIT for bit in masks.bits.values())
+    assert masks.own["dashboard"] == 0
+    assert masks.own["roles"] == masks.bits["manage_roles"] | masks.bits["admin"]
+    assert masks.reach["system"] == PUBLIC_BIT | masks.own["users"] | masks.own["roles"]
+    assert masks.need["finance"] == masks.bits["finance"]
+
+def test_filter_without_permissions():
+    """没有权限时只保留公开菜单,空分组隐藏,有路由的父菜单保留"""
+    masks = PermissionMasks(MENUS)
+    assert ids(masks.filter(MENUS, masks.mask([]))) == [("dashboard", []), ("reports", [])]
+
+def test_filter_any_of_permissions():
+    """拥有任一权限即可见,父菜单不可见时子菜单隐藏"""
+    masks = PermissionMasks(MENUS)
+    visible = masks.filter(MENUS, masks.mask(["admin", "unknown"]))
+    assert ids(visible) == [
+        ("dashboard", []),
+        ("system", [("roles", [])]),
+        ("reports", [("audit", [])]),
+    ]
+    # 原配置不变
+    assert len(MENUS[1]["children"]) == 2
+
+def test_filter_shares_fully_visible_subtrees():
+    """整棵子树可见时直接复用原节点"""
+    masks = PermissionMasks(MENUS)
+    visible = masks.filter(MENUS, masks.mask(["manage_users", "manage_roles", "admin", "finance"]))
+    assert all(a is b for a, b in zip(visible, MENUS))
+    partial = masks.filter(MENUS, masks.mask(["finance"]))
+    assert partial[1] is MENUS[2]
+
+def test_from_tables():
+    masks = PermissionMasks.from_tables(PermissionMasks(MENUS).tables())
+    assert ids(masks.filter(MENUS, masks.mask(["finance"]))) == [
+        ("dashboard", []), ("finance", [("bills", [])]), ("reports", [])]
+
+def test_refilter_thousand_nodes():
+    """千节点菜单切换角色重新过滤(耗时见 scripts/bench_menu_permissions.py)"""
+    menus = [{"id": f"g{g}", "title": "分组", "children": [
+        {"id": f"g{g}_{i}", "title": "页面", "route": f"/{g}/{i}", "permissions": [f"p{i % 10}"]}
+        for i in range(99)]} for g in range(10)]
+    masks = PermissionMasks(menus)
+    roles = [masks.mask([f"p{i}" for i in range(n)]) for n in range(11)]
+    visible = [sum(len(g["children"]) for g in masks.filter(menus, user_mask)) for user_mask in roles]
+    assert visible == [n * 100 for n in range(10)] + [990]
+    # 拥有全部权限时直接复用原菜单树
+    assert masks.filter(menus, roles[10])[0] is menus[0]
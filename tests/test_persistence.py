@@ -0,0 +1,81 @@
+from src.core.store import Store
+from src.core.persistence import StorePersistence
+
+
+def make_store():
+    """创建注册了mutation的Store"""
+    store = Store()
+
+    def add_user(state, user):
+        state.setdefault("users", []).append(user)
+
+    def set_dict(state, payload):
+        state["dict"] = payload
+
+    store.registerMutation("addUser", add_user)
+    store.registerMutation("setDict", set_dict)
+    return store
+
+
+def test_restore_from_journal(tmp_path):
+    """测试从日志恢复"""
+    store = make_store()
+    assert not store.enablePersistence(str(tmp_path))
+    store.commit("addUser", "admin")
+    store.commit("setDict", {"gender": ["男", "女"]})
+    store.disablePersistence()
+
+    restored = make_store()
+    assert restored.enablePersistence(str(tmp_path))
+    assert restored.state == {"users": ["admin"], "dict": {"gender": ["男", "女"]}}
+
+
+def test_snapshot_compacts_journal(tmp_path):
+    """测试日志达到阈值后压缩为快照"""
+    store = make_store()
+    store.enablePersistence(str(tmp_path), snapshot_interval=3)
+    for i in range(7):
+        store.commit("addUser", f"user{i}")
+    store.disablePersistence()
+
+    journal = tmp_path / StorePersistence.JOURNAL_FILE
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 1
+    assert (tmp_path / StorePersistence.SNAPSHOT_FILE).exists()
+
+    restored = make_store()
+    restored.enablePersistence(str(tmp_path), snapshot_interval=3)
+    assert restored.state["users"] == [f"user{i}" for i in range(7)]
+
+
+def test_restore_ignores_stale_and_partial_entries(tmp_path):
+    """测试跳过已包含在快照中的日志和不完整的行"""
+    persistence = StorePersistence(str(tmp_path))
+    persistence.restore({})
+    persistence._sequence = 2
+    persistence.snapshot({"users": ["a", "b"]})
+    with open(tmp_path / StorePersistence.JOURNAL_FILE, "w", encoding="utf-8") as f:
+        f.write('[2,"addUser","b"]\n[3,"addUser","c"]\n[4,"addUs')
+
+    store = make_store()
+    store.enablePersistence(str(tmp_path))
+    assert store.state["users"] == ["a", "b", "c"]
+
+    # 损坏的尾部已被截掉,新日志可以正常追加
+    store.commit("addUser", "d")
+    store.disablePersistence()
+    restored = make_store()
+    restored.enablePersistence(str(tmp_path))
+    assert restored.state["users"] == ["a", "b", "c", "d"]
+
+
+def test_unserializable_payload_forces_snapshot(tmp_path):
+    """测试无法序列化的payload写入快照"""
+    store = make_store()
+    store.registerMutation("setCount", lambda state, payload: state.__setitem__("count", len(payload)))
+    store.enablePersistence(str(tmp_path))
+    store.commit("setCount", {1, 2, 3})
+    store.disablePersistence()
+
+    restored = make_store()
+    restored.enablePersistence(str(tmp_path))
+    assert restored.state["count"] == 3
@@ -0,0 +1,43 @@
+import pytest
+from src.core.route_trie import RouteTrie
+
+
+@pytest.fixture
+def trie():
+    trie = RouteTrie()
+    for pattern in ("/", "/system/users", "/system/users/:id", "/system/users/:id/edit",
+                    "/system/:module/list", "/files/*path"):
+        trie.add(pattern, pattern)
+    return trie
+
+
+def test_static_before_param(trie):
+    """测试静态片段优先"""
+    assert trie.match("/system/users").pattern == "/system/users"
+    assert trie.match("/").pattern == "/"
+
+
+def test_param_capture(trie):
+    """测试参数捕获"""
+    match = trie.match("/system/users/42/edit")
+    assert match.pattern == "/system/users/:id/edit"
+    assert match.params == {"id": "42"}
+
+
+def test_backtracking(trie):
+    """测试静态分支失败后回溯到参数分支"""
+    match = trie.match("/system/roles/list")
+    assert match.params == {"module": "roles"}
+
+
+def test_wildcard(trie):
+    """测试通配片段"""
+    assert trie.match("/files/a/b.txt").params == {"path": "a/b.txt"}
+    assert trie.match("/missing") is None
+    assert trie.match("/system/users/42/unknown") is None
+
+
+def test_wildcard_must_be_last():
+    """测试通配片段位置校验"""
+    with pytest.raises(ValueError):
+        RouteTrie().add("/files/*/x", None)
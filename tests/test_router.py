@@ -0,0 +1,226 @@
+import pytest
+from src.core.router import Router
+from src.core.components import BaseComponent
+
+
+class LifecycleView(BaseComponent):
+    """记录生命周期的测试视图"""
+    created = 0
+    default_cost = 0
+
+    def setupComponent(self):
+        LifecycleView.created += 1
+        self.events = []
+        self.params = None
+        self.cost = self.default_cost
+
+    def setParams(self, params):
+        self.params = params
+
+    def activated(self):
+        self.events.append("activated")
+
+    def deactivated(self):
+        self.events.append("deactivated")
+
+    def estimateMemory(self):
+        return self.cost
+
+
+@pytest.fixture
+def router(app):
+    LifecycleView.created = 0
+    router = Router(max_views=2)
+    for path in ("/a", "/b", "/c"):
+        router.register(path, LifecycleView)
+    return router
+
+
+def test_push_reuses_cached_view(router):
+    """测试再次进入时复用视图"""
+    a = router.push("/a", {"id": 1})
+    b = router.push("/b")
+    assert router.push("/a", {"id": 2}) is a
+    assert LifecycleView.created == 2
+    assert a.params == {"id": 2}
+    assert a.events == ["activated", "deactivated", "activated"]
+    assert b.events == ["activated", "deactivated"]
+
+
+def test_unknown_route(router):
+    """测试未注册的路由"""
+    assert router.push("/missing") is None
+
+
+def test_lru_eviction_by_count(router):
+    """测试按数量淘汰最久未使用的视图"""
+    evicted = []
+    router.viewEvicted.connect(lambda path, view: evicted.append(path))
+
+    router.push("/a")
+    router.push("/b")
+    router.push("/a")
+    router.push("/c")
+
+    assert evicted == ["/b"]
+    assert router.cached("/b") is None
+    assert router.cacheInfo()["views"] == 2
+
+
+def test_eviction_by_memory(app):
+    """测试按估算内存淘汰,当前视图不会被淘汰"""
+    class HeavyView(LifecycleView):
+        default_cost = 60
+
+    router = Router(max_views=10, max_memory=100)
+    router.register("/a", HeavyView)
+    router.register("/b", HeavyView)
+
+    a = router.push("/a")
+    b = router.push("/b")
+    assert router.cached("/a") is None
+    assert router.cached("/b") is b
+
+    # 使用过程中内存增长,离开时重新估算
+    b.cost = 120
+    router.push("/a")
+    assert router.cached("/b") is None
+    assert router.cacheInfo()["memory"] == 60
+
+
+def test_no_keep_alive_destroys_view(app):
+    """测试关闭缓存的路由离开时销毁"""
+    router = Router()
+    router.register("/a", LifecycleView, keep_alive=False)
+    router.register("/b", LifecycleView)
+
+    evicted = []
+    router.viewEvicted.connect(lambda path, view: evicted.append(path))
+    first = router.push("/a")
+    router.push("/b")
+    assert evicted == ["/a"]
+    assert router.push("/a") is not first
+
+
+def test_lazy_route_imports_on_first_push(app, tmp_path, monkeypatch):
+    """测试按导入路径注册的路由在第一次push时才导入"""
+    import sys
+    (tmp_path / "lazy_page.py").write_text(
+        "from src.core.components import BaseComponent\n"
+        "class LazyPage(BaseComponent):\n"
+        "    pass\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("lazy_page", None)
+
+    router = Router()
+    router.register("/lazy", "lazy_page:LazyPage")
+    router.register("/dotted", "lazy_page.LazyPage")
+    assert "lazy_page" not in sys.modules
+    assert not router.isLoaded("/lazy")
+
+    view = router.push("/lazy")
+    assert type(view).__name__ == "LazyPage"
+    assert router.isLoaded("/lazy")
+    assert router.resolve("/dotted") is type(view)
+
+
+def test_lazy_route_invalid_path(app):
+    """测试无效的导入路径"""
+    router = Router()
+    router.register("/bad", "no_such_module_xyz:Page")
+    with pytest.raises(ImportError):
+        router.push("/bad")
+
+
+def test_warmup_imports_in_idle_time(app, qtbot):
+    """测试空闲时预热"""
+    router = Router()
+    router.register("/a", "src.core.components:BaseComponent")
+    router.register("/b", "src.core.components.BaseComponent")
+    router.register("/bad", "no_such_module_xyz:Page")
+
+    router.warmup()
+    assert not router.isLoaded("/a")
+    qtbot.waitUntil(lambda: router.isLoaded("/a") and router.isLoaded("/b"), timeout=1000)
+    assert not router.isLoaded("/bad")
+
+
+def test_warmup_continues_after_module_error(app, qtbot, tmp_path, monkeypatch):
+    """测试页面模块导入时抛出非 ImportError 异常后继续预热"""
+    (tmp_path / "broken_page_xyz.py").write_text("raise RuntimeError('broken')\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    router = Router()
+    router.register("/broken", "broken_page_xyz:Page")
+    router.register("/a", "src.core.components:BaseComponent")
+
+    router.warmup()
+    qtbot.waitUntil(lambda: router.isLoaded("/a"), timeout=1000)
+    assert not router.isLoaded("/broken")
+
+
+def test_route_params_and_query(app):
+    """测试路径参数与查询参数"""
+    router = Router()
+    router.register("/system/users", LifecycleView)
+    router.register("/system/users/:id", LifecycleView)
+
+    view = router.push("/system/users/42?tab=roles&tag=a&tag=b", {"mode": "edit"})
+    assert view.params == {"id": "42", "tab": "roles", "tag": ["a", "b"], "mode": "edit"}
+    assert router.current_path == "/system/users/42"
+
+    other = router.push("/system/users/7")
+    assert other is not view
+    assert router.push("/system/users/42") is view
+    assert router.match("/system/users").pattern == "/system/users"
+
+
+def test_route_not_found_signal(app):
+    """测试未注册路径发出信号"""
+    router = Router()
+    router.register("/a", LifecycleView)
+    missing = []
+    router.routeNotFound.connect(missing.append)
+    assert router.push("/a/b") is None
+    assert missing == ["/a/b"]
+
+
+def test_prefetch_builds_view_before_push(app, qtbot, router):
+    """测试预构建的视图不进入缓存,push 时才放入"""
+    router.push("/a")
+    router.prefetch("/b", build=True)
+    router.prefetch("/b", build=True)
+    assert LifecycleView.created == 1
+
+    qtbot.waitUntil(lambda: LifecycleView.created == 2, timeout=1000)
+    assert router.cached("/b") is None
+    assert router.cacheInfo()["views"] == 1
+    prefetched = router.push("/b")
+    assert prefetched.events == ["activated"]
+    assert router.cached("/b") is prefetched
+    assert LifecycleView.created == 2
+
+
+def test_hover_prefetch_only_imports_last_route(app, qtbot):
+    """测试悬停预取默认只导入模块,连续悬停只处理最后一个路由"""
+    router = Router()
+    router.register("/a", "src.core.components:BaseComponent")
+    router.register("/b", "src.core.components.BaseComponent")
+    router.prefetch("/a")
+    router.prefetch("/b")
+    qtbot.waitUntil(lambda: router.isLoaded("/b"), timeout=1000)
+    assert not router.isLoaded("/a")
+    assert router.cacheInfo()["views"] == 0
+
+
+def test_prefetch_factory_error_ignored(app, qtbot, router):
+    """测试预构建视图时工厂抛出异常不影响运行"""
+    def broken():
+        raise RuntimeError("broken")
+
+    router.register("/broken", broken)
+    router.prefetch("/broken", delay=0, build=True)
+    router.prefetch("/a", delay=0, build=True)
+    router.prefetch("/broken", delay=0, build=True)
+    qtbot.wait(20)
+    assert router.cached("/broken") is None
+    assert router.push("/a") is not None
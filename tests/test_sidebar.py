@@ -0,0 +1,133 @@
+import copy
+import pytest
+from src.core.diff import diff_tree
+from src.core.menu_loader import sort_menus
+from src.core.theme import ThemeManager
+from src.components.layout.sidebar import Sidebar
+from src.components.layout.menu_item import MenuItem
+
+MENUS = [
+    {"id": "reports", "title": "报表中心", "icon": "chart", "sort": 3, "children": [
+        {"id": "monthly", "title": "月报表", "route": "/reports/monthly", "sort": 2, "children": [
+            {"id": "income", "title": "收入报表", "route": "/reports/monthly/income", "sort": 1},
+        ]},
+        {"id": "daily", "title": "日报表", "route": "/reports/daily", "sort": 1},
+    ]},
+    {"id": "dashboard", "title": "仪表盘", "icon": "dashboard", "route": "/dashboard", "sort": 1},
+]
+
+
+@pytest.fixture
+def sidebar(app):
+    return Sidebar(ThemeManager(), MENUS)
+
+
+def test_build_from_config_sorted(sidebar):
+    """测试根据配置创建一级菜单并按 sort 排序"""
+    assert [item.menu_id for item in sidebar.menu_items] == ["dashboard", "reports"]
+    assert sidebar.menu_items[0].route == "/dashboard"
+    assert len(sidebar.findChildren(MenuItem)) == 2
+
+
+def test_children_created_on_first_expand(sidebar):
+    """测试子菜单项在首次展开时创建"""
+    reports = sidebar.menu_items[1]
+    assert reports.has_children()
+    assert reports.sub_items == []
+
+    reports._on_clicked()
+    assert [item.menu_id for item in reports.sub_items] == ["daily", "monthly"]
+    monthly = reports.sub_items[1]
+    assert monthly.has_children() and monthly.sub_items == []
+
+    reports._on_clicked()
+    reports._on_clicked()
+    assert len(reports.sub_items) == 2
+
+
+def test_menu_clicked_title(sidebar):
+    """测试点击未创建过的深层菜单也能得到标题"""
+    received = []
+    sidebar.menuClicked.connect(lambda route, title: received.append((route, title)))
+    sidebar._on_menu_clicked("/reports/monthly/income")
+    assert received == [("/reports/monthly/income", "收入报表")]
+
+
+def test_breadcrumb(sidebar):
+    """测试面包屑包含完整的菜单路径"""
+    assert sidebar.breadcrumb("/reports/monthly/income") == ["报表中心", "月报表", "收入报表"]
+    assert sidebar.breadcrumb("/unknown") == []
+
+
+def test_set_active_route_reveals_item(sidebar):
+    """测试高亮当前菜单项并展开其父菜单,切换时取消之前的高亮"""
+    sidebar.set_active_route("/reports/monthly/income")
+    reports = sidebar.menu_items[1]
+    monthly = reports.sub_items[1]
+    income = monthly.sub_items[0]
+    assert reports.is_expanded and monthly.is_expanded
+    assert income.btn_container.property("active") is True
+
+    sidebar.set_active_route("/dashboard")
+    assert income.btn_container.property("active") is False
+    assert sidebar.menu_items[0].btn_container.property("active") is True
+
+
+def test_collapsed_sidebar_builds_collapsed_children(sidebar):
+    """测试收起状态下创建的子菜单项同样收起"""
+    sidebar.collapse()
+    reports = sidebar.menu_items[1]
+    reports._on_clicked()
+    assert reports.sub_items[0].text_label.isHidden()
+
+
+def test_apply_changes_patches_items(sidebar):
+    """测试按节点级变更修改菜单项,未受影响的菜单项保持不变"""
+    reports = sidebar.menu_items[1]
+    reports._on_clicked()
+    daily, monthly = reports.sub_items
+
+    menus = copy.deepcopy(MENUS)
+    menus[0]["children"][0]["title"] = "月度报表"                     # 更新
+    menus[0]["children"][0]["children"].append(                       # 未创建的子菜单
+        {"id": "cost", "title": "支出报表", "route": "/reports/monthly/cost", "sort": 2})
+    del menus[0]["children"][1]                                        # 删除 daily
+    menus.append({"id": "logs", "title": "日志", "route": "/logs", "sort": 2})  # 插入
+    changes = diff_tree(MENUS, menus, order=sort_menus)
+    sidebar.apply_changes(changes, menus)
+
+    assert [item.menu_id for item in sidebar.menu_items] == ["dashboard", "logs", "reports"]
+    assert sidebar.menu_items[2] is reports
+    assert reports.sub_items == [monthly]
+    assert monthly.text_label.text() == "月度报表"
+    monthly._on_clicked()
+    assert [item.menu_id for item in monthly.sub_items] == ["income", "cost"]
+
+    received = []
+    sidebar.menuClicked.connect(lambda route, title: received.append((route, title)))
+    sidebar.menu_items[1]._on_clicked()
+    assert received == [("/logs", "日志")]
+
+
+def test_apply_changes_moves_items(sidebar):
+    """测试移动菜单项到其他父菜单"""
+    reports = sidebar.menu_items[1]
+    reports._on_clicked()
+    daily = reports.sub_items[0]
+
+    menus = copy.deepcopy(MENUS)
+    moved = menus[0]["children"].pop(1)
+    moved["sort"] = 0
+    menus.append(moved)
+    sidebar.apply_changes(diff_tree(MENUS, menus, order=sort_menus), menus)
+
+    assert sidebar.menu_items[0] is daily
+    assert daily.parent_item is None
+    assert [item.menu_id for item in reports.sub_items] == ["monthly"]
+    assert reports.sub_item("daily") is None
+    sidebar.set_active_route("/reports/daily")
+    assert sidebar._active_item is daily
+    received = []
+    sidebar.menuClicked.connect(lambda route, title: received.append(route))
+    daily._on_clicked()
+    assert received == ["/reports/daily"]
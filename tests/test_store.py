@@ -0,0 +1,167 @@
+import pytest
+from src.core.store import Store
+
+
+@pytest.fixture
+def store():
+    """创建带有用户和主题状态的Store"""
+    store = Store()
+    store._state.update({"users": [], "theme": "light", "title": "admin"})
+
+    def add_user(state, user):
+        state["users"].append(user)
+
+    def set_theme(state, theme):
+        state["theme"] = theme
+
+    store.registerMutation("addUser", add_user)
+    store.registerMutation("setTheme", set_theme)
+    return store
+
+
+def test_getter_is_memoized(store):
+    """测试getter按依赖缓存"""
+    calls = []
+
+    def user_count(state, getters):
+        calls.append(1)
+        return len(state["users"])
+
+    store.registerGetter("userCount", user_count)
+    store.registerGetter("summary", lambda state, getters: f"{getters.userCount} users")
+
+    assert store.getters.summary == "0 users"
+    assert store.getter("userCount") == 0
+    assert len(calls) == 1
+
+    store.commit("setTheme", "dark")
+    assert store.getters["userCount"] == 0
+    assert len(calls) == 1
+
+    store.commit("addUser", {"name": "admin"})
+    assert store.getters.summary == "1 users"
+    assert len(calls) == 2
+
+
+def test_subscribe_only_notifies_selected_slice(store):
+    """测试只通知选择结果变化的订阅者"""
+    theme_events = []
+    user_events = []
+
+    store.subscribe("theme", lambda new, old: theme_events.append((new, old)))
+    store.subscribe(lambda state, getters: len(state["users"]),
+                    lambda new, old: user_events.append((new, old)))
+
+    store.commit("addUser", {"name": "admin"})
+    assert theme_events == []
+    assert user_events == [(1, 0)]
+
+    store.commit("setTheme", "dark")
+    store.commit("setTheme", "dark")
+    assert theme_events == [("dark", "light")]
+    assert user_events == [(1, 0)]
+
+
+def test_unsubscribe(store):
+    """测试取消订阅"""
+    events = []
+    unsubscribe = store.subscribe("theme", lambda new, old: events.append(new))
+    unsubscribe()
+    store.commit("setTheme", "dark")
+    assert events == []
+    assert "theme" not in store._subscriptions
+
+
+def test_dispatch_sync_action(store):
+    """测试同步action"""
+    store.registerAction("register", lambda store, user: store.commit("addUser", user))
+    store.dispatch("register", {"name": "guest"})
+    assert store.state["users"] == [{"name": "guest"}]
+
+
+def test_background_action_commits_on_gui_thread(app, qtbot, store):
+    """测试后台action在GUI线程提交"""
+    import threading
+    gui_thread = threading.get_ident()
+    threads = {}
+
+    def load_users(context, payload):
+        threads["action"] = threading.get_ident()
+        context.commit("addUser", {"name": payload})
+        return "ok"
+
+    store.registerMutation("addUser", lambda state, user: (
+        threads.setdefault("commit", threading.get_ident()), state["users"].append(user)))
+    store.registerAction("loadUsers", load_users, background=True)
+
+    with qtbot.waitSignal(store.actionFinished, timeout=2000) as blocker:
+        store.dispatch("loadUsers", "remote")
+        assert store.isPending("loadUsers")
+
+    assert blocker.args == ["loadUsers", "ok"]
+    assert not store.isPending("loadUsers")
+    assert store.state["users"] == [{"name": "remote"}]
+    assert threads["action"] != gui_thread
+    assert threads["commit"] == gui_thread
+
+
+def test_coroutine_action_latest_wins(app, qtbot, store):
+    """测试同一key只保留最新一次派发"""
+    import asyncio
+
+    async def search(context, text):
+        await asyncio.sleep(0.2 if text == "slow" else 0)
+        context.commit("setTheme", text)
+        return text
+
+    store.registerAction("search", search)
+    store.dispatch("search", "slow")
+    with qtbot.waitSignal(store.actionFinished, timeout=2000) as blocker:
+        store.dispatch("search", "fast")
+    store.waitForActions()
+    qtbot.wait(50)
+
+    assert blocker.args == ["search", "fast"]
+    assert store.state["theme"] == "fast"
+
+
+def test_background_action_error_and_cancel(app, qtbot, store):
+    """测试失败状态与取消"""
+    import time
+
+    def broken(context, payload):
+        raise ValueError("boom")
+
+    def slow(context, payload):
+        time.sleep(0.1)
+        context.commit("setTheme", "late")
+
+    store.registerAction("broken", broken, background=True)
+    store.registerAction("slow", slow, background=True)
+
+    with qtbot.waitSignal(store.actionFailed, timeout=2000):
+        store.dispatch("broken")
+    assert store.actionError("broken") == "boom"
+
+    store.dispatch("slow")
+    assert store.cancel("slow")
+    assert not store.isPending("slow")
+    store.waitForActions()
+    qtbot.wait(50)
+    assert store.state["theme"] == "light"
+
+
+def test_commit_notifies_when_persistence_fails(store, tmp_path):
+    """测试持久化写入失败时仍通知订阅者"""
+    store.enablePersistence(str(tmp_path))
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    store._persistence.record = fail
+    received = []
+    store.subscribe("users", lambda new, old: received.append(list(new)))
+    with pytest.raises(OSError):
+        store.commit("addUser", "alice")
+    assert received == [["alice"]]
+    store.disablePersistence()
@@ -0,0 +1,181 @@
+import pytest
+from PySide6.QtCore import QPersistentModelIndex
+from src.components.table import Table, TableModel
+
+
+@pytest.fixture
+def rows():
+    """生成测试数据"""
+    return [{"username": f"user{i}", "email": f"user{i}@example.com"} for i in range(1000)]
+
+
+def test_model_fetches_in_batches(app, rows):
+    """测试分批加载"""
+    model = TableModel(batch_size=100)
+    model.setColumns([{"title": "用户名", "key": "username"}])
+    model.setRows(rows)
+
+    assert model.rowCount() == 100
+    assert model.totalCount() == 1000
+    assert model.canFetchMore()
+
+    model.fetchMore()
+    assert model.rowCount() == 200
+
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 1000
+
+
+def test_model_data_and_header(app, rows):
+    """测试单元格与表头"""
+    model = TableModel()
+    model.setColumns([
+        {"title": "用户名", "key": "username"},
+        {"title": "邮箱", "key": "email"}
+    ])
+    model.setRows(rows)
+
+    from PySide6.QtCore import Qt
+    assert model.headerData(1, Qt.Horizontal) == "邮箱"
+    assert model.data(model.index(3, 0)) == "user3"
+    assert model.data(model.index(3, 1)) == "user3@example.com"
+
+
+def test_table_set_data(app, rows):
+    """测试表格设置数据"""
+    table = Table()
+    table.columns = [{"title": "用户名", "key": "username"}]
+    table.setData(rows)
+
+    assert table.data is rows
+    assert table.model.totalCount() == 1000
+    assert table.model.rowCount() == TableModel.DEFAULT_BATCH_SIZE
+
+
+def test_table_data_source_prefetch(app, qtbot, rows):
+    """测试数据源分页与相邻页预取"""
+    from src.components.page_loader import ListPageProvider
+
+    table = Table()
+    table.columns = [{"title": "用户名", "key": "username"}]
+    table.setPagination(3, 50)
+
+    with qtbot.waitSignal(table.loadingChanged, timeout=2000):
+        table.setDataSource(ListPageProvider(rows))
+    assert table.isLoading()
+
+    qtbot.waitUntil(lambda: not table.isLoading(), timeout=2000)
+    assert table.model.rowData(0)["username"] == "user100"
+
+    qtbot.waitUntil(lambda: table.loader.cached(4, 50) is not None, timeout=2000)
+    qtbot.waitUntil(lambda: table.loader.cached(2, 50) is not None, timeout=2000)
+
+    table.setPagination(4, 50)
+    assert not table.isLoading()
+    assert table.model.rowData(0)["username"] == "user150"
+
+
+def test_table_sort_by_header(app):
+    """测试表头排序只改变行映射"""
+    from PySide6.QtCore import Qt
+
+    table = Table()
+    table.columns = [{"title": "用户名", "key": "username"}, {"title": "年龄", "key": "age"}]
+    table.setData([
+        {"username": "b", "age": 2},
+        {"username": "a", "age": 3},
+        {"username": "c", "age": 1},
+    ])
+
+    table.model.sort(1, Qt.DescendingOrder)
+    assert [table.model.rowData(i)["username"] for i in range(3)] == ["a", "b", "c"]
+
+    table.sortBy([])
+    assert table.model.rowData(0)["username"] == "b"
+
+
+def test_table_incremental_updates(app, rows):
+    """测试增量更新"""
+    table = Table()
+    table.columns = [{"title": "用户名", "key": "username"}]
+    table.setData(rows)
+
+    changed = []
+    table.model.dataChanged.connect(lambda top_left, bottom_right: changed.append(top_left.row()))
+    table.updateRows(5, [{"username": "renamed", "email": ""}])
+    assert changed == [5]
+    assert table.model.rowData(5)["username"] == "renamed"
+
+    table.insertRows(0, [{"username": "first"}])
+    assert table.model.rowData(0)["username"] == "first"
+    assert table.model.totalCount() == 1001
+
+    table.removeRows(0, 2)
+    assert table.model.rowData(0)["username"] == "user1"
+    assert table.model.totalCount() == 999
+
+
+def test_sorted_update_maps_source_rows(app):
+    """测试排序状态下原位更新按逆排列通知对应的视图行"""
+    model = TableModel()
+    model.setColumns([{"title": "用户名", "key": "username"}, {"title": "年龄", "key": "age"}])
+    model.setRows([{"username": "b", "age": 2}, {"username": "a", "age": 3}, {"username": "c", "age": 1}])
+    model.sortBy([("age", True)])
+
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right: changed.append(top_left.row()))
+    model.updateSourceRows(0, [{"username": "x", "age": 2}, {"username": "y", "age": 3}])
+    assert changed == [1, 2]
+
+    model.insertSourceRows(0, [{"username": "z", "age": 0}])
+    changed.clear()
+    model.updateSourceRows(3, [{"username": "w", "age": 1}])
+    assert changed == [1]
+
+
+def test_sort_moves_persistent_indexes(app):
+    """测试排序后持久索引跟随记录移动,未暴露的行对应的索引失效"""
+    model = TableModel()
+    model.setColumns([{"title": "值", "key": "n"}])
+    model.setRows([{"n": 3}, {"n": 1}, {"n": 2}])
+    three = QPersistentModelIndex(model.index(0, 0))
+    model.sortBy([("n", True)])
+    assert three.row() == 2 and three.data() == "3"
+    model.sortBy([("n", False)])
+    assert three.row() == 0 and three.data() == "3"
+    model.sortBy([])
+    assert three.row() == 0
+
+    model = TableModel(batch_size=2)
+    model.setColumns([{"title": "值", "key": "n"}])
+    model.setRows([{"n": 3}, {"n": 1}, {"n": 2}])
+    three = QPersistentModelIndex(model.index(0, 0))
+    one = QPersistentModelIndex(model.index(1, 0))
+    model.sortBy([("n", True)])
+    assert one.row() == 0 and one.data() == "1"
+    assert not three.isValid()  # 排序后位于第 3 行,尚未暴露给视图
+
+
+def test_sorted_remove_and_insert_keep_model_consistent(app):
+    """测试排序状态下增删行:布局变化前数据仍可读,持久索引跟随记录"""
+    model = TableModel()
+    model.setColumns([{"title": "值", "key": "n"}])
+    model.setRows([{"n": n} for n in (5, 1, 4, 2, 3)])
+    model.sortBy([("n", True)])
+    snapshots = []
+    model.layoutAboutToBeChanged.connect(
+        lambda: snapshots.append([model.rowData(row)["n"] for row in range(model.rowCount())]))
+    four = QPersistentModelIndex(model.index(3, 0))
+    one = QPersistentModelIndex(model.index(0, 0))
+
+    model.removeSourceRows(1, 2)  # 删除 1 和 4
+    assert snapshots == [[1, 2, 3, 4, 5]]
+    assert model.rowCount() == 3
+    assert [model.rowData(row)["n"] for row in range(3)] == [2, 3, 5]
+    assert not one.isValid() and not four.isValid()
+
+    two = QPersistentModelIndex(model.index(0, 0))
+    model.insertSourceRows(0, [{"n": 0}])
+    assert model.rowData(0)["n"] == 0
+    assert two.row() == 1 and two.data() == "2"
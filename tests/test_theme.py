@@ -0,0 +1,105 @@
+import pytest
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtGui import QPalette
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from src.core.theme import ThemeManager, Theme, scope_stylesheet, update_style_property
+
+
+@pytest.fixture
+def manager(app):
+    manager = ThemeManager()
+    yield manager
+    app.setStyleSheet("")
+
+
+@pytest.fixture
+def window(app):
+    """带一个可见标签和一个隐藏子树的窗口"""
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    window.visible_label = QLabel("visible")
+    window.visible_label.setObjectName("menu_text")
+    layout.addWidget(window.visible_label)
+    window.hidden_panel = QWidget()
+    window.hidden_label = QLabel("hidden", window.hidden_panel)
+    window.hidden_label.setObjectName("menu_text")
+    layout.addWidget(window.hidden_panel)
+    window.show()
+    window.hidden_panel.hide()
+    yield window
+    window.close()
+    window.deleteLater()
+
+
+def text_color(widget):
+    return widget.palette().color(QPalette.WindowText).name().upper()
+
+
+def test_scope_stylesheet():
+    """测试把规则限定到主题属性"""
+    qss = scope_stylesheet("/* c */ #a QLabel, #b:hover { color: red; }", "theme", "dark")
+    assert qss == ('*[theme="dark"] #a QLabel, #a[theme="dark"] QLabel, '
+                   '*[theme="dark"] #b:hover, #b[theme="dark"]:hover { color: red; }')
+
+
+def test_stylesheet_compiled_once(manager):
+    """测试每个主题只编译一次"""
+    qss = manager.stylesheet(Theme.DARK)
+    assert "$" not in qss
+    assert manager.get_theme_style(Theme.DARK)["sidebar"] in qss
+    assert manager.stylesheet(Theme.DARK) is qss
+    assert manager.stylesheet(Theme.LIGHT) is not qss
+    assert manager.application_stylesheet() is manager.application_stylesheet()
+
+
+def test_apply_sets_app_stylesheet_once(app, manager, window):
+    """测试应用级样式表只设置一次,切换主题只修改窗口属性"""
+    received = []
+    manager.themeChanged.connect(received.append)
+
+    assert manager.apply()
+    assert app.styleSheet() == manager.application_stylesheet()
+    assert window.property("theme") == "orange"
+    assert text_color(window.visible_label) == "#FFFFFF"
+
+    manager.set_theme(Theme.LIGHT)
+    assert app.styleSheet() == manager.application_stylesheet()
+    assert window.property("theme") == "light"
+    assert text_color(window.visible_label) == "#333333"
+    assert received == [Theme.LIGHT]
+
+
+def test_hidden_widgets_restyled_on_show(app, manager, window):
+    """测试隐藏控件标记为待更新,显示时再应用样式"""
+    manager.apply()
+    manager.set_theme(Theme.LIGHT)
+    scheduler = manager.scheduler
+    assert scheduler.isDirty(window.hidden_label)
+    assert not scheduler.isDirty(window.visible_label)
+    assert text_color(window.hidden_label) == "#FFFFFF"
+
+    window.hidden_panel.show()
+    assert not scheduler.isDirty(window.hidden_label)
+    assert text_color(window.hidden_label) == "#333333"
+
+
+def test_deleted_hidden_widget_not_kept(app, manager, window):
+    """测试待更新的控件删除后不再保留在调度器中"""
+    manager.apply()
+    manager.set_theme(Theme.LIGHT)
+    scheduler = manager.scheduler
+    pending = scheduler.pendingCount()
+    panel = window.hidden_panel
+    del window.hidden_panel, window.hidden_label
+    panel.deleteLater()
+    QCoreApplication.sendPostedEvents(panel, QEvent.DeferredDelete)
+    assert len(scheduler._dirty) == pending - 1
+
+
+def test_update_style_property(app):
+    """测试动态属性更新"""
+    widget = QWidget()
+    update_style_property(widget, "collapsed", True)
+    assert widget.property("collapsed") is True
+    update_style_property(widget, "collapsed", False)
+    assert widget.property("collapsed") is False
@@ -0,0 +1,110 @@
+import pytest
+from src.core.base import ViewModel
+from src.core.diff import diff_list, diff_data, ROWS_UPDATED, ROWS_INSERTED, ROWS_REMOVED, KEY_CHANGED
+
+
+def test_diff_list_single_update():
+    """测试只有一行变化"""
+    old = [{"id": i} for i in range(10)]
+    new = list(old)
+    new[4] = {"id": 4, "name": "changed"}
+    assert diff_list(old, new) == [(ROWS_UPDATED, 4, 4)]
+
+
+def test_diff_list_insert_and_remove():
+    """测试插入与删除"""
+    old = [1, 2, 3, 4]
+    assert diff_list(old, [1, 2, 9, 9, 3, 4]) == [(ROWS_INSERTED, 2, 3)]
+    assert diff_list(old, [1, 4]) == [(ROWS_REMOVED, 1, 2)]
+    assert diff_list(old, [1, 8, 9, 7, 4]) == [(ROWS_UPDATED, 1, 2), (ROWS_INSERTED, 3, 3)]
+    assert diff_list(old, old) == []
+
+
+def test_diff_data_keys():
+    """测试键变更"""
+    old = {"a": 1, "b": [1], "c": 3}
+    new = {"a": 2, "b": [1, 2], "d": 4}
+    assert diff_data(old, new) == [
+        (KEY_CHANGED, "a"),
+        (ROWS_INSERTED, "b", 1, 1),
+        (KEY_CHANGED, "d"),
+        (KEY_CHANGED, "c"),
+    ]
+
+
+@pytest.fixture
+def recorder():
+    """记录ViewModel发出的信号"""
+    def attach(vm):
+        events = []
+        vm.keyChanged.connect(lambda key: events.append(("key", key)))
+        vm.rowsUpdated.connect(lambda key, first, last: events.append(("updated", key, first, last)))
+        vm.rowsInserted.connect(lambda key, first, last: events.append(("inserted", key, first, last)))
+        vm.rowsRemoved.connect(lambda key, first, last: events.append(("removed", key, first, last)))
+        vm.dataChanged.connect(lambda: events.append(("data",)))
+        return events
+    return attach
+
+
+def test_viewmodel_fine_grained_signals(app, recorder):
+    """测试细粒度通知"""
+    vm = ViewModel()
+    events = recorder(vm)
+
+    users = [{"id": i} for i in range(50)]
+    vm.setData({"users": users})
+    vm.flush()
+    assert events == [("key", "users"), ("data",)]
+
+    events.clear()
+    edited = list(users)
+    edited[10] = {"id": 10, "name": "x"}
+    vm.setValue("users", edited)
+    vm.flush()
+    assert events == [("updated", "users", 10, 10), ("data",)]
+
+    events.clear()
+    vm.setValue("users", edited)
+    vm.flush()
+    assert events == []
+
+
+def test_viewmodel_coalesces_per_tick(app, qtbot, recorder):
+    """测试同一次事件循环内的修改合并通知"""
+    vm = ViewModel()
+    events = recorder(vm)
+
+    for i in range(10):
+        vm.setValue("count", i)
+    assert events == []
+
+    qtbot.waitUntil(lambda: events != [])
+    assert events == [("key", "count"), ("data",)]
+    assert vm.data["count"] == 9
+
+
+def test_viewmodel_batch_update(app, recorder):
+    """测试批量修改"""
+    vm = ViewModel(coalesce=False)
+    events = recorder(vm)
+
+    with vm.batchUpdate():
+        vm.setValue("users", [1, 2])
+        with vm.batchUpdate():
+            vm.setValue("total", 2)
+        assert events == []
+        assert vm.isUpdating()
+
+    assert events == [("key", "users"), ("key", "total"), ("data",)]
+
+    with pytest.raises(RuntimeError):
+        vm.endUpdate()
+
+
+def test_viewmodel_immediate_mode(app, recorder):
+    """测试关闭合并时立即通知"""
+    vm = ViewModel(coalesce=False)
+    events = recorder(vm)
+    vm.setValue("a", 1)
+    vm.setValue("a", 2)
+    assert events == [("key", "a"), ("data",), ("key", "a"), ("data",)]